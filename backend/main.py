@@ -1,16 +1,70 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, Dict, List
 import uvicorn
+import asyncio
+import json
+import os
+import re
+import time
 from services.weather_service import WeatherService
 from services.ai_service import AIService
-from services.ocr_service import ocr_service
+from services.ocr_service import detect_image_type, ocr_service
+from services.llm_executor import llm_executor
+from services.daily_precompute import DailyPrecomputeService
+from services.cafeteria_registry import cafeteria_registry
+from services.job_queue import JobFailed, JobQueueFull, job_queue
+from services.sse import format_sse
+from services.local_recommender import local_recommender
+from services.restaurant_catalog import restaurant_catalog
+from services.dish_taxonomy import taxonomy_stats
+from services.menu_similarity import menu_similarity
+from services.llm_provider import llm_provider
+
+# 서비스 인스턴스
+weather_service = WeatherService()
+ai_service = AIService()
+daily_precompute_service = DailyPrecomputeService(weather_service, ai_service)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 공유 리소스 정리"""
+    await weather_service.start()
+    await asyncio.to_thread(restaurant_catalog.load)
+    weather_service.start_prefetcher()
+    if ai_service.llm_available():
+        daily_precompute_service.start()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    await daily_precompute_service.stop()
+    await weather_service.stop_prefetcher()
+    await weather_service.close()
+    ocr_service.cache.close()
+    ocr_service.week_menus.close()
+    ocr_service.preprocessor.shutdown()
+    cafeteria_registry.close()
+    llm_executor.shutdown()
+
+
+# 멀티파트 업로드 상한 (식단표 사진 1장 기준)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# 구내식당 추천 파이프라인 단계별 타임아웃 (초)
+STAGE_TIMEOUT_WEATHER = float(os.getenv("STAGE_TIMEOUT_WEATHER", "4"))
+STAGE_TIMEOUT_MENU = float(os.getenv("STAGE_TIMEOUT_MENU", "45"))
+STAGE_TIMEOUT_RECOMMEND = float(os.getenv("STAGE_TIMEOUT_RECOMMEND", "60"))
 
 app = FastAPI(
     title="AI 점심 메뉴 추천 API",
     description="날씨 기반 AI 점심 메뉴 추천 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -22,10 +76,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 서비스 인스턴스
-weather_service = WeatherService()
-ai_service = AIService()
-
 # Request 모델
 class CafeteriaMenuRequest(BaseModel):
     location: str = "서울"
@@ -34,6 +84,13 @@ class CafeteriaMenuRequest(BaseModel):
     user_location: Optional[Dict] = None  # 위도, 경도
     prefer_external: bool = True  # 외부식당 선호 (CAM 모드)
     daily_menus: Optional[List[Dict]] = None  # 오늘의 추천 메뉴 리스트 (중복 체크용)
+    session_id: Optional[str] = None  # 클라이언트 세션 ID (세션별 추천 이력/중복 제거용)
+    cafeteria_id: Optional[str] = None  # 공유 구내식당 ID (있으면 오늘 메뉴/주간 식단표 공유)
+
+class CafeteriaCreateRequest(BaseModel):
+    name: Optional[str] = None  # 구내식당 이름 (예: "본사 B1 식당")
+    location: str = "서울"
+    user_location: Optional[Dict] = None  # 위도, 경도
 
 @app.get("/")
 async def root():
@@ -43,8 +100,14 @@ async def root():
         "endpoints": {
             "weather": "/api/weather?location={location}",
             "recommend-from-cafeteria": "/api/recommend-from-cafeteria (POST)",
+            "recommend-from-cafeteria-upload": "/api/recommend-from-cafeteria/upload (POST, multipart)",
+            "recommend-from-cafeteria-stream": "/api/recommend-from-cafeteria/stream (POST, SSE)",
+            "jobs": "/api/jobs/recommend-from-cafeteria[/upload] (POST), /api/jobs/{job_id} (GET), /api/jobs/{job_id}/events (SSE)",
             "daily-recommendations": "/api/daily-recommendations (GET)",
-            "daily-recommendations-refresh": "/api/daily-recommendations-refresh (POST)"
+            "lunch-bundle": "/api/lunch-bundle (POST, 날씨 + 오늘의 추천 + 구내식당 추천)",
+            "daily-recommendations-refresh": "/api/daily-recommendations-refresh (POST)",
+            "cafeterias": "/api/cafeterias (POST), /api/cafeterias/{cafeteria_id} (GET)",
+            "cache-stats": "/api/cache-stats (GET)"
         }
     }
 
@@ -60,66 +123,384 @@ async def get_weather(location: str = "서울", lat: Optional[float] = None, lng
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/recommend-from-cafeteria")
-async def recommend_from_cafeteria(request: CafeteriaMenuRequest):
-    """구내식당 메뉴 기반 외부 메뉴 추천 (텍스트 or 이미지 OCR)"""
-    try:
-        # 1. 날씨 정보 가져오기 (사용자 좌표가 있으면 우선 사용)
-        lat = None
-        lng = None
-        if request.user_location:
-            lat = request.user_location.get('latitude')
-            lng = request.user_location.get('longitude')
-            print(f"📍 사용자 좌표 사용: lat={lat}, lng={lng}")
-        
-        weather_data = await weather_service.get_weather(
-            request.location,
-            lat=lat,
-            lng=lng
-        )
+async def resolve_cafeteria_menu(
+    request: CafeteriaMenuRequest,
+    cafeteria: Optional[Dict],
+    image_bytes: Optional[bytes] = None,
+    mime_type: Optional[str] = None
+) -> tuple:
+    """
+    추천에 쓸 구내식당 메뉴 결정
+
+    우선순위:
+      1. 공유 구내식당의 오늘 메뉴 (이미 누군가 등록했으면 OCR 생략, 텍스트로 등록된 메뉴면 보낸 이미지를 OCR)
+      2. 이미지 OCR (멀티파트 업로드 바이트 or Base64, 구내식당 ID가 있으면 주간 식단표 전체 추출)
+      3. 텍스트 입력
+      4. 저장된 주간 식단표의 오늘 메뉴
+
+    Returns:
+        tuple: (menu_text, ocr_confidence)
+    """
+    today_menu = cafeteria["today_menu"] if cafeteria else None
+    has_image = bool(image_bytes or request.image_data)
+
+    # 텍스트로 등록된 공유 메뉴는 검증 전이라, 이미지를 보낸 사용자는 직접 OCR (결과로 공유 메뉴도 교체)
+    if today_menu and not request.cafeteria_menu and not (has_image and cafeteria["source"] == "text"):
+        print(f"🏢 공유 구내식당 메뉴 사용 ({request.cafeteria_id}): {', '.join(today_menu)}")
+        return ", ".join(today_menu), None
+
+    if has_image:
+        ocr_result = await run_menu_ocr(request, image_bytes, mime_type)
         
-        # 2. 메뉴 텍스트 결정 (이미지 OCR or 텍스트)
-        menu_text = request.cafeteria_menu
-        ocr_confidence = None
+        # OCR 결과 검증
+        is_valid, error_msg = ocr_service.validate_menu_extraction(ocr_result)
         
-        if request.image_data:
-            print("📸 이미지에서 메뉴 추출 중...")
-            # OCR 서비스로 이미지 처리
-            ocr_result = await ocr_service.extract_menu_from_image(
-                request.image_data,
-                fallback_text=request.cafeteria_menu  # 보조 텍스트
-            )
-            
-            # OCR 결과 검증
-            is_valid, error_msg = ocr_service.validate_menu_extraction(ocr_result)
-            
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=error_msg)
-            
-            menu_text = ocr_result["menu_text"]
-            ocr_confidence = ocr_result["confidence"]
-            print(f"✅ OCR 완료: {menu_text[:50]}... (신뢰도: {ocr_confidence})")
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_msg)
         
-        elif not menu_text:
-            raise HTTPException(
-                status_code=400, 
-                detail="메뉴 텍스트 또는 이미지를 제공해주세요."
+        menu_text = ocr_result["menu_text"]
+        print(f"✅ OCR 완료: {menu_text[:50]}... (신뢰도: {ocr_result['confidence']})")
+        await register_today_menu(request, ocr_result["menu_list"], "ocr")
+        return menu_text, ocr_result["confidence"]
+
+    if request.cafeteria_menu:
+        # 사용자가 입력한 그대로 공유 (AI에 전달되는 메뉴와 동일하게)
+        menu_list = [m.strip() for m in re.split(r'[,;\n|]', request.cafeteria_menu) if m.strip()]
+        await register_today_menu(request, menu_list, "text")
+        return request.cafeteria_menu, None
+
+    if request.cafeteria_id:
+        # 이번 주 식단표가 이미 저장돼 있으면 이미지 없이 오늘 메뉴 사용
+        stored = await ocr_service.get_stored_menu(request.cafeteria_id)
+        if stored:
+            await register_today_menu(request, stored["menu_list"], "week")
+            return stored["menu_text"], None
+
+    raise HTTPException(
+        status_code=400, 
+        detail="메뉴 텍스트 또는 이미지를 제공해주세요."
+    )
+
+async def run_menu_ocr(
+    request: CafeteriaMenuRequest,
+    image_bytes: Optional[bytes],
+    mime_type: Optional[str]
+) -> dict:
+    """
+    식단표 이미지 OCR (구내식당 ID가 있으면 주간 식단표 전체 추출 후 저장)
+
+    멀티파트 업로드는 원본 바이트를, JSON 요청은 Base64 문자열을 그대로 넘김
+    """
+    if image_bytes:
+        print("📸 업로드 이미지에서 메뉴 추출 중...")
+        if request.cafeteria_id:
+            return await ocr_service.extract_week_menu_from_bytes(
+                image_bytes,
+                request.cafeteria_id,
+                fallback_text=request.cafeteria_menu,
+                mime_type=mime_type
             )
-        
-        # 3. AI 추천 생성 (CAM 모드 지원 + 오늘의 메뉴 중복 체크)
-        recommendation = await ai_service.recommend_from_cafeteria_menu(
+        return await ocr_service.extract_menu_from_bytes(
+            image_bytes,
+            fallback_text=request.cafeteria_menu,
+            mime_type=mime_type
+        )
+
+    print("📸 이미지에서 메뉴 추출 중...")
+    if request.cafeteria_id:
+        return await ocr_service.extract_week_menu_from_image(
+            request.image_data,
+            request.cafeteria_id,
+            fallback_text=request.cafeteria_menu
+        )
+    return await ocr_service.extract_menu_from_image(
+        request.image_data,
+        fallback_text=request.cafeteria_menu  # 보조 텍스트
+    )
+
+async def register_today_menu(request: CafeteriaMenuRequest, menu_list: List[str], source: str):
+    """구내식당 ID가 있으면 오늘 메뉴를 공유 레지스트리에 등록 (그날 첫 결과만 반영, 텍스트 입력은 OCR로 교체 가능)"""
+    if not request.cafeteria_id:
+        return
+
+    user_location = request.user_location or {}
+    registered = await cafeteria_registry.set_today_menu(
+        request.cafeteria_id,
+        menu_list,
+        source,
+        location=request.location,
+        latitude=user_location.get('latitude'),
+        longitude=user_location.get('longitude')
+    )
+    if registered:
+        print(f"🏢 구내식당 오늘 메뉴 등록 ({request.cafeteria_id}, {source}): {', '.join(menu_list)}")
+
+async def run_stage(name: str, coro, timeout: float):
+    """추천 파이프라인 단계 실행 (단계별 타임아웃 + 소요 시간 로그)"""
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    finally:
+        print(f"⏱️ [{name}] {(time.perf_counter() - started) * 1000:.0f}ms")
+
+async def fetch_stage_weather(request: CafeteriaMenuRequest, cafeteria: Optional[Dict]) -> Dict:
+    """날씨 단계 (사용자 좌표 → 구내식당 좌표 → location 순, 시간 초과 시 더미 날씨)"""
+    lat = None
+    lng = None
+    if request.user_location:
+        lat = request.user_location.get('latitude')
+        lng = request.user_location.get('longitude')
+        print(f"📍 사용자 좌표 사용: lat={lat}, lng={lng}")
+    elif cafeteria and cafeteria["latitude"] is not None:
+        lat = cafeteria["latitude"]
+        lng = cafeteria["longitude"]
+        print(f"📍 구내식당 좌표 사용: lat={lat}, lng={lng}")
+
+    try:
+        return await run_stage(
+            "weather",
+            weather_service.get_weather(request.location, lat=lat, lng=lng),
+            STAGE_TIMEOUT_WEATHER
+        )
+    except asyncio.TimeoutError:
+        return weather_service._get_dummy_weather(request.location)
+
+async def fetch_stage_menu(
+    request: CafeteriaMenuRequest,
+    cafeteria: Optional[Dict],
+    image_bytes: Optional[bytes] = None,
+    mime_type: Optional[str] = None
+) -> tuple:
+    """메뉴 단계 (공유 구내식당 메뉴 or 이미지 OCR or 텍스트, 시간 초과 시 504)"""
+    try:
+        return await run_stage(
+            "menu",
+            resolve_cafeteria_menu(request, cafeteria, image_bytes, mime_type),
+            STAGE_TIMEOUT_MENU
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="메뉴 인식이 지연되고 있습니다. 잠시 후 다시 시도하거나 텍스트로 입력해주세요.")
+
+async def recommend_stage(
+    request: CafeteriaMenuRequest,
+    weather_data: Dict,
+    menu_text: str,
+    ocr_confidence: Optional[str],
+    daily_menus: Optional[List[Dict]] = None
+) -> Dict:
+    """AI 추천 단계 (CAM 모드 지원 + 오늘의 메뉴 중복 체크, 시간 초과 시 기본 추천)"""
+    try:
+        recommendation = await run_stage(
+            "recommend",
+            ai_service.recommend_from_cafeteria_menu(
+                weather_data,
+                menu_text,
+                request.user_location,
+                request.prefer_external,  # CAM 모드 전달
+                daily_menus,  # 오늘의 메뉴 전달
+                request.session_id  # 세션별 추천 이력
+            ),
+            STAGE_TIMEOUT_RECOMMEND
+        )
+    except asyncio.TimeoutError:
+        print(f"⏱️ AI 추천 {STAGE_TIMEOUT_RECOMMEND}초 초과, 기본 추천 사용")
+        recommendation = ai_service._get_fallback_cafeteria_recommendation(
+            weather_data, menu_text, request.session_id, daily_menus, request.prefer_external,
+            request.user_location
+        )
+    
+    # OCR 신뢰도 정보 추가
+    if ocr_confidence:
+        recommendation["ocr_confidence"] = ocr_confidence
+        recommendation["extracted_menu"] = menu_text
+    if request.cafeteria_id:
+        recommendation["cafeteria_id"] = request.cafeteria_id
+    
+    return recommendation
+
+async def prepare_cafeteria_inputs(
+    request: CafeteriaMenuRequest,
+    image_bytes: Optional[bytes] = None,
+    mime_type: Optional[str] = None
+) -> tuple:
+    """
+    AI 추천 입력 준비 (일반/스트리밍 공통)
+
+    단계 의존 관계:
+        구내식당 조회 ─┬─> 날씨 ──────┐
+                      └─> 메뉴(OCR) ─┴─> AI 추천
+    날씨와 메뉴(OCR)는 서로 독립이라 동시에 실행 → 이미지 요청은 날씨 RTT만큼 빨라짐
+
+    Returns:
+        tuple: (weather_data, menu_text, ocr_confidence)
+    """
+    cafeteria = None
+    if request.cafeteria_id:
+        cafeteria = await cafeteria_registry.get(request.cafeteria_id)
+
+    # 1. 날씨 + 메뉴 텍스트 결정 동시 실행
+    weather_task = asyncio.create_task(fetch_stage_weather(request, cafeteria))
+    try:
+        menu_text, ocr_confidence = await fetch_stage_menu(request, cafeteria, image_bytes, mime_type)
+    except BaseException:
+        # 메뉴가 없으면 추천할 수 없으므로 날씨 조회도 중단
+        weather_task.cancel()
+        raise
+    weather_data = await weather_task
+    return weather_data, menu_text, ocr_confidence
+
+async def build_cafeteria_recommendation(
+    request: CafeteriaMenuRequest,
+    image_bytes: Optional[bytes] = None,
+    mime_type: Optional[str] = None
+) -> Dict:
+    """구내식당 메뉴 기반 추천 생성 (JSON 요청과 멀티파트 업로드 공통)"""
+    weather_data, menu_text, ocr_confidence = await prepare_cafeteria_inputs(request, image_bytes, mime_type)
+    
+    # 2. AI 추천 생성 (두 입력이 준비되는 즉시 시작)
+    return await recommend_stage(request, weather_data, menu_text, ocr_confidence, request.daily_menus)
+
+@app.post("/api/recommend-from-cafeteria")
+async def recommend_from_cafeteria(request: CafeteriaMenuRequest):
+    """구내식당 메뉴 기반 외부 메뉴 추천 (텍스트 or 이미지 OCR or 공유 구내식당 ID)"""
+    try:
+        recommendation = await build_cafeteria_recommendation(request)
+        return {
+            "success": True,
+            "data": recommendation
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/recommend-from-cafeteria/stream")
+async def recommend_from_cafeteria_stream(request: CafeteriaMenuRequest):
+    """
+    구내식당 메뉴 기반 추천 SSE 스트리밍 (추천이 하나 완성될 때마다 바로 전송)
+
+    이벤트: "meta" (메뉴/날씨) → "recommendation" × N → "done" (최종 결과, 일반 응답과 같은 형식)
+    메뉴 인식 실패 등은 스트림 시작 전에 일반 HTTP 오류로 응답
+    """
+    try:
+        weather_data, menu_text, ocr_confidence = await prepare_cafeteria_inputs(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        started = time.perf_counter()
+        meta = {
+            "cafeteria_menu": menu_text,
+            "weather_summary": f"{weather_data.get('temperature', 20)}°C, {weather_data.get('sky_condition', '맑음')}"
+        }
+        if ocr_confidence:
+            meta["ocr_confidence"] = ocr_confidence
+            meta["extracted_menu"] = menu_text
+        yield format_sse("meta", meta)
+
+        count = 0
+        async for event, data in ai_service.stream_cafeteria_recommendations(
             weather_data,
             menu_text,
             request.user_location,
-            request.prefer_external,  # CAM 모드 전달
-            request.daily_menus  # 오늘의 메뉴 전달
-        )
-        
-        # OCR 신뢰도 정보 추가
-        if ocr_confidence:
-            recommendation["ocr_confidence"] = ocr_confidence
-            recommendation["extracted_menu"] = menu_text
-        
+            request.prefer_external,
+            request.daily_menus,
+            request.session_id
+        ):
+            if event == "recommendation":
+                count += 1
+                if count == 1:
+                    print(f"⏱️ [stream] 첫 추천 {(time.perf_counter() - started) * 1000:.0f}ms")
+            else:
+                if ocr_confidence:
+                    data["ocr_confidence"] = ocr_confidence
+                    data["extracted_menu"] = menu_text
+                if request.cafeteria_id:
+                    data["cafeteria_id"] = request.cafeteria_id
+                print(f"⏱️ [stream] 전체 {(time.perf_counter() - started) * 1000:.0f}ms")
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def read_image_upload(image: UploadFile) -> tuple:
+    """
+    업로드 파일을 상한 크기까지만 읽고 매직 넘버로 이미지 형식 확인
+
+    UploadFile은 SpooledTemporaryFile이라 큰 파일은 디스크에 있고,
+    여기서 청크 단위로 읽다가 상한을 넘으면 바로 중단
+
+    Returns:
+        tuple: (image_bytes, mime_type)
+    """
+    if image.size is not None and image.size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"이미지는 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB 이하만 업로드할 수 있습니다.")
+
+    first = await image.read(UPLOAD_CHUNK_SIZE)
+    mime_type = detect_image_type(first[:12])
+    if mime_type is None:
+        raise HTTPException(status_code=415, detail="JPEG, PNG, GIF, WEBP, HEIC 이미지만 업로드할 수 있습니다.")
+
+    chunks = [first]
+    total = len(first)
+    while chunk := await image.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"이미지는 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB 이하만 업로드할 수 있습니다.")
+        chunks.append(chunk)
+
+    return b"".join(chunks), mime_type
+
+async def cafeteria_upload_form(
+    image: UploadFile = File(...),  # 식단표 이미지 파일
+    location: str = Form("서울"),
+    cafeteria_menu: Optional[str] = Form(None),  # OCR 실패 시 대체 텍스트
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
+    prefer_external: bool = Form(True),
+    daily_menus: Optional[str] = Form(None),  # 오늘의 추천 메뉴 리스트 (JSON 문자열)
+    session_id: Optional[str] = Form(None),
+    cafeteria_id: Optional[str] = Form(None)
+) -> tuple:
+    """
+    멀티파트 업로드 폼 → (CafeteriaMenuRequest, image_bytes, mime_type)
+
+    바로 추천하는 엔드포인트와 작업 큐 엔드포인트가 같이 사용
+    """
+    try:
+        image_bytes, mime_type = await read_image_upload(image)
+    finally:
+        await image.close()
+    print(f"📤 이미지 업로드 수신: {len(image_bytes) // 1024}KB ({mime_type})")
+
+    try:
+        parsed_daily_menus = json.loads(daily_menus) if daily_menus else None
+    except json.JSONDecodeError:
+        parsed_daily_menus = False
+    if parsed_daily_menus is not None and not isinstance(parsed_daily_menus, list):
+        raise HTTPException(status_code=400, detail="daily_menus는 JSON 배열이어야 합니다.")
+
+    request = CafeteriaMenuRequest(
+        location=location,
+        cafeteria_menu=cafeteria_menu,
+        user_location={"latitude": latitude, "longitude": longitude} if latitude is not None and longitude is not None else None,
+        prefer_external=prefer_external,
+        daily_menus=parsed_daily_menus,
+        session_id=session_id,
+        cafeteria_id=cafeteria_id
+    )
+    return request, image_bytes, mime_type
+
+@app.post("/api/recommend-from-cafeteria/upload")
+async def recommend_from_cafeteria_upload(upload: tuple = Depends(cafeteria_upload_form)):
+    """구내식당 식단표 이미지 멀티파트 업로드 → 외부 메뉴 추천 (Base64 JSON 대신 원본 바이트)"""
+    try:
+        recommendation = await build_cafeteria_recommendation(*upload)
         return {
             "success": True,
             "data": recommendation
@@ -129,6 +510,73 @@ async def recommend_from_cafeteria(request: CafeteriaMenuRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ===========================================================================
+# 작업 큐: 요청은 작업 ID만 바로 받고, 결과는 폴링 또는 SSE로 전달
+# ===========================================================================
+def submit_cafeteria_job(
+    request: CafeteriaMenuRequest,
+    image_bytes: Optional[bytes] = None,
+    mime_type: Optional[str] = None
+) -> JSONResponse:
+    """구내식당 추천 작업 등록 (큐가 가득 차면 503)"""
+    async def handler():
+        try:
+            recommendation = await build_cafeteria_recommendation(request, image_bytes, mime_type)
+        except HTTPException as e:
+            raise JobFailed(e.status_code, e.detail)
+        return {
+            "success": True,
+            "data": recommendation
+        }
+
+    try:
+        job = job_queue.submit(handler, kind="recommend-from-cafeteria")
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "5"}
+        )
+
+    job["status_url"] = f"/api/jobs/{job['job_id']}"
+    job["events_url"] = f"/api/jobs/{job['job_id']}/events"
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "data": job
+    })
+
+@app.post("/api/jobs/recommend-from-cafeteria")
+async def create_cafeteria_job(request: CafeteriaMenuRequest):
+    """구내식당 추천 작업 등록 (JSON 요청, 바로 작업 ID 반환)"""
+    return submit_cafeteria_job(request)
+
+@app.post("/api/jobs/recommend-from-cafeteria/upload")
+async def create_cafeteria_upload_job(upload: tuple = Depends(cafeteria_upload_form)):
+    """구내식당 추천 작업 등록 (멀티파트 이미지 업로드, 바로 작업 ID 반환)"""
+    return submit_cafeteria_job(*upload)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태/결과 조회 (폴링)"""
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return {
+        "success": True,
+        "data": job
+    }
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """작업 상태/결과 SSE 스트림 (status → done/failed)"""
+    if not job_queue.get(job_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return StreamingResponse(
+        job_queue.stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/daily-recommendations")
 async def get_daily_recommendations(location: str = "서울", lat: Optional[float] = None, lng: Optional[float] = None):
     """오늘의 추천 메뉴 3개 조회 (위치 & 날씨 기반)"""
@@ -146,6 +594,70 @@ async def get_daily_recommendations(location: str = "서울", lat: Optional[floa
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/lunch-bundle")
+async def get_lunch_bundle(request: CafeteriaMenuRequest):
+    """
+    페이지 로드용 묶음 조회: 날씨 + 오늘의 추천 + (메뉴/구내식당 ID가 있으면) 구내식당 기반 추천
+
+    날씨는 한 번만 조회해서 공유하고, 서로 독립인 단계는 동시에 실행:
+        구내식당 조회 ─┬─> 날씨 ─┬─> 오늘의 추천 ─┐
+                      │         └───────────────┼─> 구내식당 기반 추천
+                      └─> 메뉴(OCR) ────────────┘
+    구내식당 쪽이 실패해도 날씨/오늘의 추천은 그대로 반환 (cafeteria_error에 사유)
+    """
+    menu_task = None
+    try:
+        cafeteria = None
+        if request.cafeteria_id:
+            cafeteria = await cafeteria_registry.get(request.cafeteria_id)
+
+        weather_task = asyncio.create_task(fetch_stage_weather(request, cafeteria))
+        if request.cafeteria_menu or request.image_data or request.cafeteria_id:
+            menu_task = asyncio.create_task(fetch_stage_menu(request, cafeteria))
+
+        weather_data = await weather_task
+        try:
+            daily = await run_stage(
+                "daily",
+                ai_service.get_daily_recommendations(weather_data, request.location),
+                STAGE_TIMEOUT_RECOMMEND
+            )
+        except asyncio.TimeoutError:
+            daily = ai_service._get_fallback_daily_recommendations(weather_data, request.location)
+
+        cafeteria_recommendation = None
+        cafeteria_error = None
+        if menu_task is not None:
+            try:
+                menu_text, ocr_confidence = await menu_task
+                # 오늘의 추천과 겹치지 않게 (클라이언트가 따로 보내지 않았으면 방금 만든 목록 사용)
+                daily_menus = request.daily_menus or daily.get("recommendations")
+                cafeteria_recommendation = await recommend_stage(
+                    request, weather_data, menu_text, ocr_confidence, daily_menus
+                )
+            except HTTPException as e:
+                cafeteria_error = {"status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                # 레지스트리/단계 코드 오류도 묶음 전체를 실패시키지 않고 구내식당 쪽 오류로만 보고
+                print(f"❌ 묶음 조회 구내식당 추천 실패: {e}")
+                cafeteria_error = {"status_code": 500, "detail": str(e)}
+
+        return {
+            "success": True,
+            "data": {
+                "weather": weather_data,
+                "daily_recommendations": daily,
+                "cafeteria_recommendation": cafeteria_recommendation,
+                "cafeteria_error": cafeteria_error
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        if menu_task is not None:
+            menu_task.cancel()
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/daily-recommendations-refresh")
 async def refresh_daily_recommendations(request: CafeteriaMenuRequest):
     """구내식당 메뉴와 연관 낮은 오늘의 메뉴 재생성"""
@@ -177,6 +689,66 @@ async def refresh_daily_recommendations(request: CafeteriaMenuRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/cafeterias")
+async def create_cafeteria(request: CafeteriaCreateRequest):
+    """공유 구내식당 등록 (반환된 id를 같은 회사 사용자들이 함께 사용)"""
+    user_location = request.user_location or {}
+    cafeteria = await cafeteria_registry.create(
+        name=request.name,
+        location=request.location,
+        latitude=user_location.get('latitude'),
+        longitude=user_location.get('longitude')
+    )
+    return {
+        "success": True,
+        "data": cafeteria
+    }
+
+@app.get("/api/cafeterias/{cafeteria_id}")
+async def get_cafeteria(cafeteria_id: str):
+    """공유 구내식당 정보 + 오늘 메뉴 조회"""
+    cafeteria = await cafeteria_registry.get(cafeteria_id)
+    if not cafeteria:
+        raise HTTPException(status_code=404, detail="등록되지 않은 구내식당입니다.")
+    return {
+        "success": True,
+        "data": cafeteria
+    }
+
+@app.get("/api/cafeterias/{cafeteria_id}/week-menu")
+async def get_week_menu(cafeteria_id: str):
+    """저장된 이번 주 식단표 조회"""
+    week_menu = await ocr_service.week_menus.get_week(cafeteria_id)
+    if not week_menu:
+        raise HTTPException(status_code=404, detail="이번 주 식단표가 없습니다. 식단표 이미지를 먼저 올려주세요.")
+    return {
+        "success": True,
+        "data": week_menu
+    }
+
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    """캐시 적중률 등 통계 조회"""
+    return {
+        "success": True,
+        "data": {
+            "weather": weather_service.get_cache_stats(),
+            "daily_recommendations": ai_service.get_cache_stats(),
+            "cafeteria_recommendations": ai_service.get_cafeteria_cache_stats(),
+            "local_recommender": local_recommender.stats(),
+            "restaurant_catalog": restaurant_catalog.stats(),
+            "dish_taxonomy": taxonomy_stats(),
+            "menu_similarity": menu_similarity.stats(),
+            "llm_provider": llm_provider.stats(),
+            "daily_precompute": daily_precompute_service.get_stats(),
+            "session_history": ai_service.session_history.stats(),
+            "ocr": ocr_service.cache.stats(),
+            "ocr_near_duplicates": ocr_service.near_duplicates.stats(),
+            "ocr_vision": ocr_service.get_vision_stats(),
+            "jobs": job_queue.stats()
+        }
+    }
+
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
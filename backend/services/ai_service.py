@@ -1,38 +1,116 @@
-import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import os
 from dotenv import load_dotenv
+import copy
 import json
 import random
+import time
+from services.llm_executor import llm_executor
+from services.ttl_cache import TTLCache
+from services.session_history import SessionHistoryStore
+from services.json_stream import JsonArrayStreamParser
+from services.menu_canonical import canonical_menu_key, canonicalize_menu
+from services.local_recommender import local_recommender
+from services.restaurant_catalog import restaurant_catalog
+from services.dish_taxonomy import CHINESE_SPICY, DRY, SOUP, classify_dish, has_tag
+from services.menu_similarity import menu_similarity
+from services.llm_provider import llm_provider
+from services.kst_clock import today_kst_str
 
 load_dotenv()
 
 
 class AIService:
     def __init__(self):
-        # Gemini API 설정
-        api_key = os.getenv("GEMINI_API_KEY")
+        # LLM 백엔드 설정 (LLM_PROVIDER=gemini|stub)
+        self.provider = llm_provider
 
-        if api_key:
-            genai.configure(api_key=api_key)
+        if self.provider.available:
             self.use_ai = True
-            print("✅ Gemini API 연결됨 (고급 프롬프트 시스템)")
+            print(f"✅ LLM 연결됨: {self.provider.name} (고급 프롬프트 시스템)")
 
             # 시스템 인스트럭션 정의
             self.system_instruction = self._get_system_instruction()
 
             # 모델 초기화 (시스템 인스트럭션 포함)
-            self.model = genai.GenerativeModel(
-                'gemini-2.0-flash',
-                system_instruction=self.system_instruction
-            )
+            self.model = self.provider.model("cafeteria", system_instruction=self.system_instruction)
+            # 오늘의 추천용 모델 (시스템 인스트럭션 없음, 요청마다 새로 만들지 않고 재사용)
+            self.daily_model = self.provider.model("daily")
         else:
             self.model = None
+            self.daily_model = None
             self.use_ai = False
             print("⚠️  Gemini API 키가 없습니다. 규칙 기반 추천 로직을 사용합니다.")
 
+        # ✅ 추천 엔진: "llm"(기본) | "local" (LLM 쿼터가 없을 때 전체 트래픽을 로컬 엔진으로)
+        self.recommend_engine = os.getenv("RECOMMEND_ENGINE", "llm").lower()
+        # 쿼터 초과(429) 응답을 받으면 이 시간(초) 동안 LLM 대신 로컬 엔진 사용
+        self.llm_quota_cooldown = float(os.getenv("LLM_QUOTA_COOLDOWN", "300"))
+        self._llm_quota_until = 0.0
+
         # ✅ 이전 추천 기억 → 같은 입력 여러 번 넣어도 맨날 똑같이 안 나오게
-        self.last_recommendations: List[Dict] = []
+        #    (세션별로 분리해서 다른 사용자의 추천과 섞이지 않도록)
+        self.session_history = SessionHistoryStore()
+
+        # ✅ 오늘의 추천 캐시: (위치, 기온 구간, 날씨 상태, 날짜) → 변형(variant) 여러 개를 돌려가며 응답
+        self.daily_cache_temp_bucket = float(os.getenv("DAILY_CACHE_TEMP_BUCKET", "3"))
+        self.daily_cache_variants = int(os.getenv("DAILY_CACHE_VARIANTS", "3"))
+        self._daily_cache = TTLCache(
+            ttl_seconds=float(os.getenv("DAILY_CACHE_TTL", "1800")),
+            max_size=int(os.getenv("DAILY_CACHE_SIZE", "512")),
+        )
+        # 진행 중인 LLM 생성 (cache_key -> Task)
+        self._daily_inflight: Dict[tuple, asyncio.Task] = {}
+        # 점심시간 전에 미리 생성해 둔 테이블 (cache_key -> 변형 목록), DailyPrecomputeService가 채움
+        self._precomputed_daily: Dict[tuple, Dict] = {}
+        self.precomputed_hits = 0
+
+        # ✅ 구내식당 추천 캐시: (표준화된 메뉴, 기온 구간, 날씨 상태, 거리 선호, 위치 구역) → LLM 결과 변형 여러 개
+        #    같은 회사에서 같은 식단으로 들어온 요청은 avoidList와 안 겹치는 변형을 돌려가며 LLM 호출 없이 응답
+        self.cafeteria_cache_temp_bucket = float(os.getenv("CAFETERIA_CACHE_TEMP_BUCKET", "3"))
+        self.cafeteria_cache_variants = int(os.getenv("CAFETERIA_CACHE_VARIANTS", "3"))
+        self._cafeteria_cache = TTLCache(
+            ttl_seconds=float(os.getenv("CAFETERIA_CACHE_TTL", "1800")),
+            max_size=int(os.getenv("CAFETERIA_CACHE_SIZE", "1024")),
+        )
+        # 변형 추가 생성 중인 키 (cache_key -> Task)
+        self._cafeteria_inflight: Dict[tuple, asyncio.Task] = {}
+        # 캐시는 있었지만 모든 변형이 avoidList와 겹쳐서 LLM을 부른 횟수
+        self.cafeteria_cache_clashes = 0
+
+        # ✅ 백그라운드 변형 생성이 실패한 키 ((종류, cache_key) -> 실패 시각)
+        #    이 시간(초) 동안은 캐시 적중 때마다 같은 키로 LLM을 다시 부르지 않음 (JSON 오류가 반복되는 키 등)
+        self._variant_failures = TTLCache(
+            ttl_seconds=float(os.getenv("VARIANT_RETRY_BACKOFF", "120")),
+            max_size=int(os.getenv("VARIANT_RETRY_BACKOFF_SIZE", "2048")),
+        )
+
+    def llm_available(self) -> bool:
+        """LLM으로 추천할지 (키 없음 / 로컬 엔진 모드 / 쿼터 초과 직후면 False → 규칙 기반)"""
+        if not self.use_ai or self.recommend_engine == "local":
+            return False
+        return time.monotonic() >= self._llm_quota_until
+
+    def _variant_backing_off(self, kind: str, cache_key: tuple) -> bool:
+        """최근에 이 키의 변형 생성이 실패했는지 (실패 후 VARIANT_RETRY_BACKOFF초 동안 True)"""
+        return (kind, cache_key) in self._variant_failures
+
+    def _note_variant_result(self, kind: str, cache_key: tuple, ok: bool):
+        """변형 생성 결과 기록 (실패면 재시도 대기 시작, 성공이면 해제)"""
+        if ok:
+            self._variant_failures.pop((kind, cache_key))
+        else:
+            self._variant_failures.set((kind, cache_key), time.time())
+
+    def _variant_backoff_count(self, kind: str) -> int:
+        return sum(1 for (k, _), _ in self._variant_failures.items() if k == kind)
+
+    def _note_llm_error(self, error: Exception):
+        """쿼터 초과면 잠시 LLM 호출을 멈추고 로컬 엔진으로 전환"""
+        if self.provider.is_quota_error(error):
+            self._llm_quota_until = time.monotonic() + self.llm_quota_cooldown
+            print(f"⚠️ Gemini 쿼터 초과 → {self.llm_quota_cooldown:.0f}초 동안 로컬 추천 엔진 사용")
 
     # =======================================================================
     # 1) 시스템 인스트럭션
@@ -130,69 +208,302 @@ class AIService:
         cafeteria_menu: str,
         location: Optional[Dict] = None,
         prefer_external: bool = True,
-        daily_menus: Optional[list] = None
+        daily_menus: Optional[list] = None,
+        session_id: Optional[str] = None
     ) -> Dict:
         """
         고급 프롬프트 시스템으로 구내식당 메뉴 기반 추천
-        + 이전 추천 내역을 보내서 중복을 줄이는 버전
+        + 같은 세션의 이전 추천 내역을 보내서 중복을 줄이는 버전
         + (여기서 한 번 더) 찌개인데 상위호환이 볶음/마라탕으로 나온 걸 강제로 대체로 돌리는 후처리
+        + 같은 (메뉴, 날씨, 거리 선호, 위치)면 캐시된 변형 중 avoidList와 안 겹치는 것으로 응답
         """
-        if not self.use_ai:
+        if not self.llm_available():
             return self._get_fallback_cafeteria_recommendation(
                 weather,
-                cafeteria_menu
+                cafeteria_menu,
+                session_id,
+                daily_menus,
+                prefer_external,
+                location
             )
 
         try:
-            # ✅ 이전 호출에서 뭐 나왔는지 모델에 알려주기
-            avoid_list = [
-                {
-                    "restaurant_name": r.get("restaurant_name"),
-                    "menu_name": r.get("menu_name")
-                }
-                for r in self.last_recommendations
-                if r.get("restaurant_name") or r.get("menu_name")
-            ]
-            
-            # ✅ 오늘의 추천 메뉴도 avoid_list에 추가
-            if daily_menus:
-                for menu in daily_menus:
-                    avoid_list.append({
-                        "restaurant_name": menu.get("restaurant_name"),
-                        "menu_name": menu.get("menu_name")
-                    })
-
-            user_input = {
-                "menuToday": (
-                    cafeteria_menu.split(',')
-                    if ',' in cafeteria_menu
-                    else [cafeteria_menu]
-                ),
-                "location": (
-                    location
-                    if location
-                    else {"lat": 37.5665, "lng": 126.9780}
-                ),
-                "distancePref": (
-                    "5-15" if prefer_external else "0-5"
-                ),
-                "weather": {
-                    "tempC": weather.get('temperature', 20),
-                    "condition": self._normalize_weather_condition(
-                        weather.get('sky_condition', '맑음'),
-                        weather.get('temperature', 20)
-                    )
-                },
-                "nearbyCandidates": self._generate_nearby_candidates(
-                    cafeteria_menu,
+            cache_key = self._cafeteria_cache_key(weather, cafeteria_menu, location, prefer_external)
+            cached = self._serve_cached_cafeteria(
+                cache_key, weather, cafeteria_menu, location, prefer_external, daily_menus, session_id
+            )
+            if cached is not None:
+                return cached
+
+            recommendation, cacheable = await self._generate_cafeteria_recommendation(
+                weather, cafeteria_menu, location, prefer_external, daily_menus, session_id
+            )
+            if recommendation is None:
+                return self._get_fallback_cafeteria_recommendation(
                     weather,
+                    cafeteria_menu,
+                    session_id,
+                    daily_menus,
+                    prefer_external,
                     location
-                ),
-                # ✅ 이게 핵심
-                "avoidList": avoid_list
+                )
+
+            # avoidList와 겹치는 원본으로 채운 결과는 이 세션 전용이라 공유 캐시에 넣지 않음
+            if cacheable:
+                self._store_cafeteria_variant(cache_key, recommendation)
+
+            # ✅ 세션 이력에 저장 → 다음 호출에서 피하도록
+            self.session_history.record(session_id, recommendation["recommendations"])
+
+            # 하위호환 필드들 추가
+            return self._with_cafeteria_context(
+                recommendation, recommendation["recommendations"], weather, cafeteria_menu
+            )
+
+        except Exception as e:
+            print("AI 추천 오류:", str(e))
+            self._note_llm_error(e)
+            import traceback
+            traceback.print_exc()
+            return self._get_fallback_cafeteria_recommendation(
+                weather,
+                cafeteria_menu,
+                session_id,
+                daily_menus,
+                prefer_external,
+                location
+            )
+
+    async def _generate_cafeteria_recommendation(
+        self,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool,
+        daily_menus: Optional[list],
+        session_id: Optional[str]
+    ) -> Tuple[Optional[Dict], bool]:
+        """
+        LLM으로 구내식당 기반 추천 생성 (중복 제거 + 국물 상위호환 보정까지)
+
+        Returns:
+            (dict, bool): recommendations가 보정된 모델 응답 (정보 부족/JSON 오류면 None, 호출 실패는 예외)
+                          + 공유 캐시에 넣어도 되는지 (avoidList와 겹치는 원본으로 채웠으면 False)
+        """
+        avoid_list, user_message = self._build_cafeteria_prompt(
+            weather, cafeteria_menu, location, prefer_external, daily_menus, session_id
+        )
+
+        # 전용 스레드 풀에서 실행 → 이벤트 루프 블로킹 방지
+        response = await llm_executor.run(
+            self.model.generate_content,
+            user_message,
+            generation_config=self._cafeteria_generation_config()
+        )
+        content = response.text
+
+        try:
+            recommendation = json.loads(content)
+        except json.JSONDecodeError as e:
+            print("JSON 파싱 오류:", str(e))
+            print("응답 내용:", content[:500], "...")
+            return None, False
+
+        if recommendation.get('need_more_info', False):
+            print("⚠️ 정보 부족:", recommendation.get('missing', []))
+            return None, False
+
+        print(
+            "✅ AI 추천 성공 (개수:",
+            len(recommendation.get('recommendations', [])),
+            ")"
+        )
+
+        # ✅ 1차: 모델이 준 거 중복 + avoidList와 비슷한 메뉴 제거
+        deduped, distinct = self._dedupe_recommendations(
+            recommendation.get("recommendations", []),
+            avoid_list
+        )
+
+        # ✅ 2차: "국물인데 상위호환이 제육/돈까스/마라탕으로 나왔다" → 강제 대체로 돌리기
+        recommendation["recommendations"] = self._fix_wrong_hierarchy_for_soups(
+            cafeteria_menu,
+            deduped
+        )
+        return recommendation, distinct
+
+    async def stream_cafeteria_recommendations(
+        self,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict] = None,
+        prefer_external: bool = True,
+        daily_menus: Optional[list] = None,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[tuple]:
+        """
+        recommend_from_cafeteria_menu의 스트리밍 버전
+        Gemini 스트리밍 응답에서 추천이 하나 완성될 때마다 중복 제거 + 국물 상위호환 보정 후 바로 내보냄
+
+        Yields:
+            tuple: ("recommendation", 추천 1개) 여러 번
+                   → ("done", recommend_from_cafeteria_menu와 같은 형식의 최종 결과)
+                   (최종 결과에서 상위호환 승격/순서가 바뀔 수 있으니 클라이언트는 done으로 교체)
+        """
+        if not self.llm_available():
+            result = self._get_fallback_cafeteria_recommendation(
+                weather, cafeteria_menu, session_id, daily_menus, prefer_external, location
+            )
+            for rec in result.get("recommendations", []):
+                yield "recommendation", rec
+            yield "done", result
+            return
+
+        cache_key = self._cafeteria_cache_key(weather, cafeteria_menu, location, prefer_external)
+        cached = self._serve_cached_cafeteria(
+            cache_key, weather, cafeteria_menu, location, prefer_external, daily_menus, session_id
+        )
+        if cached is not None:
+            for rec in cached["recommendations"]:
+                yield "recommendation", rec
+            yield "done", cached
+            return
+
+        streamed: List[Dict] = []
+        skipped: List[Dict] = []
+        parser = JsonArrayStreamParser("recommendations")
+        # 끝까지 오류 없이 받은 응답만 공유 캐시에 저장 (중간에 끊긴 1~2개짜리가 다른 사용자에게 가지 않게)
+        completed = False
+        try:
+            avoid_list, user_message = self._build_cafeteria_prompt(
+                weather, cafeteria_menu, location, prefer_external, daily_menus, session_id
+            )
+            prev_keys = {
+                (r.get("restaurant_name", ""), r.get("menu_name", ""))
+                for r in avoid_list
             }
+            avoid_menus = [r.get("menu_name") for r in avoid_list]
+            is_soup_menu = self._is_soup_menu(cafeteria_menu)
 
-            user_message = f"""
+            async for chunk in llm_executor.stream(
+                self.model.generate_content,
+                user_message,
+                generation_config=self._cafeteria_generation_config(),
+                stream=True
+            ):
+                for rec in parser.feed(chunk.text):
+                    key = (rec.get("restaurant_name", ""), rec.get("menu_name", ""))
+                    # 이번 응답 안 중복 / avoidList와 중복이거나 비슷한 메뉴면 스킵
+                    if key in prev_keys or any(
+                        key == (r.get("restaurant_name", ""), r.get("menu_name", "")) for r in streamed
+                    ) or menu_similarity.is_similar(key[1], avoid_menus):
+                        skipped.append(rec)
+                        continue
+                    if len(streamed) >= 3:
+                        continue
+
+                    # 국물인데 상위호환이 볶음/마라탕이면 바로 대체로 내림 (승격은 done에서)
+                    if (
+                        is_soup_menu
+                        and "상위" in (rec.get("type") or "")
+                        and self._is_wrong_soup_upgrade(rec.get("menu_name", "") or "")
+                    ):
+                        rec["type"] = "대체 메뉴"
+
+                    streamed.append(rec)
+                    yield "recommendation", rec
+            completed = True
+
+        except Exception as e:
+            print("AI 스트리밍 추천 오류:", str(e))
+            self._note_llm_error(e)
+
+        try:
+            recommendation = json.loads(parser.text)
+        except json.JSONDecodeError:
+            recommendation = {"brief_rationale": "", "need_more_info": False, "missing": []}
+            completed = False
+
+        # 하나도 못 받았으면: 전부 중복이면 원본이라도, 아니면 규칙 기반 추천
+        # (이 세션의 avoidList와 겹치는 원본이라 공유 캐시에는 넣지 않음)
+        if not streamed and skipped and not recommendation.get("need_more_info", False):
+            completed = False
+            streamed = skipped[:3]
+            for rec in streamed:
+                yield "recommendation", rec
+        if not streamed:
+            result = self._get_fallback_cafeteria_recommendation(
+                weather, cafeteria_menu, session_id, daily_menus, prefer_external, location
+            )
+            for rec in result.get("recommendations", []):
+                yield "recommendation", rec
+            yield "done", result
+            return
+
+        print(f"✅ AI 스트리밍 추천 완료 (개수: {len(streamed)})")
+        fixed = self._fix_wrong_hierarchy_for_soups(cafeteria_menu, streamed)
+        recommendation["recommendations"] = fixed
+        if completed:
+            self._store_cafeteria_variant(cache_key, recommendation)
+        self.session_history.record(session_id, fixed)
+        yield "done", self._with_cafeteria_context(recommendation, fixed, weather, cafeteria_menu)
+
+    def _build_cafeteria_prompt(
+        self,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool,
+        daily_menus: Optional[list],
+        session_id: Optional[str]
+    ) -> tuple:
+        """
+        구내식당 기반 추천 프롬프트 생성 (일반/스트리밍 공통)
+
+        Returns:
+            tuple: (avoidList = 이 세션의 이전 추천 + 오늘의 추천, 사용자 메시지)
+        """
+        # ✅ 이 세션의 이전 호출에서 뭐 나왔는지 모델에 알려주기
+        previous = self.session_history.get(session_id)
+        avoid_list = self._cafeteria_avoid_list(previous, daily_menus)
+
+        user_input = {
+            # 공백/표기/순서를 정리한 표준형 (비면 원문 그대로)
+            "menuToday": canonicalize_menu(cafeteria_menu) or [cafeteria_menu],
+            "location": (
+                location
+                if location
+                else {"lat": 37.5665, "lng": 126.9780}
+            ),
+            "distancePref": (
+                "5-15" if prefer_external else "0-5"
+            ),
+            "weather": {
+                "tempC": weather.get('temperature', 20),
+                "condition": self._normalize_weather_condition(
+                    weather.get('sky_condition', '맑음'),
+                    weather.get('temperature', 20)
+                )
+            },
+            "nearbyCandidates": self._generate_nearby_candidates(
+                cafeteria_menu,
+                weather,
+                location,
+                prefer_external
+            ),
+            # ✅ 이게 핵심
+            "avoidList": avoid_list
+        }
+
+        # 로컬 유사도 엔진이 있으면 의미적 제외는 후처리(_dedupe_recommendations)에서 결정적으로 처리
+        similar_rule = "" if menu_similarity.active else (
+            "- **중요**: avoidList에 있는 메뉴와 **의미적으로 유사하거나 같은 카테고리**의 메뉴도 제외하세요.\n"
+            "  예: avoidList에 \"김치찌개\"가 있으면 \"된장찌개\", \"순두부찌개\" 등도 제외\n"
+            "  예: avoidList에 \"돈까스\"가 있으면 \"치즈돈까스\", \"생선까스\" 등도 제외\n"
+            "  예: avoidList에 \"파스타\"가 있으면 \"크림파스타\", \"토마토파스타\" 등도 제외\n"
+        )
+
+        user_message = f"""
 아래 입력 데이터를 분석하여 최적의 점심 메뉴를 추천하고,
 결과를 JSON 형식으로 반환하세요.
 
@@ -202,11 +513,7 @@ class AIService:
 추가 규칙:
 - 입력의 avoidList에 있는 (restaurant_name, menu_name) 조합은
   이번 추천에서 **반드시 제외**하세요.
-- **중요**: avoidList에 있는 메뉴와 **의미적으로 유사하거나 같은 카테고리**의 메뉴도 제외하세요.
-  예: avoidList에 "김치찌개"가 있으면 "된장찌개", "순두부찌개" 등도 제외
-  예: avoidList에 "돈까스"가 있으면 "치즈돈까스", "생선까스" 등도 제외
-  예: avoidList에 "파스타"가 있으면 "크림파스타", "토마토파스타" 등도 제외
-- 상위호환 1개, 대체 1개, 예외 1개를 우선 생성하되
+{similar_rule}- 상위호환 1개, 대체 1개, 예외 1개를 우선 생성하되
   조건에 맞는 게 없으면 있는 것만 내보내세요.
 - 다양한 카테고리의 메뉴를 추천하세요 (한식, 중식, 일식, 양식 등을 골고루).
 
@@ -240,101 +547,252 @@ class AIService:
 }}
 """
 
-            generation_config = genai.types.GenerationConfig(
-                response_mime_type="application/json",
-                temperature=0.8,
-            )
+        return avoid_list, user_message
 
-            response = self.model.generate_content(
-                user_message,
-                generation_config=generation_config
-            )
-            content = response.text
-
-            try:
-                recommendation = json.loads(content)
-
-                if recommendation.get('need_more_info', False):
-                    print("⚠️ 정보 부족:", recommendation.get('missing', []))
-                    return self._get_fallback_cafeteria_recommendation(
-                        weather,
-                        cafeteria_menu
-                    )
-
-                print(
-                    "✅ AI 추천 성공 (개수:",
-                    len(recommendation.get('recommendations', [])),
-                    ")"
-                )
+    def _cafeteria_avoid_list(
+        self,
+        previous: List[Dict],
+        daily_menus: Optional[list]
+    ) -> List[Dict]:
+        """이 세션의 이전 추천 + 오늘의 추천 메뉴 → avoidList"""
+        avoid_list = list(previous)
+
+        # ✅ 오늘의 추천 메뉴도 avoid_list에 추가
+        if daily_menus:
+            for menu in daily_menus:
+                avoid_list.append({
+                    "restaurant_name": menu.get("restaurant_name"),
+                    "menu_name": menu.get("menu_name")
+                })
+        return avoid_list
+
+    def _cafeteria_generation_config(self):
+        return {
+            "response_mime_type": "application/json",
+            "temperature": 0.8,
+        }
 
-            except json.JSONDecodeError as e:
-                print("JSON 파싱 오류:", str(e))
-                print("응답 내용:", content[:500], "...")
-                return self._get_fallback_cafeteria_recommendation(
-                    weather,
-                    cafeteria_menu
-                )
+    def _with_cafeteria_context(
+        self,
+        recommendation: Dict,
+        recs: List[Dict],
+        weather: Dict,
+        cafeteria_menu: str
+    ) -> Dict:
+        """최종 추천 목록 + 하위호환 필드들 추가"""
+        recommendation["recommendations"] = recs
+        recommendation["weather_info"] = {
+            "location": weather.get("location"),
+            "temperature": weather.get("temperature"),
+            "condition": weather.get("sky_condition"),
+            "precipitation": weather.get("precipitation")
+        }
+        recommendation["cafeteria_menu"] = cafeteria_menu
+        recommendation["weather_summary"] = (
+            f"{weather.get('temperature', 20)}°C, "
+            f"{weather.get('sky_condition', '맑음')}"
+        )
+        return recommendation
 
-            # ✅ 1차: 모델이 준 거 중복 제거
-            deduped = self._dedupe_recommendations(
-                recommendation.get("recommendations", [])
-            )
+    # =======================================================================
+    # 2-1) 구내식당 추천 캐시 (표준화된 메뉴 기준)
+    # =======================================================================
+    def _cafeteria_cache_key(
+        self,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool
+    ) -> tuple:
+        """구내식당 추천 캐시 키: (표준화된 메뉴, 기온 구간, 날씨 상태, 거리 선호, 주변 후보 식당 or 위치 구역)"""
+        temp = weather.get("temperature", 20)
+        condition = self._normalize_weather_condition(
+            weather.get("sky_condition", "맑음"),
+            temp
+        )
 
-            # ✅ 2차: "국물인데 상위호환이 제육/돈까스/마라탕으로 나왔다" → 강제 대체로 돌리기
-            fixed = self._fix_wrong_hierarchy_for_soups(
-                cafeteria_menu,
-                deduped
-            )
+        # 식당 카탈로그가 있으면 실제 후보 식당 목록으로 구분 (캐시된 추천이 내 도보 반경 밖 식당을 가리키지 않게)
+        # 없으면 가상 후보라 위치만 대략 구분 (소수점 둘째 자리 ≈ 1km, 같은 사옥/단지면 같은 구역)
+        candidates = self._catalog_candidates(location, prefer_external)
+        if candidates:
+            cell = tuple(sorted(p["placeId"] for p in candidates))
+        else:
+            coords = self._location_coords(location)
+            cell = (round(coords[0], 2), round(coords[1], 2)) if coords else None
+
+        return (
+            canonical_menu_key(cafeteria_menu),
+            int(temp // self.cafeteria_cache_temp_bucket),
+            condition,
+            "5-15" if prefer_external else "0-5",
+            cell
+        )
 
-            # ✅ 저장 → 다음 호출에서 피하도록
-            self.last_recommendations = fixed
+    def _serve_cached_cafeteria(
+        self,
+        cache_key: tuple,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool,
+        daily_menus: Optional[list],
+        session_id: Optional[str]
+    ) -> Optional[Dict]:
+        """
+        캐시된 변형 중 avoidList와 겹치지 않는 것을 돌려가며 선택
 
-            # 하위호환 필드들 추가
-            recommendation["recommendations"] = fixed
-            recommendation["weather_info"] = {
-                "location": weather.get("location"),
-                "temperature": weather.get("temperature"),
-                "condition": weather.get("sky_condition"),
-                "precipitation": weather.get("precipitation")
-            }
-            recommendation["cafeteria_menu"] = cafeteria_menu
-            recommendation["weather_summary"] = (
-                f"{weather.get('temperature', 20)}°C, "
-                f"{weather.get('sky_condition', '맑음')}"
+        Returns:
+            dict: recommend_from_cafeteria_menu와 같은 형식 (캐시 없음/전부 겹치면 None)
+        """
+        entry = self._cafeteria_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        avoid_list = self._cafeteria_avoid_list(self.session_history.get(session_id), daily_menus)
+        variant = self._next_cafeteria_variant(entry, avoid_list)
+        if variant is None:
+            self.cafeteria_cache_clashes += 1
+            return None
+
+        if (len(entry["variants"]) < self.cafeteria_cache_variants
+                and not self._variant_backing_off("cafeteria", cache_key)):
+            self._start_cafeteria_generation(
+                cache_key, weather, cafeteria_menu, location, prefer_external
             )
+        print(f"💾 구내식당 추천 캐시 적중: {cache_key[0]} (변형 {len(entry['variants'])}개)")
+
+        # 캐시 원본은 그대로 두고 복사본에 이번 요청의 날씨/메뉴 정보를 붙임
+        result = copy.deepcopy(variant)
+        self.session_history.record(session_id, result["recommendations"])
+        return self._with_cafeteria_context(result, result["recommendations"], weather, cafeteria_menu)
+
+    def _next_cafeteria_variant(self, entry: Dict, avoid_list: List[Dict]) -> Optional[Dict]:
+        """다음 차례부터 돌면서 avoidList와 (식당, 메뉴)가 겹치거나 비슷한 메뉴가 없는 첫 변형"""
+        avoid_pairs = {
+            (a.get("restaurant_name") or "", a.get("menu_name") or "")
+            for a in avoid_list
+        }
+        avoid_menus = [a.get("menu_name") for a in avoid_list if a.get("menu_name")]
+
+        variants = entry["variants"]
+        for offset in range(len(variants)):
+            index = (entry["next"] + offset) % len(variants)
+            recs = variants[index]["recommendations"]
+            if any(
+                (r.get("restaurant_name") or "", r.get("menu_name") or "") in avoid_pairs
+                or r.get("menu_name") in avoid_menus
+                for r in recs
+            ) or any(menu_similarity.similar_mask([r.get("menu_name", "") for r in recs], avoid_menus)):
+                continue
+            entry["next"] = index + 1
+            return variants[index]
+        return None
+
+    def _store_cafeteria_variant(self, cache_key: tuple, recommendation: Dict):
+        """LLM 결과를 변형으로 추가 (가득 차면 가장 오래된 변형을 밀어냄)"""
+        if not recommendation.get("recommendations"):
+            return
+
+        variant = copy.deepcopy({
+            "recommendations": recommendation["recommendations"],
+            "brief_rationale": recommendation.get("brief_rationale", ""),
+            "need_more_info": False,
+            "missing": [],
+        })
+        entry = self._cafeteria_cache.peek(cache_key)
+        if entry is None:
+            self._cafeteria_cache.set(cache_key, {"variants": [variant], "next": 1})
+            return
 
-            return recommendation
+        entry["variants"].append(variant)
+        if len(entry["variants"]) > self.cafeteria_cache_variants:
+            entry["variants"].pop(0)
 
-        except Exception as e:
-            print("AI 추천 오류:", str(e))
-            import traceback
-            traceback.print_exc()
-            return self._get_fallback_cafeteria_recommendation(
-                weather,
-                cafeteria_menu
+    def _start_cafeteria_generation(
+        self,
+        cache_key: tuple,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool
+    ) -> asyncio.Task:
+        """
+        키별로 하나만 실행되는 변형 추가 생성 시작 (이미 진행 중이면 그 작업 반환)
+        - 공유 캐시용이라 세션 이력/요청자의 오늘의 추천 없이 생성
+        """
+        task = self._cafeteria_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate_and_store_cafeteria(
+                    cache_key, weather, cafeteria_menu, location, prefer_external
+                )
             )
+            self._cafeteria_inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._cafeteria_inflight.pop(cache_key, None))
+        return task
+
+    async def _generate_and_store_cafeteria(
+        self,
+        cache_key: tuple,
+        weather: Dict,
+        cafeteria_menu: str,
+        location: Optional[Dict],
+        prefer_external: bool
+    ):
+        """백그라운드에서 변형 하나 생성 후 캐시에 추가 (실패는 무시)"""
+        try:
+            recommendation, cacheable = await self._generate_cafeteria_recommendation(
+                weather, cafeteria_menu, location, prefer_external, None, None
+            )
+        except Exception as e:
+            print("❌ 구내식당 추천 변형 생성 오류:", e)
+            self._note_llm_error(e)
+            recommendation, cacheable = None, False
+        self._note_variant_result("cafeteria", cache_key, recommendation is not None)
+        if recommendation is not None and cacheable:
+            self._store_cafeteria_variant(cache_key, recommendation)
+
+    def get_cafeteria_cache_stats(self) -> Dict:
+        """구내식당 추천 캐시 통계"""
+        return {
+            **self._cafeteria_cache.stats(),
+            "max_variants": self.cafeteria_cache_variants,
+            "temp_bucket": self.cafeteria_cache_temp_bucket,
+            "inflight": len(self._cafeteria_inflight),
+            "avoid_clashes": self.cafeteria_cache_clashes,
+            "retry_backoff_keys": self._variant_backoff_count("cafeteria"),
+        }
 
     # =======================================================================
     # 3) 중복 제거
     # =======================================================================
     def _dedupe_recommendations(
         self,
-        recs: List[Dict]
-    ) -> List[Dict]:
+        recs: List[Dict],
+        avoid_list: Optional[List[Dict]] = None
+    ) -> Tuple[List[Dict], bool]:
         """
         모델이 무시하고 똑같은 식당/메뉴를 다시 줬을 때
         파이썬단에서 한 번 더 걸러주는 함수
+        + avoidList 메뉴와 비슷한 메뉴(김치찌개 → 된장찌개)도 로컬 유사도로 제외
+
+        Args:
+            avoid_list: 이 세션의 이전 추천 + 오늘의 추천 (_cafeteria_avoid_list 결과)
+
+        Returns:
+            (list, bool): 걸러진 추천 + avoidList와 겹치는 메뉴 없이 걸러졌는지
+                          (전부 걸려서 원본으로 채웠으면 False)
         """
         if not recs:
-            return recs
+            return recs, True
 
-        # 직전 호출에서 나왔던 (식당, 메뉴)
+        # 이 세션의 이전 호출 / 오늘의 추천에서 나왔던 (식당, 메뉴)
         prev_keys = {
             (
                 r.get("restaurant_name", ""),
                 r.get("menu_name", "")
             )
-            for r in self.last_recommendations
+            for r in avoid_list or []
         }
 
         seen_now = set()
@@ -350,15 +808,24 @@ class AIService:
             if key in seen_now:
                 continue
 
-            # 직전 응답과 중복이면 스킵
+            # 이전 응답과 중복이면 스킵
             if key in prev_keys:
                 continue
 
             seen_now.add(key)
             filtered.append(r)
 
+        # 의미적으로 비슷한 메뉴 제외 (전부 비슷하면 완전 일치만 뺀 목록 유지)
+        similar = menu_similarity.similar_mask(
+            [r.get("menu_name", "") for r in filtered],
+            [r.get("menu_name") for r in avoid_list or []]
+        )
+        distinct = [r for r, is_similar in zip(filtered, similar) if not is_similar]
+
         # 혹시 다 빠져버리면 원본이라도 돌려주기
-        return filtered or recs
+        if distinct:
+            return distinct, True
+        return filtered or recs, False
 
     # =======================================================================
     # 4) 찌개인데 상위호환이 볶음 / 마라탕으로 나온 케이스 고치기
@@ -378,21 +845,10 @@ class AIService:
           → 제육볶음/마라탕은 '대체 메뉴'로 내려버리고
           → 이미 대체가 있으면 자리를 바꾸거나, 후순위로 보낸다
         """
-        # 한국 국물로 취급할 키워드들 ↑ 여기 국밥/설렁탕/곰탕 추가
-        soup_keywords = [
-            "찌개", "국", "탕", "전골",
-            "국밥", "설렁탕", "곰탕", "감자탕"
-        ]
         # 원래 메뉴가 한국 국물 아니면 건드리지 않음
-        is_soup_menu = any(k in cafeteria_menu for k in soup_keywords)
-        if not is_soup_menu:
+        if not self._is_soup_menu(cafeteria_menu):
             return recs
 
-        # 상위에 올라오면 안 되는 것들 (국물 아닌 애들)
-        dry_keywords = ["볶음", "카츠", "까스", "돈까스", "제육", "덮밥", "구이"]
-        # 한국식 상위 대신 튀어나오는 중국 얼큰 탕류
-        chinese_spicy_soups = ["마라탕", "마라샹궈", "훠궈"]
-
         ups = []
         alts = []
         others = []
@@ -407,18 +863,12 @@ class AIService:
 
         fixed_ups = []
         for r in ups:
-            mn = r.get("menu_name", "") or ""
-            # 1) 상위인데 볶음/돈까스/덮밥 계열이면 → 대체로
-            if any(k in mn for k in dry_keywords):
-                r["type"] = "대체 메뉴"
-                alts.append(r)
-                continue
-            # 2) 상위인데 마라탕/마라샹궈/훠궈면 → 대체로
-            if any(k in mn for k in chinese_spicy_soups):
+            # 1) 상위인데 볶음/돈까스/덮밥 계열 or 마라탕/마라샹궈/훠궈면 → 대체로
+            if self._is_wrong_soup_upgrade(r.get("menu_name", "") or ""):
                 r["type"] = "대체 메뉴"
                 alts.append(r)
                 continue
-            # 3) 그 외는 정상 상위로 둔다
+            # 2) 그 외는 정상 상위로 둔다
             fixed_ups.append(r)
 
         # 상위가 하나도 없으면, alts/others 중에서 국물 계열 하나 올려줌
@@ -426,7 +876,7 @@ class AIService:
             promoted = None
             for cand in alts + others:
                 name = cand.get("menu_name", "") or ""
-                if any(k in name for k in soup_keywords):
+                if has_tag(name, SOUP) and not self._is_wrong_soup_upgrade(name):
                     cand["type"] = "상위 호환 메뉴"
                     promoted = cand
                     break
@@ -446,6 +896,15 @@ class AIService:
         # 최대 3개만
         return final_list[:3]
 
+    def _is_soup_menu(self, cafeteria_menu: str) -> bool:
+        """구내식당 메뉴가 한국 국물 계열인지"""
+        return has_tag(cafeteria_menu, SOUP)
+
+    def _is_wrong_soup_upgrade(self, menu_name: str) -> bool:
+        """국물 메뉴의 '상위 호환'으로 올라오면 안 되는 메뉴인지 (볶음/까스/덮밥, 중국 얼큰 탕류)"""
+        tags = classify_dish(menu_name).tags
+        return DRY in tags or CHINESE_SPICY in tags
+
     # =======================================================================
     # 5) 날씨 정규화
     # =======================================================================
@@ -473,16 +932,39 @@ class AIService:
     # =======================================================================
     # 6) 주변 식당 후보 만들기 (임시)
     # =======================================================================
+    def _location_coords(self, location: Optional[Dict]) -> Optional[tuple]:
+        """요청 위치 → (위도, 경도) ({latitude, longitude} / {lat, lng} 둘 다 허용, 없으면 None)"""
+        if not location:
+            return None
+        lat = location.get("latitude", location.get("lat"))
+        lng = location.get("longitude", location.get("lng"))
+        if lat is None or lng is None:
+            return None
+        return float(lat), float(lng)
+
+    def _catalog_candidates(self, location: Optional[Dict], prefer_external: bool) -> List[Dict]:
+        """식당 카탈로그에서 걸어갈 수 있는 실제 주변 식당 (카탈로그/좌표가 없으면 빈 목록)"""
+        coords = self._location_coords(location)
+        if not coords or not restaurant_catalog.loaded:
+            return []
+        return restaurant_catalog.nearby(coords[0], coords[1], max_minutes=15 if prefer_external else 5)
+
     def _generate_nearby_candidates(
         self,
         cafeteria_menu: str,
         weather: Dict,
-        location: Optional[Dict] = None
+        location: Optional[Dict] = None,
+        prefer_external: bool = True
     ) -> List[Dict]:
         """
-        가상의 주변 식당 후보 생성 (새 스키마)
-        실제 서비스에서는 카카오맵 API와 붙을 자리
+        주변 식당 후보 생성 (새 스키마)
+        식당 카탈로그가 로드돼 있으면 사용자 위치에서 걸어갈 수 있는 가까운 식당,
+        아니면 가상의 후보 목록 (실제 서비스에서는 카카오맵 API와 붙을 자리)
         """
+        nearby = self._catalog_candidates(location, prefer_external)
+        if nearby:
+            return nearby
+
         temp = weather.get('temperature', 20)
         condition = weather.get('sky_condition', '맑음')
 
@@ -742,69 +1224,81 @@ class AIService:
     def _get_fallback_cafeteria_recommendation(
         self,
         weather: Dict,
-        cafeteria_menu: str
+        cafeteria_menu: str,
+        session_id: Optional[str] = None,
+        daily_menus: Optional[list] = None,
+        prefer_external: bool = True,
+        location: Optional[Dict] = None
     ) -> Dict:
-        """API 오류 시 기본 추천 (새 스키마)"""
+        """API 오류 시 기본 추천 (새 스키마, 로컬 엔진이 있으면 메뉴 카탈로그 + 주변 식당 카탈로그 기반)"""
         temp = weather.get("temperature", 20)
 
-        recommendations = [
-            {
-                "type": "상위 호환 메뉴",
-                "restaurant_name": "프리미엄 한식당",
-                "place_id": "fallback_001",
-                "minutes_away": 10,
-                "menu_name": "한정식",
-                "reason": (
-                    "구내식당보다 고급스러운 재료와 정성스러운 조리로 "
-                    "영양 균형이 뛰어납니다."
-                ),
-                "price_range": "15,000-20,000원",
-                "normalized_search_query": "한정식",
-                "alt_queries": ["한식", "정식"],
-                "category_group_code": "FD6"
-            },
-            {
-                "type": "대체 메뉴",
-                "restaurant_name": "김치찌개 전문점",
-                "place_id": "fallback_002",
-                "minutes_away": 5,
-                "menu_name": "김치찌개",
-                "reason": (
-                    "구수한 맛과 풍부한 재료로 든든하며, 영양가 높은 한식입니다."
-                ),
-                "price_range": "8,000-10,000원",
-                "normalized_search_query": "김치찌개",
-                "alt_queries": ["찌개", "한식"],
-                "category_group_code": "FD6"
-            },
-            {
-                "type": "예외 메뉴",
-                "restaurant_name": "냉면집" if temp > 25 else "칼국수집",
-                "place_id": "fallback_003",
-                "minutes_away": 7,
-                "menu_name": (
-                    "냉면" if temp > 25 else "칼국수"
-                ),
-                "reason": (
-                    "시원한 육수와 신선한 재료로 더위를 식히기 좋습니다."
-                    if temp > 25 else
-                    "따뜻한 국물과 쫄깃한 면발로 몸을 녹이기 좋습니다."
-                ),
-                "price_range": "9,000-12,000원",
-                "normalized_search_query": (
-                    "냉면" if temp > 25 else "칼국수"
-                ),
-                "alt_queries": (
-                    ["평양냉면", "함흥냉면"]
-                    if temp > 25 else
-                    ["한식", "국수"]
-                ),
-                "category_group_code": "FD6"
-            }
-        ]
+        recommendations = None
+        if local_recommender.active:
+            avoid_list = self._cafeteria_avoid_list(self.session_history.get(session_id), daily_menus)
+            recommendations = local_recommender.recommend_cafeteria(
+                weather, cafeteria_menu, avoid_list, self._catalog_candidates(location, prefer_external)
+            )
+
+        if not recommendations:
+            recommendations = [
+                {
+                    "type": "상위 호환 메뉴",
+                    "restaurant_name": "프리미엄 한식당",
+                    "place_id": "fallback_001",
+                    "minutes_away": 10,
+                    "menu_name": "한정식",
+                    "reason": (
+                        "구내식당보다 고급스러운 재료와 정성스러운 조리로 "
+                        "영양 균형이 뛰어납니다."
+                    ),
+                    "price_range": "15,000-20,000원",
+                    "normalized_search_query": "한정식",
+                    "alt_queries": ["한식", "정식"],
+                    "category_group_code": "FD6"
+                },
+                {
+                    "type": "대체 메뉴",
+                    "restaurant_name": "김치찌개 전문점",
+                    "place_id": "fallback_002",
+                    "minutes_away": 5,
+                    "menu_name": "김치찌개",
+                    "reason": (
+                        "구수한 맛과 풍부한 재료로 든든하며, 영양가 높은 한식입니다."
+                    ),
+                    "price_range": "8,000-10,000원",
+                    "normalized_search_query": "김치찌개",
+                    "alt_queries": ["찌개", "한식"],
+                    "category_group_code": "FD6"
+                },
+                {
+                    "type": "예외 메뉴",
+                    "restaurant_name": "냉면집" if temp > 25 else "칼국수집",
+                    "place_id": "fallback_003",
+                    "minutes_away": 7,
+                    "menu_name": (
+                        "냉면" if temp > 25 else "칼국수"
+                    ),
+                    "reason": (
+                        "시원한 육수와 신선한 재료로 더위를 식히기 좋습니다."
+                        if temp > 25 else
+                        "따뜻한 국물과 쫄깃한 면발로 몸을 녹이기 좋습니다."
+                    ),
+                    "price_range": "9,000-12,000원",
+                    "normalized_search_query": (
+                        "냉면" if temp > 25 else "칼국수"
+                    ),
+                    "alt_queries": (
+                        ["평양냉면", "함흥냉면"]
+                        if temp > 25 else
+                        ["한식", "국수"]
+                    ),
+                    "category_group_code": "FD6"
+                }
+            ]
 
         # ✅ 폴백도 저장해두면 다음 호출에서 이걸 피할 수 있음
-        self.last_recommendations = recommendations
+        self.session_history.record(session_id, recommendations)
 
         return {
             "recommendations": recommendations,
@@ -834,14 +1328,136 @@ class AIService:
         weather: Dict,
         location: str
     ) -> Dict:
-        """오늘의 추천 메뉴 3개 생성 (위치 & 날씨 기반, 실제 검색 가능한 메뉴만)"""
-        if not self.use_ai:
+        """
+        오늘의 추천 메뉴 3개 (위치 & 날씨 기반, 실제 검색 가능한 메뉴만)
+
+        같은 (위치, 기온 구간, 날씨 상태, 날짜)면 캐시된 변형 중 하나를 돌려가며 반환하고,
+        변형이 DAILY_CACHE_VARIANTS개보다 적으면 백그라운드에서 하나 더 생성
+        """
+        if not self.llm_available():
+            return self._get_fallback_daily_recommendations(weather, location)
+
+        cache_key = self._daily_cache_key(weather, location)
+
+        # 1) 사전 생성 테이블 (점심시간에는 대부분 여기서 끝남)
+        entry = self._precomputed_daily.get(cache_key)
+        if entry is not None:
+            self.precomputed_hits += 1
+            return self._with_daily_weather(self._next_variant(entry), weather, location)
+
+        # 2) 요청 기반 캐시
+        entry = self._daily_cache.get(cache_key)
+        if entry is not None:
+            variants = entry["variants"]
+            result = self._next_variant(entry)
+            if len(variants) < self.daily_cache_variants and not self._variant_backing_off("daily", cache_key):
+                self._start_daily_generation(cache_key, weather, location)
+            print(f"💾 오늘의 추천 캐시 적중: {cache_key} (변형 {len(variants)}개)")
+            return self._with_daily_weather(result, weather, location)
+
+        # 캐시 미스: 같은 키의 동시 요청은 LLM 호출 하나로 병합
+        task = self._start_daily_generation(cache_key, weather, location)
+        result = await asyncio.shield(task)
+        if result is None:
             return self._get_fallback_daily_recommendations(weather, location)
 
+        return self._with_daily_weather(result, weather, location)
+
+    def _next_variant(self, entry: Dict) -> Dict:
+        """변형 목록에서 순서대로 하나씩 돌려가며 선택"""
+        variants = entry["variants"]
+        result = variants[entry["next"] % len(variants)]
+        entry["next"] += 1
+        return result
+
+    def set_precomputed_daily(self, table: Dict[tuple, List[Dict]]):
+        """사전 생성된 오늘의 추천 테이블 교체 (이전 날짜 테이블은 통째로 버림)"""
+        self._precomputed_daily = {
+            key: {"variants": variants, "next": 0}
+            for key, variants in table.items()
+            if variants
+        }
+
+    def _daily_cache_key(self, weather: Dict, location: str) -> tuple:
+        """오늘의 추천 캐시 키: (위치, 기온 구간, 정규화된 날씨 상태, 날짜)"""
+        temp = weather.get("temperature", 20)
+        temp_bucket = int(temp // self.daily_cache_temp_bucket)
+        condition = self._normalize_weather_condition(
+            weather.get("sky_condition", "맑음"),
+            temp
+        )
+        return (
+            (location or "").strip(),
+            temp_bucket,
+            condition,
+            today_kst_str()
+        )
+
+    def _start_daily_generation(self, cache_key: tuple, weather: Dict, location: str) -> asyncio.Task:
+        """키별로 하나만 실행되는 LLM 생성 작업 시작 (이미 진행 중이면 그 작업 반환)"""
+        task = self._daily_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._generate_and_store_daily(cache_key, weather, location)
+            )
+            self._daily_inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._daily_inflight.pop(cache_key, None))
+        return task
+
+    async def _generate_and_store_daily(
+        self,
+        cache_key: tuple,
+        weather: Dict,
+        location: str
+    ) -> Optional[Dict]:
+        """LLM으로 변형 하나를 생성해 캐시에 추가 (실패 시 None, 폴백은 캐시하지 않음)"""
         try:
-            daily_model = genai.GenerativeModel('gemini-2.0-flash')
+            result = await self._generate_daily_recommendations(weather, location)
+        except Exception as e:
+            print("❌ 오늘의 추천 메뉴 생성 오류:", e)
+            self._note_llm_error(e)
+            self._note_variant_result("daily", cache_key, False)
+            return None
+        self._note_variant_result("daily", cache_key, True)
+
+        entry = self._daily_cache.peek(cache_key)
+        if entry is None:
+            self._daily_cache.set(cache_key, {"variants": [result], "next": 1})
+        elif len(entry["variants"]) < self.daily_cache_variants:
+            entry["variants"].append(result)
+        return result
+
+    def _with_daily_weather(self, result: Dict, weather: Dict, location: str) -> Dict:
+        """캐시된 결과에 현재 요청의 날씨 정보를 덮어써서 반환 (캐시 원본은 그대로)"""
+        return {
+            **result,
+            "weather": {
+                'location': location,
+                'temperature': weather.get('temperature'),
+                'condition': weather.get('sky_condition'),
+                'precipitation': weather.get('precipitation', 0)
+            }
+        }
 
-            prompt = f"""
+    def get_cache_stats(self) -> Dict:
+        """오늘의 추천 캐시 통계"""
+        return {
+            **self._daily_cache.stats(),
+            "max_variants": self.daily_cache_variants,
+            "temp_bucket": self.daily_cache_temp_bucket,
+            "inflight": len(self._daily_inflight),
+            "retry_backoff_keys": self._variant_backoff_count("daily"),
+            "precomputed_keys": len(self._precomputed_daily),
+            "precomputed_hits": self.precomputed_hits,
+        }
+
+    async def _generate_daily_recommendations(
+        self,
+        weather: Dict,
+        location: str
+    ) -> Dict:
+        """LLM으로 오늘의 추천 메뉴 3개 생성 (실패 시 예외 발생)"""
+        prompt = f"""
 오늘의 점심 메뉴 3가지를 추천해주세요.
 
 **위치:** {location}
@@ -892,42 +1508,38 @@ class AIService:
 - 메뉴명은 반드시 형용사 없이 음식 이름만 사용하세요.
 """
 
-            response = daily_model.generate_content(prompt)
-            response_text = response.text.strip()
-
-            if '```json' in response_text:
-                response_text = (
-                    response_text.split('```json')[1]
-                    .split('```')[0]
-                    .strip()
-                )
-            elif '```' in response_text:
-                response_text = (
-                    response_text.split('```')[1]
-                    .split('```')[0]
-                    .strip()
-                )
+        response = await llm_executor.run(self.daily_model.generate_content, prompt)
+        response_text = response.text.strip()
 
-            result = json.loads(response_text)
+        if '```json' in response_text:
+            response_text = (
+                response_text.split('```json')[1]
+                .split('```')[0]
+                .strip()
+            )
+        elif '```' in response_text:
+            response_text = (
+                response_text.split('```')[1]
+                .split('```')[0]
+                .strip()
+            )
 
-            result['weather'] = {
-                'location': location,
-                'temperature': weather.get('temperature'),
-                'condition': weather.get('sky_condition'),
-                'precipitation': weather.get('precipitation', 0)
-            }
+        result = json.loads(response_text)
 
-            print(
-                "✅ 오늘의 추천 메뉴 생성 완료:",
-                len(result.get('recommendations', [])),
-                "개"
-            )
+        result['weather'] = {
+            'location': location,
+            'temperature': weather.get('temperature'),
+            'condition': weather.get('sky_condition'),
+            'precipitation': weather.get('precipitation', 0)
+        }
 
-            return result
+        print(
+            "✅ 오늘의 추천 메뉴 생성 완료:",
+            len(result.get('recommendations', [])),
+            "개"
+        )
 
-        except Exception as e:
-            print("❌ 오늘의 추천 메뉴 생성 오류:", e)
-            return self._get_fallback_daily_recommendations(weather, location)
+        return result
 
     async def get_daily_recommendations_with_exclusion(
         self,
@@ -936,12 +1548,10 @@ class AIService:
         cafeteria_menu: str
     ) -> Dict:
         """구내식당 메뉴와 연관성이 낮은 오늘의 추천 메뉴 생성"""
-        if not self.use_ai:
-            return self._get_fallback_daily_recommendations(weather, location)
+        if not self.llm_available():
+            return self._get_fallback_daily_recommendations(weather, location, cafeteria_menu)
 
         try:
-            daily_model = genai.GenerativeModel('gemini-2.0-flash')
-
             prompt = f"""
 오늘의 점심 메뉴 3가지를 추천해주세요.
 
@@ -998,7 +1608,7 @@ class AIService:
 - 구내식당 메뉴와 유사한 카테고리는 피하세요.
 """
 
-            response = daily_model.generate_content(prompt)
+            response = await llm_executor.run(self.daily_model.generate_content, prompt)
             response_text = response.text.strip()
 
             if '```json' in response_text:
@@ -1033,18 +1643,22 @@ class AIService:
 
         except Exception as e:
             print("❌ 오늘의 추천 메뉴 재생성 오류:", e)
-            return self._get_fallback_daily_recommendations(weather, location)
+            self._note_llm_error(e)
+            return self._get_fallback_daily_recommendations(weather, location, cafeteria_menu)
 
     def _get_fallback_daily_recommendations(
         self,
         weather: Dict,
-        location: str
+        location: str,
+        cafeteria_menu: Optional[str] = None
     ) -> Dict:
-        """AI 오류 시 폴백 오늘의 추천 메뉴"""
+        """AI 오류 시 폴백 오늘의 추천 메뉴 (로컬 엔진이 있으면 날씨 적합도 순, 구내식당 메뉴 제외)"""
         temp = weather.get("temperature", 20)
         condition = weather.get("sky_condition", "맑음")
 
-        if temp < 10:
+        if local_recommender.active:
+            recommendations = local_recommender.recommend_daily(weather, cafeteria_menu)
+        elif temp < 10:
             recommendations = [
                 {
                     "menu_name": "김치찌개",
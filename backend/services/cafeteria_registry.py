@@ -0,0 +1,172 @@
+"""
+Cafeteria Registry
+같은 회사/사이트 사용자들이 공유하는 구내식당 정보 (ID, 위치, 오늘의 메뉴)
+- 그날 처음 들어온 OCR/텍스트 결과로 오늘 메뉴를 한 번만 채우고
+- 이후 요청은 구내식당 ID만 보내면 이미지 업로드/OCR 없이 같은 메뉴 사용
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from services.kst_clock import today_kst_str
+
+load_dotenv()
+
+DEFAULT_REGISTRY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cafeterias.sqlite3"
+)
+
+
+class CafeteriaRegistry:
+    """SQLite 기반 구내식당 레지스트리"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("CAFETERIA_DB_PATH", DEFAULT_REGISTRY_PATH)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cafeterias (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                location TEXT,
+                latitude REAL,
+                longitude REAL,
+                menu_date TEXT,
+                menu_list TEXT,
+                source TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _today() -> str:
+        return today_kst_str()
+
+    async def create(
+        self,
+        name: Optional[str] = None,
+        location: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> Dict:
+        """새 구내식당 등록 후 정보 반환"""
+        cafeteria_id = uuid.uuid4().hex[:12]
+        await asyncio.to_thread(
+            self._execute,
+            """
+            INSERT INTO cafeterias (id, name, location, latitude, longitude, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (cafeteria_id, name, location, latitude, longitude, time.time())
+        )
+        return await self.get(cafeteria_id)
+
+    async def get(self, cafeteria_id: str) -> Optional[Dict]:
+        """
+        구내식당 정보 조회
+
+        Returns:
+            dict: {id, name, location, latitude, longitude, today_menu, source}
+                  (today_menu는 오늘 날짜로 채워진 경우만, 아니면 None)
+        """
+        row = await asyncio.to_thread(self._fetch_row, cafeteria_id)
+        if row is None:
+            return None
+
+        is_today = row["menu_date"] == self._today()
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "location": row["location"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+            "today_menu": json.loads(row["menu_list"]) if is_today and row["menu_list"] else None,
+            "source": row["source"] if is_today else None,
+        }
+
+    async def set_today_menu(
+        self,
+        cafeteria_id: str,
+        menu_list: List[str],
+        source: str,
+        location: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> bool:
+        """
+        오늘 메뉴 등록 (그날 첫 번째 결과만 반영, 없던 구내식당 ID면 새로 만듦)
+        단, 검증되지 않은 텍스트 입력("text")은 같은 날 이미지에서 읽은 메뉴("ocr"/"week")로 교체 가능
+
+        Args:
+            source: "ocr" | "text" | "week" (어디서 온 메뉴인지)
+
+        Returns:
+            bool: 이번 호출로 오늘 메뉴가 채워졌으면 True
+        """
+        if not menu_list:
+            return False
+
+        return await asyncio.to_thread(
+            self._set_today_menu_sync,
+            cafeteria_id, menu_list, source, location, latitude, longitude
+        )
+
+    def _set_today_menu_sync(self, cafeteria_id, menu_list, source, location, latitude, longitude) -> bool:
+        today = self._today()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO cafeterias (id, location, latitude, longitude, menu_date, menu_list, source, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    menu_date = excluded.menu_date,
+                    menu_list = excluded.menu_list,
+                    source = excluded.source,
+                    location = COALESCE(cafeterias.location, excluded.location),
+                    latitude = COALESCE(cafeterias.latitude, excluded.latitude),
+                    longitude = COALESCE(cafeterias.longitude, excluded.longitude),
+                    updated_at = excluded.updated_at
+                WHERE cafeterias.menu_date IS NULL
+                   OR cafeterias.menu_date != excluded.menu_date
+                   OR (cafeterias.source = 'text' AND excluded.source != 'text')
+                """,
+                (
+                    cafeteria_id, location, latitude, longitude,
+                    today, json.dumps(menu_list, ensure_ascii=False), source, time.time()
+                )
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def _fetch_row(self, cafeteria_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM cafeterias WHERE id = ?", (cafeteria_id,)
+            ).fetchone()
+
+    def _execute(self, sql: str, params: tuple):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def close(self):
+        """SQLite 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+# 싱글톤 인스턴스
+cafeteria_registry = CafeteriaRegistry()
@@ -0,0 +1,174 @@
+"""
+Daily Precompute Service
+점심 피크 전에 주요 도시 × 예상 날씨 구간별 오늘의 추천을 미리 생성해 두는 스케줄러
+(11:00~13:30 요청은 LLM 호출 없이 조회만)
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, time as dtime
+from typing import Dict, List, Optional, Set
+from dotenv import load_dotenv
+from services.kst_clock import KST
+
+load_dotenv()
+
+
+def _parse_hhmm(value: str) -> dtime:
+    """'10:30' → time(10, 30)"""
+    hour, minute = value.strip().split(":")
+    return dtime(int(hour), int(minute))
+
+
+class DailyPrecomputeService:
+    """점심시간 오늘의 추천 사전 생성 스케줄러"""
+
+    def __init__(self, weather_service, ai_service):
+        self.weather_service = weather_service
+        self.ai_service = ai_service
+
+        self.enabled = os.getenv("DAILY_PRECOMPUTE_ENABLED", "true").lower() == "true"
+        # 매일 이 시각(KST)에 사전 생성 시작
+        self.run_at = _parse_hhmm(os.getenv("DAILY_PRECOMPUTE_AT", "10:30"))
+        # 이 시간대의 날씨 예보로 필요한 날씨 구간을 뽑음
+        window_start, window_end = os.getenv("DAILY_PRECOMPUTE_WINDOW", "11:00-13:30").split("-")
+        self.window_start = _parse_hhmm(window_start)
+        self.window_end = _parse_hhmm(window_end)
+        self.sample_minutes = int(os.getenv("DAILY_PRECOMPUTE_SAMPLE_MINUTES", "30"))
+        self.variants = int(os.getenv("DAILY_PRECOMPUTE_VARIANTS", str(ai_service.daily_cache_variants)))
+
+        self._task: Optional[asyncio.Task] = None
+        self.last_run_at: Optional[str] = None
+        self.last_generated = 0
+        self.last_failed = 0
+
+    # =======================================================================
+    # 스케줄러
+    # =======================================================================
+    def start(self):
+        """스케줄러 시작 (lifespan에서 호출)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+        print(f"✅ 오늘의 추천 사전 생성 스케줄러 시작 (매일 {self.run_at:%H:%M} KST)")
+
+    async def stop(self):
+        """스케줄러 종료"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        # 사전 생성 시각 ~ 점심시간 끝 사이에 서버가 (재)시작됐으면 바로 한 번 실행
+        now = datetime.now(KST)
+        if self.run_at <= now.time() < self.window_end:
+            await self._run_safely()
+
+        while True:
+            await asyncio.sleep(self._seconds_until_next_run())
+            await self._run_safely()
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now(KST)
+        next_run = datetime.combine(now.date(), self.run_at, tzinfo=KST)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _run_safely(self):
+        try:
+            await self.precompute()
+        except Exception as e:
+            print(f"❌ 오늘의 추천 사전 생성 오류: {e}")
+
+    # =======================================================================
+    # 사전 생성
+    # =======================================================================
+    def _lunch_sample_times(self) -> List[datetime]:
+        """오늘 점심시간 안의 샘플 시각 목록 (KST)"""
+        today = datetime.now(KST).date()
+        current = datetime.combine(today, self.window_start, tzinfo=KST)
+        end = datetime.combine(today, self.window_end, tzinfo=KST)
+
+        times = []
+        while current <= end:
+            times.append(current)
+            current += timedelta(minutes=self.sample_minutes)
+        return times
+
+    async def precompute(self) -> int:
+        """
+        모든 주요 도시 × 점심시간에 예상되는 날씨 구간별로 추천 변형을 생성해 테이블로 저장
+
+        Returns:
+            int: 생성된 추천 수
+        """
+        print("🍱 오늘의 추천 사전 생성 시작...")
+        sample_times = self._lunch_sample_times()
+
+        # 1. 도시별로 점심시간에 나올 수 있는 캐시 키(날씨 구간) 수집
+        targets: Dict[tuple, tuple] = {}  # cache_key -> (weather, city)
+        for city in self.weather_service.LOCATION_COORDS:
+            seen: Set[tuple] = set()
+            for when in sample_times:
+                weather = await self.weather_service.get_weather_at(city, when=when)
+                if weather.get("note"):
+                    # 더미 날씨로는 미리 만들지 않음
+                    continue
+                cache_key = self.ai_service._daily_cache_key(weather, city)
+                if cache_key not in seen:
+                    seen.add(cache_key)
+                    targets[cache_key] = (weather, city)
+
+        # 2. 키마다 변형 N개 생성 (동시 실행 수는 LLM Executor가 제한)
+        async def _generate(weather: Dict, city: str) -> Optional[Dict]:
+            try:
+                return await self.ai_service._generate_daily_recommendations(weather, city)
+            except Exception as e:
+                print(f"⚠️ 사전 생성 실패 ({city}): {e}")
+                return None
+
+        keys = list(targets)
+        jobs = [
+            _generate(*targets[key])
+            for key in keys
+            for _ in range(self.variants)
+        ]
+        results = await asyncio.gather(*jobs)
+
+        # 3. 물리화된 테이블로 교체
+        table: Dict[tuple, List[Dict]] = {}
+        for i, key in enumerate(keys):
+            variants = [
+                r for r in results[i * self.variants:(i + 1) * self.variants]
+                if r is not None
+            ]
+            if variants:
+                table[key] = variants
+
+        self.ai_service.set_precomputed_daily(table)
+
+        self.last_run_at = datetime.now(KST).isoformat(timespec="seconds")
+        self.last_generated = sum(len(v) for v in table.values())
+        self.last_failed = len(jobs) - self.last_generated
+        print(
+            f"✅ 오늘의 추천 사전 생성 완료: {len(table)}개 키, "
+            f"{self.last_generated}개 생성, {self.last_failed}개 실패"
+        )
+        return self.last_generated
+
+    def get_stats(self) -> Dict:
+        """사전 생성 통계"""
+        return {
+            "enabled": self.enabled,
+            "run_at": self.run_at.strftime("%H:%M"),
+            "window": f"{self.window_start:%H:%M}-{self.window_end:%H:%M}",
+            "last_run_at": self.last_run_at,
+            "last_generated": self.last_generated,
+            "last_failed": self.last_failed,
+        }
@@ -0,0 +1,171 @@
+"""
+Dish Taxonomy
+메뉴 이름 → 음식 분류 (국물/건더기 없는 요리/밥 요리/면/반찬/후식/중국 얼큰 탕류)
+- 키워드 사전을 Aho-Corasick 오토마톤으로 한 번 컴파일해서 메뉴 이름을 한 번만 훑음
+  (사전이 수천 개로 늘어나도 메뉴 한 개 분류 비용은 이름 길이에 비례)
+- 결과는 메뉴 이름별로 메모이즈 → OCR 파싱과 AI 후처리가 같은 분류를 공유
+"""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SOUP = "soup"
+DRY = "dry"
+RICE_DISH = "rice_dish"
+NOODLE = "noodle"
+SIDE = "side"
+DESSERT = "dessert"
+CHINESE_SPICY = "chinese_spicy"
+
+# 분류별 키워드 (메뉴 이름 어디에 있어도 매칭)
+DISH_KEYWORDS: Dict[str, List[str]] = {
+    # 한국 국물로 취급할 키워드들
+    SOUP: ["찌개", "국", "탕", "전골", "국밥", "설렁탕", "곰탕", "감자탕"],
+    # 국물 메뉴의 상위 호환으로 올라오면 안 되는 것들 (국물 아닌 애들)
+    # ("볶음밥"은 "볶음"으로 이미 걸리고, 이름 끝 분류가 반찬 "밥"이 되지 않게 따로 둠)
+    DRY: ["볶음", "카츠", "까스", "돈까스", "제육", "덮밥", "구이", "볶음밥"],
+    # 한 끼 메인인 밥 요리 (OCR에서 반찬 "밥"으로 빠지지 않게만 쓰고, 국물 상위호환 판정에는 안 씀
+    #  → 김치찌개 상위호환으로 돌솥비빔밥이 나와도 그대로 둠)
+    RICE_DISH: ["비빔밥", "김밥", "초밥", "주먹밥", "컵밥"],
+    NOODLE: ["면", "국수", "라면", "우동", "냉면", "파스타", "스파게티", "소바", "라멘", "쌀국수"],
+    # 반찬/밥/부수품 (식단표에서 메인 메뉴가 아닌 것)
+    SIDE: [
+        "김치", "깍두기", "단무지", "배추김치", "총각김치", "나물", "장아찌",
+        "밥", "잡곡밥", "흰밥", "현미밥", "쌀밥",
+        "된장국", "미역국", "콩나물국", "무국", "북어국",  # 메인이 아닌 국
+        "샐러드", "샌드위치",
+    ],
+    DESSERT: ["과일", "요구르트", "음료", "우유", "주스", "케이크", "푸딩", "아이스크림", "식혜", "수정과"],
+    # 한국식 상위 대신 튀어나오는 중국 얼큰 탕류
+    CHINESE_SPICY: ["마라탕", "마라샹궈", "훠궈"],
+}
+
+
+class DishClass(NamedTuple):
+    """
+    tags: 이름 어디에서든 매칭된 분류 전체 ("김치찌개" → soup, side)
+    head: 이름 끝에 오는 가장 긴 키워드의 분류 = 이 메뉴가 실제로 무엇인지 ("김치찌개" → soup)
+    """
+    tags: FrozenSet[str]
+    head: FrozenSet[str]
+
+
+class AhoCorasick:
+    """키워드 → 분류 집합 다중 패턴 매처"""
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드에서 끝나는 키워드들: ((길이, 분류 집합), ...)
+        self._out: List[Tuple[Tuple[int, FrozenSet[str]], ...]] = [()]
+
+        for word, tags in keywords.items():
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = ((len(word), frozenset(tags)),)
+
+        # BFS로 실패 링크 + 출력 합치기
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # 루트 바로 아래 노드는 항상 루트로
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if node else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+    def matches(self, text: str) -> List[Tuple[int, int, FrozenSet[str]]]:
+        """(끝 위치, 길이, 분류 집합) 목록 (한 번 훑기)"""
+        found = []
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, tags in out[node]:
+                found.append((i, length, tags))
+        return found
+
+
+def _load_keywords() -> Dict[str, Set[str]]:
+    """기본 사전 + DISH_TAXONOMY_PATH(JSON: {"soup": ["..."], ...})의 추가 키워드"""
+    groups = {tag: list(words) for tag, words in DISH_KEYWORDS.items()}
+
+    path = os.getenv("DISH_TAXONOMY_PATH", "")
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for tag, words in json.load(f).items():
+                    groups.setdefault(tag, []).extend(words)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 음식 분류 사전 로드 실패, 기본 사전 사용: {e}")
+
+    keywords: Dict[str, Set[str]] = {}
+    for tag, words in groups.items():
+        for word in words:
+            if word:
+                keywords.setdefault(word, set()).add(tag)
+    return keywords
+
+
+_matcher = AhoCorasick(_load_keywords())
+
+
+@lru_cache(maxsize=int(os.getenv("DISH_CLASSIFY_CACHE_SIZE", "8192")))
+def classify_dish(name: str) -> DishClass:
+    """메뉴 이름 분류 (같은 이름은 캐시된 결과 반환)"""
+    name = (name or "").strip()
+    tags = set()
+    head: Optional[Tuple[int, int, FrozenSet[str]]] = None
+    for end, length, match_tags in _matcher.matches(name):
+        tags |= match_tags
+        # 가장 뒤에서 끝나는 키워드, 같으면 더 긴 키워드 ("김치볶음밥" → 볶음밥)
+        if head is None or (end, length) > head[:2]:
+            head = (end, length, match_tags)
+    return DishClass(frozenset(tags), head[2] if head else frozenset())
+
+
+def is_side_dish(name: str) -> bool:
+    """반찬/밥/후식 같은 부수 메뉴인지 ("된장국", "배추김치" → True, "김치찌개", "국밥" → False)"""
+    head = classify_dish(name).head
+    return SIDE in head or DESSERT in head
+
+
+def has_tag(text: str, tag: str) -> bool:
+    """이름(또는 메뉴 목록 문자열)에 해당 분류 키워드가 하나라도 있는지"""
+    return tag in classify_dish(text).tags
+
+
+def taxonomy_stats() -> Dict:
+    """분류 사전/캐시 통계"""
+    info = classify_dish.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "automaton_nodes": _matcher.size,
+        "cache_size": info.currsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
@@ -0,0 +1,171 @@
+"""
+Image Hash
+식단표 사진의 지각 해시(dHash)와 BK-tree 기반 근사 중복 검색
+- 같은 식단표를 조금 다른 각도/밝기로 찍은 사진끼리 해밍 거리가 작게 나옴
+- 단, dHash는 표 격자(레이아웃)만 보고 글자는 거의 못 봄 → 같은 양식의 다른 식단표도 거리 0이 나올 수 있어서
+  인덱스는 구내식당별로 분리 (다른 구내식당/익명 업로드끼리는 절대 재사용하지 않음)
+"""
+
+import io
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from services.kst_clock import today_kst
+
+load_dotenv()
+
+# Pillow가 없으면 지각 해시 기능을 끄고 정확 해시 캐시만 사용
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> Optional[int]:
+    """
+    difference hash 계산 (64비트 정수)
+
+    흑백으로 (hash_size+1) x hash_size 크기로 줄인 뒤 가로로 이웃한 픽셀의 밝기 비교
+    """
+    if not PIL_AVAILABLE:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEG는 디코딩 단계에서 미리 축소 (큰 사진도 빠르게)
+            img.draft("L", (hash_size * 8, hash_size * 8))
+            small = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+            pixels = list(small.getdata())
+    except Exception as e:
+        print(f"⚠️ 이미지 해시 계산 실패: {e}")
+        return None
+
+    value = 0
+    width = hash_size + 1
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """해밍 거리용 BK-tree (임계값 이내 이웃을 전체 비교 없이 검색)"""
+
+    def __init__(self):
+        # 노드: [hash, value, {distance: child}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, value: Any):
+        node = [key, value, {}]
+        self._size += 1
+        if self._root is None:
+            self._root = node
+            return
+
+        current = self._root
+        while True:
+            distance = hamming(key, current[0])
+            if distance == 0:
+                # 같은 해시는 최신 값으로 교체
+                current[1] = value
+                self._size -= 1
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, key: int, max_distance: int) -> Optional[Tuple[int, Any]]:
+        """
+        max_distance 이내에서 가장 가까운 항목
+
+        Returns:
+            tuple: (거리, 값) 또는 None
+        """
+        if self._root is None:
+            return None
+
+        best: Optional[Tuple[int, Any]] = None
+        stack: List[list] = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(key, node[0])
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, node[1])
+            # 삼각 부등식: |d - max| ~ d + max 범위의 자식만 탐색
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in node[2].items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return best
+
+
+class NearDuplicateIndex:
+    """구내식당별로 오늘 추출한 식단표 사진의 지각 해시 인덱스 (날짜가 바뀌면 초기화)"""
+
+    def __init__(self):
+        self.max_distance = int(os.getenv("OCR_PHASH_MAX_DISTANCE", "6"))
+        self.max_entries = int(os.getenv("OCR_PHASH_MAX_ENTRIES", "5000"))
+        self._day: Optional[date] = None
+        # 구내식당 ID -> BK-tree
+        self._trees: Dict[str, BKTree] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return PIL_AVAILABLE
+
+    def _roll_day(self):
+        today = today_kst()
+        if self._day != today:
+            self._day = today
+            self._trees = {}
+            self._size = 0
+
+    def find(self, scope: str, image_hash: int) -> Optional[Any]:
+        """같은 구내식당(scope)에서 임계값 이내의 오늘 추출 결과 (없으면 None)"""
+        self._roll_day()
+        tree = self._trees.get(scope)
+        match = tree.search(image_hash, self.max_distance) if tree is not None else None
+        if match is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        print(f"🖼️ 유사 식단표 이미지 발견 (해밍 거리 {match[0]})")
+        return match[1]
+
+    def add(self, scope: str, image_hash: int, value: Any):
+        self._roll_day()
+        if self._size >= self.max_entries:
+            return
+        tree = self._trees.setdefault(scope, BKTree())
+        before = len(tree)
+        tree.add(image_hash, value)
+        self._size += len(tree) - before
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": self._size,
+            "scopes": len(self._trees),
+            "max_distance": self.max_distance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
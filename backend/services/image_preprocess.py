@@ -0,0 +1,245 @@
+"""
+Image Preprocess
+Gemini Vision 호출 전 식단표 사진 전처리 (프로세스 풀에서 실행)
+- EXIF 회전 보정 → 흑백 변환 → 식단표 영역 크롭 → 긴 변 기준 축소 → JPEG 재인코딩
+- 4000x3000 폰 사진을 그대로 보내면 업로드/토큰/모델 지연이 모두 커짐
+"""
+
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Pillow가 없으면 전처리를 건너뛰고 원본 그대로 전송
+try:
+    from PIL import Image, ImageFilter, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# 크롭 영역 검출용 축소 이미지 크기 (원본 전체를 엣지 필터에 넣지 않도록)
+CROP_PROBE_EDGE = 512
+
+
+def _find_content_box(img: "Image.Image") -> Optional[Tuple[int, int, int, int]]:
+    """
+    글자/표 선이 있는 영역의 경계 상자 (원본 좌표)
+
+    축소본에서 엣지를 검출해 바깥 여백(책상, 벽 등)을 잘라낼 범위를 찾음.
+    잘라낼 게 거의 없거나 검출이 이상하면 None
+    """
+    scale = CROP_PROBE_EDGE / max(img.size)
+    probe = img if scale >= 1 else img.resize(
+        (max(1, int(img.width * scale)), max(1, int(img.height * scale))),
+        Image.BILINEAR
+    )
+    scale = min(scale, 1.0)
+
+    # 배경 질감(책상 나뭇결, 센서 노이즈)이 엣지로 잡히지 않도록 먼저 흐리게
+    edges = probe.filter(ImageFilter.GaussianBlur(2)).filter(ImageFilter.FIND_EDGES)
+    # 테두리 1px은 필터 특성상 항상 엣지로 잡히므로 제외
+    edges = edges.crop((1, 1, edges.width - 1, edges.height - 1))
+    mask = edges.point(lambda p: 255 if p > 16 else 0)
+
+    # 행/열별 엣지 밀도 (1줄로 BOX 축소 = 평균) → 드문드문 튄 픽셀은 무시
+    cols = mask.resize((mask.width, 1), Image.BOX).tobytes()
+    rows = mask.resize((1, mask.height), Image.BOX).tobytes()
+    min_density = 255 * 0.005
+    dense_cols = [i for i, v in enumerate(cols) if v >= min_density]
+    dense_rows = [i for i, v in enumerate(rows) if v >= min_density]
+    if not dense_cols or not dense_rows:
+        return None
+
+    # 테두리 1px 제외분 보정
+    left, right = dense_cols[0] + 1, dense_cols[-1] + 2
+    top, bottom = dense_rows[0] + 1, dense_rows[-1] + 2
+
+    # 여백 3% 남기기
+    pad_x = int(probe.width * 0.03)
+    pad_y = int(probe.height * 0.03)
+    left, top = max(0, left - pad_x), max(0, top - pad_y)
+    right, bottom = min(probe.width, right + pad_x), min(probe.height, bottom + pad_y)
+
+    area_ratio = (right - left) * (bottom - top) / (probe.width * probe.height)
+    # 90% 이상이면 자를 의미가 없고, 20% 미만이면 잘못 검출했을 가능성이 큼
+    if area_ratio > 0.9 or area_ratio < 0.2:
+        return None
+
+    return (
+        int(left / scale),
+        int(top / scale),
+        min(img.width, int(right / scale)),
+        min(img.height, int(bottom / scale)),
+    )
+
+
+def _decode(image_bytes: bytes, mode: str, scale: float = 1.0) -> "Image.Image":
+    """
+    디코딩 + EXIF 회전 보정 + 모드 변환
+
+    JPEG는 디코딩 단계에서 2의 거듭제곱 배로 미리 축소 (scale 배 크기 이상은 유지)
+    """
+    img = Image.open(io.BytesIO(image_bytes))
+    if scale < 1:
+        img.draft(mode, (max(1, int(img.width * scale)), max(1, int(img.height * scale))))
+    return ImageOps.exif_transpose(img).convert(mode)
+
+
+def _relative_box(img: "Image.Image") -> Optional[Tuple[float, float, float, float]]:
+    """_find_content_box 결과를 0~1 비율 좌표로 (디코딩 크기가 달라도 같은 영역)"""
+    box = _find_content_box(img)
+    if box is None:
+        return None
+    return (box[0] / img.width, box[1] / img.height, box[2] / img.width, box[3] / img.height)
+
+
+def preprocess_image(
+    image_bytes: bytes,
+    max_edge: int = 1536,
+    quality: int = 80,
+    grayscale: bool = True,
+    crop: bool = True
+) -> Tuple[bytes, str, Dict]:
+    """
+    식단표 사진 전처리 (프로세스 풀에서 호출되므로 모듈 최상위 함수)
+
+    Returns:
+        tuple: (이미지 바이트, MIME 타입, {"original_size", "size", "cropped"})
+               결과가 원본보다 크면 원본 그대로 반환
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        original_size = img.size
+        is_jpeg = img.format == "JPEG"
+    mode = "L" if grayscale else "RGB"
+
+    # JPEG는 작은 탐색본에서 크롭 영역을 먼저 찾고, 잘린 영역의 긴 변이 max_edge가 되도록 디코딩 크기를 정함
+    # (전체 사진 기준으로 미리 줄이면 크롭 후 max_edge보다 작아져 글자가 뭉개짐)
+    box = None
+    span = 1.0
+    if crop and is_jpeg:
+        probe = _decode(image_bytes, "L", CROP_PROBE_EDGE / max(original_size))
+        box = _relative_box(probe)
+        if box:
+            width, height = original_size
+            # EXIF 회전으로 가로/세로가 바뀐 경우
+            if (probe.width > probe.height) != (width > height):
+                width, height = height, width
+            span = max((box[2] - box[0]) * width, (box[3] - box[1]) * height) / max(original_size)
+
+    img = _decode(image_bytes, mode, max_edge / (max(original_size) * span) if is_jpeg else 1.0)
+    if crop and not is_jpeg:
+        box = _relative_box(img if mode == "L" else img.convert("L"))
+
+    if box:
+        img = img.crop((
+            int(box[0] * img.width),
+            int(box[1] * img.height),
+            int(box[2] * img.width),
+            int(box[3] * img.height),
+        ))
+
+    img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=quality, optimize=True)
+    processed = out.getvalue()
+    info = {"original_size": original_size, "size": img.size, "cropped": box is not None}
+
+    if len(processed) >= len(image_bytes):
+        info["size"] = original_size
+        info["cropped"] = False
+        return image_bytes, None, info
+    return processed, "image/jpeg", info
+
+
+class ImagePreprocessor:
+    """프로세스 풀 기반 Vision 입력 전처리기 (전후 크기/시간 통계 포함)"""
+
+    def __init__(self):
+        self.enabled = os.getenv("OCR_PREPROCESS_ENABLED", "true").lower() == "true"
+        # Gemini는 큰 이미지를 768px 타일 단위로 토큰화 → 1536이면 최대 2x2 타일
+        self.max_edge = int(os.getenv("OCR_MAX_EDGE", "1536"))
+        self.quality = int(os.getenv("OCR_JPEG_QUALITY", "80"))
+        self.grayscale = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+        self.crop = os.getenv("OCR_CROP_ENABLED", "true").lower() == "true"
+        self.max_workers = int(os.getenv("OCR_PREPROCESS_WORKERS", "2"))
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        self.processed = 0
+        self.failures = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_ms = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and PIL_AVAILABLE
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def process(self, image_bytes: bytes, mime_type: str) -> Tuple[bytes, str]:
+        """
+        Vision 전송용 이미지로 변환 (비활성/실패 시 원본 그대로)
+
+        Returns:
+            tuple: (이미지 바이트, MIME 타입)
+        """
+        if not self.active:
+            return image_bytes, mime_type
+
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            processed, new_mime, info = await loop.run_in_executor(
+                self._get_pool(),
+                preprocess_image,
+                image_bytes,
+                self.max_edge,
+                self.quality,
+                self.grayscale,
+                self.crop,
+            )
+        except Exception as e:
+            self.failures += 1
+            print(f"⚠️ 이미지 전처리 실패, 원본 사용: {e}")
+            return image_bytes, mime_type
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.processed += 1
+        self.bytes_in += len(image_bytes)
+        self.bytes_out += len(processed)
+        self.total_ms += elapsed_ms
+
+        print(
+            f"🪄 이미지 전처리: {info['original_size'][0]}x{info['original_size'][1]} "
+            f"{len(image_bytes) // 1024}KB → {info['size'][0]}x{info['size'][1]} "
+            f"{len(processed) // 1024}KB{' (크롭)' if info['cropped'] else ''} ({elapsed_ms:.0f}ms)"
+        )
+        return processed, new_mime or mime_type
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.active,
+            "max_edge": self.max_edge,
+            "processed": self.processed,
+            "failures": self.failures,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "size_ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            "avg_ms": round(self.total_ms / self.processed, 1) if self.processed else 0.0,
+        }
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,240 @@
+"""
+Job Queue
+이미지 OCR → 날씨 → AI 추천을 백그라운드 작업으로 처리하는 인프로세스 작업 큐
+- 요청은 작업 ID만 바로 받고, 결과는 폴링(GET) 또는 SSE로 전달
+- 큐 크기 상한으로 Gemini가 느려질 때 요청이 무한정 쌓이지 않게 함 (가득 차면 503)
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from dotenv import load_dotenv
+from services.sse import SSE_KEEPALIVE, format_sse
+from services.ttl_cache import TTLCache
+
+load_dotenv()
+
+JobHandler = Callable[[], Awaitable[Any]]
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업이 상한에 도달"""
+
+
+class JobFailed(Exception):
+    """작업 실패 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class JobQueue:
+    """크기 제한 asyncio 큐 + 워커 풀"""
+
+    def __init__(self):
+        self.max_queued = int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+        self.worker_count = int(os.getenv("JOB_WORKERS", "4"))
+        # 끝난 작업 결과 보관 시간 (이 안에 폴링/SSE로 가져가야 함)
+        self.result_ttl = float(os.getenv("JOB_RESULT_TTL", "600"))
+        # SSE 연결 유지용 주석 전송 간격
+        self.heartbeat_seconds = float(os.getenv("JOB_SSE_HEARTBEAT", "15"))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        # job_id -> 작업 정보 (만료되면 조회 불가)
+        self._jobs = TTLCache(ttl_seconds=self.result_ttl, max_size=int(os.getenv("JOB_MAX_RETAINED", "5000")))
+        # job_id -> 상태 변경 알림 (끝나면 제거)
+        self._changed: Dict[str, asyncio.Event] = {}
+
+        self.submitted = 0
+        self.rejected = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    # =======================================================================
+    # 워커
+    # =======================================================================
+    def start(self):
+        """워커 시작 (lifespan에서 호출)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.worker_count)
+        ]
+        print(f"✅ 작업 큐 시작 (워커 {self.worker_count}개, 대기 상한 {self.max_queued})")
+
+    async def stop(self):
+        """워커 종료 (대기 중인 작업은 버림)"""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self):
+        while True:
+            job_id, handler = await self._queue.get()
+            try:
+                await self._run(job_id, handler)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, handler: JobHandler):
+        job = self._jobs.peek(job_id)
+        if job is None:
+            # 대기 중에 보관 시간이 지나 만료된 작업
+            self._changed.pop(job_id, None)
+            return
+
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        self.started += 1
+        self.total_wait_ms += (job["started_at"] - job["created_at"]) * 1000
+        self._jobs.set(job_id, job)
+        self._notify(job_id)
+
+        try:
+            job["result"] = await handler()
+            job["status"] = "done"
+            self.completed += 1
+        except JobFailed as e:
+            job["status"] = "failed"
+            job["error"] = {"status_code": e.status_code, "detail": e.detail}
+            self.failed += 1
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = {"status_code": 500, "detail": str(e)}
+            self.failed += 1
+
+        job["finished_at"] = time.time()
+        self.total_run_ms += (job["finished_at"] - job["started_at"]) * 1000
+        # 끝난 시점부터 보관 시간 다시 계산
+        self._jobs.set(job_id, job)
+        self._notify(job_id, final=True)
+
+    def _notify(self, job_id: str, final: bool = False):
+        """상태 변경 알림 (대기 중인 SSE 스트림 깨우기)"""
+        event = self._changed.pop(job_id, None) if final else self._changed.get(job_id)
+        if event is not None:
+            event.set()
+        if not final:
+            self._changed[job_id] = asyncio.Event()
+
+    # =======================================================================
+    # 제출 / 조회
+    # =======================================================================
+    def submit(self, handler: JobHandler, kind: str = "recommendation") -> Dict:
+        """
+        작업 등록 (바로 반환)
+
+        Raises:
+            JobQueueFull: 대기 작업이 상한에 도달한 경우
+        """
+        if self._queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        try:
+            self._queue.put_nowait((job_id, handler))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull()
+
+        self._jobs.set(job_id, job)
+        self._changed[job_id] = asyncio.Event()
+        self.submitted += 1
+        return self.view(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회 (없거나 만료됐으면 None)"""
+        job = self._jobs.peek(job_id)
+        return self.view(job) if job else None
+
+    def view(self, job: Dict) -> Dict:
+        """클라이언트에 돌려줄 작업 정보"""
+        data = {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        }
+        if job["status"] == "queued":
+            data["queue_size"] = self._queue.qsize() if self._queue else 0
+        if job["status"] == "done":
+            data["result"] = job["result"]
+        if job["status"] == "failed":
+            data["error"] = job["error"]
+        return data
+
+    async def stream(self, job_id: str) -> AsyncIterator[str]:
+        """
+        작업 상태를 SSE 형식으로 전달 (상태가 바뀔 때마다 이벤트, 끝나면 종료)
+
+        이벤트: "status" (queued/running) → "done" 또는 "failed"
+        """
+        last_status = None
+        while True:
+            job = self._jobs.peek(job_id)
+            if job is None:
+                yield format_sse("failed", {"job_id": job_id, "error": {"status_code": 404, "detail": "작업을 찾을 수 없습니다."}})
+                return
+
+            if job["status"] != last_status:
+                last_status = job["status"]
+                event = last_status if last_status in ("done", "failed") else "status"
+                yield format_sse(event, self.view(job))
+                if event != "status":
+                    return
+
+            changed = self._changed.get(job_id)
+            if changed is None:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=self.heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield SSE_KEEPALIVE
+
+    def stats(self) -> Dict:
+        """작업 큐 통계"""
+        finished = self.completed + self.failed
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "running": self.started - finished,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": round(self.total_wait_ms / self.started, 1) if self.started else 0.0,
+            "avg_run_ms": round(self.total_run_ms / finished, 1) if finished else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+job_queue = JobQueue()
@@ -0,0 +1,84 @@
+"""
+JSON Stream
+LLM이 조금씩 내보내는 JSON 텍스트에서 특정 배열의 원소(객체)를 완성되는 대로 꺼내는 파서
+- {"recommendations": [{...}, {...}], ...} 에서 첫 번째 추천이 닫히는 순간 바로 사용 가능
+"""
+
+import json
+from typing import Dict, List
+
+
+class JsonArrayStreamParser:
+    """이름 있는 배열 안의 객체를 점진적으로 추출 (문자열/이스케이프 인식)"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.finished = False
+
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj_start = -1
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return self._buf
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        텍스트 조각 추가
+
+        Returns:
+            list: 이번 조각으로 완성된 객체들 (파싱 실패한 객체는 건너뜀)
+        """
+        self._buf += chunk
+        if self.finished:
+            return []
+
+        if not self._in_array:
+            key_at = self._buf.find(f'"{self.key}"')
+            if key_at < 0:
+                return []
+            bracket_at = self._buf.find("[", key_at)
+            if bracket_at < 0:
+                return []
+            self._in_array = True
+            self._pos = bracket_at + 1
+
+        completed = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._obj_start = i
+                self._depth += 1
+            elif c == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(json.loads(buf[self._obj_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+            elif c == "]" and self._depth == 0:
+                self.finished = True
+                i += 1
+                break
+            i += 1
+
+        self._pos = i
+        return completed
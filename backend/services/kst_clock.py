@@ -0,0 +1,25 @@
+"""
+KST Clock
+서비스 전체가 같은 기준으로 쓰는 한국 시간 (날짜/요일/주차)
+- 서버 시계가 UTC여도 00:00~09:00 KST에 전날 요일/날짜로 밀리지 않게
+"""
+
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def now_kst() -> datetime:
+    """현재 시각 (KST)"""
+    return datetime.now(KST)
+
+
+def today_kst() -> date:
+    """오늘 날짜 (KST)"""
+    return now_kst().date()
+
+
+def today_kst_str() -> str:
+    """오늘 날짜 문자열 (예: 2024-01-15)"""
+    return today_kst().strftime("%Y-%m-%d")
@@ -0,0 +1,89 @@
+"""
+LLM Executor
+동기식 Gemini SDK 호출을 전용 스레드 풀에서 실행해서
+uvicorn 이벤트 루프가 LLM 응답을 기다리며 멈추지 않도록 하는 서비스
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class LLMExecutor:
+    """LLM 호출 전용 스레드 풀 (동시 실행 개수 제한)"""
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: 동시에 실행할 LLM 호출 수 (기본값: LLM_MAX_CONCURRENCY 환경변수 또는 16)
+        """
+        self.max_workers = max_workers or int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llm"
+        )
+        print(f"✅ LLM Executor 초기화 (동시 실행: {self.max_workers})")
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        동기 함수를 LLM 전용 스레드 풀에서 실행하고 결과를 기다림
+
+        예: await llm_executor.run(model.generate_content, prompt)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(func, *args, **kwargs)
+        )
+
+    async def stream(self, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        스트리밍 응답(동기 이터레이터)을 스레드 풀에서 소비하면서 조각마다 바로 전달
+
+        예: async for chunk in llm_executor.stream(model.generate_content, prompt, stream=True)
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        cancelled = False
+
+        def _consume():
+            try:
+                for item in func(*args, **kwargs):
+                    if cancelled:
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+                return
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+        future = loop.run_in_executor(self._executor, _consume)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    break
+                yield item
+        finally:
+            # 소비자가 중간에 멈추면 스레드도 다음 조각에서 멈춤
+            cancelled = True
+            if future.done():
+                future.result()
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고 스레드 풀 종료"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        print("🛑 LLM Executor 종료")
+
+
+# 싱글톤 인스턴스
+llm_executor = LLMExecutor()
@@ -0,0 +1,319 @@
+"""
+LLM Provider
+추천/오늘의 메뉴/식단표 인식이 쓰는 LLM 백엔드 선택
+- gemini: 실제 Gemini API (GEMINI_API_KEY 필요)
+- stub: 네트워크 없이 지연 분포 + 준비된 응답을 돌려주는 로컬 백엔드 (오프라인 벤치마크/부하 테스트용)
+
+모든 백엔드는 용도("cafeteria", "daily", "vision", "vision_week")별 모델을 만들고,
+모델은 generate_content(contents, generation_config=None, stream=False) 하나만 제공
+(응답/스트리밍 조각은 .text 속성을 가짐)
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+
+class LLMProvider(ABC):
+    """LLM 백엔드 공통 인터페이스"""
+
+    name = "none"
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """호출 가능한 상태인지 (키 없음 등이면 False)"""
+
+    @abstractmethod
+    def model(
+        self,
+        purpose: str,
+        system_instruction: Optional[str] = None,
+        generation_config: Optional[Dict] = None
+    ):
+        """용도별 모델 생성 (generate_content를 가진 객체)"""
+
+    def is_quota_error(self, error: Exception) -> bool:
+        """쿼터 초과(429) 오류인지 (True면 호출하는 쪽이 잠시 로컬 엔진으로 전환)"""
+        return False
+
+    def stats(self) -> Dict:
+        return {"provider": self.name, "available": self.available}
+
+
+# =======================================================================
+# Gemini
+# =======================================================================
+class GeminiProvider(LLMProvider):
+    """실제 Gemini API"""
+
+    name = "gemini"
+
+    def __init__(self):
+        self.api_key = os.getenv("GEMINI_API_KEY")
+        if self.api_key:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def model(self, purpose, system_instruction=None, generation_config=None):
+        import google.generativeai as genai
+        return genai.GenerativeModel(
+            GEMINI_MODEL_NAME,
+            system_instruction=system_instruction,
+            generation_config=generation_config
+        )
+
+    def is_quota_error(self, error: Exception) -> bool:
+        from google.api_core.exceptions import ResourceExhausted
+        return isinstance(error, ResourceExhausted)
+
+
+# =======================================================================
+# Stub
+# =======================================================================
+# 용도별 기본 응답 (LLM_STUB_FIXTURES 파일로 덮어쓸 수 있음)
+STUB_RESPONSES: Dict[str, List] = {
+    "cafeteria": [
+        {
+            "recommendations": [
+                {"type": "상위 호환 메뉴", "restaurant_name": "프리미엄 한식당", "place_id": "stub_001", "minutes_away": 8,
+                 "menu_name": "갈비탕", "reason": "맑고 진한 국물에 부드러운 갈비가 들어가 든든하고 영양도 좋습니다.",
+                 "price_range": "13,000-16,000원", "normalized_search_query": "갈비탕", "alt_queries": ["한식", "탕"],
+                 "category_group_code": "FD6"},
+                {"type": "대체 메뉴", "restaurant_name": "돈까스 전문점", "place_id": "stub_002", "minutes_away": 6,
+                 "menu_name": "돈까스", "reason": "바삭한 튀김옷과 두툼한 고기로 포만감이 크고 식어도 맛있습니다.",
+                 "price_range": "9,000-12,000원", "normalized_search_query": "돈까스", "alt_queries": ["일식", "카츠"],
+                 "category_group_code": "FD6"},
+                {"type": "예외 메뉴", "restaurant_name": "베트남 쌀국수", "place_id": "stub_003", "minutes_away": 10,
+                 "menu_name": "쌀국수", "reason": "향긋한 육수와 가벼운 면으로 부담 없이 기분 전환하기 좋습니다.",
+                 "price_range": "10,000-13,000원", "normalized_search_query": "쌀국수", "alt_queries": ["아시안", "포"],
+                 "category_group_code": "FD6"},
+            ],
+            "brief_rationale": "오늘 날씨와 구내식당 메뉴를 고려해 국물, 튀김, 아시안 메뉴를 골고루 골랐습니다.",
+            "need_more_info": False,
+            "missing": [],
+        },
+        {
+            "recommendations": [
+                {"type": "상위 호환 메뉴", "restaurant_name": "제육 맛집", "place_id": "stub_004", "minutes_away": 5,
+                 "menu_name": "제육볶음", "reason": "매콤달콤한 양념과 불향이 밥과 잘 어울리고 단백질이 풍부합니다.",
+                 "price_range": "9,000-11,000원", "normalized_search_query": "제육볶음", "alt_queries": ["한식", "제육"],
+                 "category_group_code": "FD6"},
+                {"type": "대체 메뉴", "restaurant_name": "파스타 하우스", "place_id": "stub_005", "minutes_away": 9,
+                 "menu_name": "토마토파스타", "reason": "새콤한 토마토 소스와 쫄깃한 면으로 산뜻하게 먹기 좋습니다.",
+                 "price_range": "12,000-15,000원", "normalized_search_query": "파스타", "alt_queries": ["양식", "스파게티"],
+                 "category_group_code": "FD6"},
+                {"type": "예외 메뉴", "restaurant_name": "스시로", "place_id": "stub_006", "minutes_away": 7,
+                 "menu_name": "초밥", "reason": "신선한 생선과 깔끔한 맛으로 가볍게 점심을 즐길 수 있습니다.",
+                 "price_range": "13,000-20,000원", "normalized_search_query": "초밥", "alt_queries": ["일식", "스시"],
+                 "category_group_code": "FD6"},
+            ],
+            "brief_rationale": "구내식당과 겹치지 않게 볶음, 양식, 일식으로 나눠 추천했습니다.",
+            "need_more_info": False,
+            "missing": [],
+        },
+    ],
+    "daily": [
+        {
+            "recommendations": [
+                {"menu_name": "김치찌개", "category": "한식", "price_range": "8,000-10,000원",
+                 "reason": "얼큰한 국물과 김치의 감칠맛으로 든든하게 먹기 좋습니다."},
+                {"menu_name": "우동", "category": "일식", "price_range": "8,000-10,000원",
+                 "reason": "부드러운 면과 따뜻한 국물로 속이 편안합니다."},
+                {"menu_name": "파스타", "category": "양식", "price_range": "12,000-15,000원",
+                 "reason": "풍미 있는 소스와 쫄깃한 면으로 기분 전환하기 좋습니다."},
+            ],
+            "summary": "오늘 날씨에 맞춘 따뜻한 메뉴",
+        },
+        {
+            "recommendations": [
+                {"menu_name": "비빔밥", "category": "한식", "price_range": "9,000-11,000원",
+                 "reason": "여러 채소와 고추장이 어우러져 영양 균형이 좋습니다."},
+                {"menu_name": "짬뽕", "category": "중식", "price_range": "8,000-10,000원",
+                 "reason": "얼큰한 해물 국물로 입맛을 돋워줍니다."},
+                {"menu_name": "샐러드", "category": "양식", "price_range": "10,000-13,000원",
+                 "reason": "신선한 채소로 가볍게 먹기 좋습니다."},
+            ],
+            "summary": "오늘 날씨에 맞춘 균형 잡힌 메뉴",
+        },
+    ],
+    "vision": [
+        "김치찌개, 제육볶음",
+        "돈까스, 우동",
+        "순두부찌개, 닭갈비",
+    ],
+    "vision_week": [
+        {
+            "days": {
+                "월요일": {"조식": [], "중식": ["김치찌개", "제육볶음"], "석식": []},
+                "화요일": {"조식": [], "중식": ["돈까스", "우동"], "석식": []},
+                "수요일": {"조식": [], "중식": ["순두부찌개", "닭갈비"], "석식": []},
+                "목요일": {"조식": [], "중식": ["카레라이스", "치킨까스"], "석식": []},
+                "금요일": {"조식": [], "중식": ["짜장면", "탕수육"], "석식": []},
+            }
+        },
+    ],
+}
+
+# 용도별 기본 지연 분포 (LLM_STUB_LATENCY_<용도> → LLM_STUB_LATENCY → 이 값 순서로 사용, 형식은 parse_latency 참고)
+STUB_DEFAULT_LATENCY = {
+    "vision": "lognormal:2500,0.35",
+    "vision_week": "lognormal:4000,0.35",
+}
+STUB_FALLBACK_LATENCY = "lognormal:1200,0.4"
+
+# 스트리밍 시 첫 조각까지 걸리는 시간 비율 / 조각 크기(글자)
+STUB_FIRST_CHUNK_RATIO = 0.4
+STUB_CHUNK_CHARS = 40
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    지연 분포 문자열 → 표본 함수 (초 단위 반환)
+
+    형식 (ms 단위):
+        fixed:800 | uniform:500,1500 | normal:1000,200 | lognormal:1200,0.4 (중앙값, 시그마)
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    kind = kind.strip().lower()
+
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+class StubResponse:
+    """Gemini 응답처럼 .text만 가진 응답/스트리밍 조각"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """용도별 준비된 응답을 지연 후 반환 (같은 프롬프트면 같은 응답)"""
+
+    def __init__(self, provider: "StubProvider", purpose: str):
+        self.provider = provider
+        self.purpose = purpose
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        text = self.provider.respond(self.purpose, contents)
+        delay = self.provider.sample_latency(self.purpose)
+        if not stream:
+            time.sleep(delay)
+            return StubResponse(text)
+        return self._stream(text, delay)
+
+    def _stream(self, text: str, delay: float) -> Iterator[StubResponse]:
+        chunks = [text[i:i + STUB_CHUNK_CHARS] for i in range(0, len(text), STUB_CHUNK_CHARS)] or [""]
+        time.sleep(delay * STUB_FIRST_CHUNK_RATIO)
+        rest = delay * (1 - STUB_FIRST_CHUNK_RATIO) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(rest)
+            yield StubResponse(chunk)
+
+
+class StubProvider(LLMProvider):
+    """네트워크 없는 로컬 백엔드 (지연 분포 + 준비된/픽스처 응답)"""
+
+    name = "stub"
+
+    def __init__(self):
+        seed = os.getenv("LLM_STUB_SEED")
+        self._rng = random.Random(int(seed) if seed else None)
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Callable[[random.Random], float]] = {}
+        self._responses = self._load_responses(os.getenv("LLM_STUB_FIXTURES", ""))
+
+        self.calls: Dict[str, int] = {}
+        self.total_latency: Dict[str, float] = {}
+        print("🧪 LLM 스텁 백엔드 사용 (네트워크 호출 없음)")
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def model(self, purpose, system_instruction=None, generation_config=None):
+        return StubModel(self, purpose)
+
+    def _load_responses(self, path: str) -> Dict[str, List[str]]:
+        """기본 응답 + 픽스처 파일(JSON: {용도: [응답, ...]}, 응답은 문자열 또는 JSON 객체)"""
+        responses = dict(STUB_RESPONSES)
+        if path:
+            with open(path, encoding="utf-8") as f:
+                responses.update(json.load(f))
+        return {
+            purpose: [r if isinstance(r, str) else json.dumps(r, ensure_ascii=False) for r in items]
+            for purpose, items in responses.items()
+            if items
+        }
+
+    def respond(self, purpose: str, contents) -> str:
+        """프롬프트 해시로 응답 선택 (같은 입력이면 항상 같은 응답)"""
+        items = self._responses.get(purpose) or ["{}"]
+        prompt = contents if isinstance(contents, str) else "".join(
+            part for part in contents if isinstance(part, str)
+        )
+        return items[zlib.crc32(prompt.encode("utf-8")) % len(items)]
+
+    def sample_latency(self, purpose: str) -> float:
+        """용도별 지연 분포에서 표본 추출 (초)"""
+        sampler = self._latency.get(purpose)
+        if sampler is None:
+            spec = (
+                os.getenv(f"LLM_STUB_LATENCY_{purpose.upper()}")
+                or os.getenv("LLM_STUB_LATENCY")
+                or STUB_DEFAULT_LATENCY.get(purpose, STUB_FALLBACK_LATENCY)
+            )
+            sampler = self._latency[purpose] = parse_latency(spec)
+
+        with self._lock:
+            delay = sampler(self._rng)
+            self.calls[purpose] = self.calls.get(purpose, 0) + 1
+            self.total_latency[purpose] = self.total_latency.get(purpose, 0.0) + delay
+        return delay
+
+    def stats(self) -> Dict:
+        return {
+            **super().stats(),
+            "calls": dict(self.calls),
+            "avg_latency_ms": {
+                purpose: round(self.total_latency[purpose] / count * 1000, 1)
+                for purpose, count in self.calls.items()
+            },
+        }
+
+
+def create_llm_provider() -> LLMProvider:
+    """LLM_PROVIDER 환경변수로 백엔드 선택 (기본 gemini)"""
+    name = os.getenv("LLM_PROVIDER", "gemini").lower()
+    if name == "stub":
+        return StubProvider()
+    return GeminiProvider()
+
+
+# 싱글톤 인스턴스
+llm_provider = create_llm_provider()
@@ -0,0 +1,319 @@
+"""
+Local Recommender
+메뉴 카탈로그를 NumPy 배열로 한 번에 점수 매기는 규칙 기반 추천 엔진
+- Gemini 키가 없거나 느리거나 쿼터가 떨어졌을 때 쓰는 빠른 경로 (요청당 1ms 미만)
+- 구내식당 메뉴와 같은 계열 → 상위 호환, 비슷한 느낌의 다른 메뉴 → 대체, 전혀 다른 계열 → 예외
+- 식당/거리는 지어내지 않음: 주변 식당 카탈로그 후보와 맞춰 보고, 맞는 곳이 없으면 비워 둠 (화면에서 숨김)
+"""
+
+import time
+from typing import Dict, List, Optional
+from services.menu_canonical import MENU_SEPARATORS, canonicalize_menu_item
+from services.menu_catalog import DISH_CLASS_LABELS, MENU_CATALOG
+
+# NumPy가 없으면 로컬 엔진을 끄고 고정 폴백 추천 사용
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 구내식당 한 끼 기준 가격 (메뉴를 못 찾았을 때 상위 호환 가격 비교용)
+CAFETERIA_BASE_PRICE = 7000
+
+# 기온이 어울리는 기온에서 이만큼(°C) 벗어나면 날씨 점수가 약 37%로 떨어짐
+TEMP_AFFINITY_WIDTH = 8.0
+
+
+class LocalRecommender:
+    """메뉴 카탈로그 기반 벡터화 추천 엔진"""
+
+    def __init__(self, catalog: list = None):
+        catalog = catalog or MENU_CATALOG
+        self.names = [row[0] for row in catalog]
+        self.categories = [row[1] for row in catalog]
+        self.dish_classes = [row[2] for row in catalog]
+        self.price_ranges = [(row[5], row[6]) for row in catalog]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        # 긴 이름부터 매칭 ("참치김치찌개"는 "찌개"보다 "김치찌개"로)
+        self._match_order = sorted(range(len(self.names)), key=lambda i: -len(self.names[i]))
+
+        self.calls = 0
+        self.total_us = 0.0
+
+        if not NUMPY_AVAILABLE:
+            return
+
+        category_ids = {c: i for i, c in enumerate(dict.fromkeys(self.categories))}
+        class_ids = {c: i for i, c in enumerate(DISH_CLASS_LABELS)}
+        self._category = np.array([category_ids[c] for c in self.categories], dtype=np.int16)
+        self._class = np.array([class_ids[c] for c in self.dish_classes], dtype=np.int16)
+        self._spicy = np.array([row[3] for row in catalog], dtype=np.float32)
+        self._temp_pref = np.array([row[4] for row in catalog], dtype=np.float32)
+        self._price = np.array([(row[5] + row[6]) / 2 for row in catalog], dtype=np.float32)
+        self._brothy = np.isin(self._class, [class_ids["soup"], class_ids["noodle"]])
+
+    @property
+    def active(self) -> bool:
+        return NUMPY_AVAILABLE
+
+    # =======================================================================
+    # 구내식당 메뉴 기반 추천
+    # =======================================================================
+    def recommend_cafeteria(
+        self,
+        weather: Dict,
+        cafeteria_menu: str,
+        avoid_list: Optional[List[Dict]] = None,
+        nearby: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        상위 호환 / 대체 / 예외 메뉴 각 1개 (새 스키마)
+
+        Args:
+            avoid_list: [{"restaurant_name", "menu_name"}, ...] 이 메뉴들은 제외, 같은 계열은 감점
+            nearby: restaurant_catalog.nearby() 결과 (가까운 순), 메뉴마다 파는 식당 → 같은 음식 종류 식당 순으로 연결
+        """
+        started = time.perf_counter()
+        temp = float(weather.get("temperature", 20))
+        condition = weather.get("sky_condition", "맑음") or "맑음"
+
+        anchor = self._find_anchor(cafeteria_menu)
+        base = self._weather_scores(temp, condition)
+        blocked = self._blocked_mask(cafeteria_menu, avoid_list)
+        penalty = self._avoid_penalty(avoid_list)
+
+        if anchor is None:
+            same_class = np.zeros(len(self.names), dtype=bool)
+            same_category = np.zeros(len(self.names), dtype=bool)
+            spicy_sim = np.ones(len(self.names), dtype=np.float32)
+            anchor_price = CAFETERIA_BASE_PRICE
+        else:
+            same_class = self._class == self._class[anchor]
+            same_category = self._category == self._category[anchor]
+            spicy_sim = 1 - np.abs(self._spicy - self._spicy[anchor]) / 3
+            anchor_price = self._price[anchor]
+        price_gain = np.clip((self._price - anchor_price) / 10000, -1, 1)
+
+        # 상위 호환: 같은 계열(가능하면 같은 음식 종류)에서 더 좋은 한 끼
+        upgrade = 2 * base + 1.5 * same_category + price_gain + 0.5 * spicy_sim - penalty
+        upgrade_allowed = same_class & same_category
+        if not (upgrade_allowed & ~blocked).any():
+            upgrade_allowed = same_class
+        if not (upgrade_allowed & ~blocked).any():
+            upgrade_allowed = np.ones(len(self.names), dtype=bool)
+
+        # 대체: 비슷한 계열/맵기, 다른 음식 종류 쪽으로
+        alternative = (
+            2 * base + 1.2 * same_class + 0.6 * ~same_category
+            + 0.5 * spicy_sim - 0.8 * np.abs(price_gain) - penalty
+        )
+        # 예외: 구내식당과 전혀 다른 계열/종류인데 날씨에 잘 맞는 것
+        exception = 2.5 * base + 1.0 * ~same_class + 1.0 * ~same_category - penalty
+
+        picks = []
+        taken = blocked.copy()
+        for rec_type, scores, allowed in (
+            ("상위 호환 메뉴", upgrade, upgrade_allowed),
+            ("대체 메뉴", alternative, None),
+            ("예외 메뉴", exception, None),
+        ):
+            masked = np.where(taken if allowed is None else taken | ~allowed, -np.inf, scores)
+            best = int(np.argmax(masked))
+            if not np.isfinite(masked[best]):
+                continue
+            taken[best] = True
+            picks.append((rec_type, best))
+
+        anchor_name = self.names[anchor] if anchor is not None else None
+        used_places = set()
+        recommendations = [
+            self._cafeteria_item(
+                rec_type, i, anchor_name, temp, condition, self._match_place(i, nearby, used_places)
+            )
+            for rec_type, i in picks
+        ]
+        self._record(started)
+        return recommendations
+
+    # =======================================================================
+    # 오늘의 추천
+    # =======================================================================
+    def recommend_daily(
+        self,
+        weather: Dict,
+        exclude_menu: Optional[str] = None,
+        count: int = 3
+    ) -> List[Dict]:
+        """
+        날씨에 가장 잘 맞는 메뉴 (음식 종류가 겹치지 않게)
+        exclude_menu의 메뉴와 같은 계열 + 같은 음식 종류는 제외 (김치찌개 → 된장찌개/부대찌개도 제외),
+        같은 계열(다른 종류)은 감점
+        """
+        started = time.perf_counter()
+        temp = float(weather.get("temperature", 20))
+        condition = weather.get("sky_condition", "맑음") or "맑음"
+
+        scores = self._weather_scores(temp, condition)
+        if exclude_menu:
+            excluded = self._match_items(exclude_menu)
+            related = np.zeros(len(self.names), dtype=bool)
+            same_class = np.zeros(len(self.names), dtype=bool)
+            for i in excluded:
+                related |= (self._class == self._class[i]) & (self._category == self._category[i])
+                same_class |= self._class == self._class[i]
+            blocked = self._blocked_mask(exclude_menu, None) | related
+            scores = np.where(blocked, -np.inf, scores - 0.5 * same_class)
+
+        recommendations = []
+        used_categories = set()
+        for i in np.argsort(-scores, kind="stable"):
+            if len(recommendations) >= count or not np.isfinite(scores[i]):
+                break
+            if self.categories[i] in used_categories:
+                continue
+            used_categories.add(self.categories[i])
+            recommendations.append({
+                "menu_name": self.names[i],
+                "category": self.categories[i],
+                "price_range": self._format_price(i),
+                "reason": self._weather_reason(i, temp, condition),
+            })
+
+        self._record(started)
+        return recommendations
+
+    # =======================================================================
+    # 점수 계산
+    # =======================================================================
+    def _weather_scores(self, temp: float, condition: str) -> "np.ndarray":
+        """메뉴별 날씨 적합도 (0~1, 비/눈 오는 날은 국물·면 가산)"""
+        scores = np.exp(-((temp - self._temp_pref) / TEMP_AFFINITY_WIDTH) ** 2)
+        if "비" in condition or "눈" in condition:
+            scores = scores + 0.3 * self._brothy
+        return scores
+
+    def _find_anchor(self, cafeteria_menu: str) -> Optional[int]:
+        """구내식당 메뉴 중 카탈로그에서 처음 찾은 메뉴 (보통 첫 메뉴가 메인)"""
+        matched = self._match_items(cafeteria_menu)
+        return matched[0] if matched else None
+
+    def _match_items(self, menu: str) -> List[int]:
+        """메뉴 문자열의 각 항목 → 카탈로그 메뉴 (정확히 같거나 이름에 포함된 가장 긴 메뉴, 못 찾으면 생략)"""
+        matched = []
+        for item in MENU_SEPARATORS.split(menu or ""):
+            item = canonicalize_menu_item(item)
+            if not item:
+                continue
+            if item in self._index:
+                matched.append(self._index[item])
+                continue
+            i = next((i for i in self._match_order if self.names[i] in item), None)
+            if i is not None:
+                matched.append(i)
+        return matched
+
+    def _blocked_mask(self, cafeteria_menu: str, avoid_list: Optional[List[Dict]]) -> "np.ndarray":
+        """추천하면 안 되는 메뉴 (구내식당에 이미 있는 메뉴 + avoidList 메뉴)"""
+        blocked = np.zeros(len(self.names), dtype=bool)
+        items = [canonicalize_menu_item(item) for item in MENU_SEPARATORS.split(cafeteria_menu or "")]
+        items += [canonicalize_menu_item(a.get("menu_name") or "") for a in avoid_list or []]
+        for item in items:
+            if item in self._index:
+                blocked[self._index[item]] = True
+        return blocked
+
+    def _avoid_penalty(self, avoid_list: Optional[List[Dict]]) -> "np.ndarray":
+        """avoidList 메뉴와 같은 계열 + 같은 음식 종류면 감점 (김치찌개를 피하면 된장찌개도 덜 나오게)"""
+        penalty = np.zeros(len(self.names), dtype=np.float32)
+        for a in avoid_list or []:
+            i = self._index.get(canonicalize_menu_item(a.get("menu_name") or ""))
+            if i is not None:
+                penalty += (self._class == self._class[i]) & (self._category == self._category[i])
+        return np.minimum(penalty, 1.0)
+
+    def _match_place(self, i: int, nearby: Optional[List[Dict]], used: set) -> Optional[Dict]:
+        """메뉴 i를 파는 가장 가까운 주변 식당, 없으면 같은 음식 종류 식당 (이미 쓴 식당 제외)"""
+        candidates = [p for p in nearby or [] if p.get("placeId") not in used]
+        name = self.names[i]
+        place = next(
+            (
+                p for p in candidates
+                if any(name in canonicalize_menu_item(m) for m in p.get("menuExamples") or [])
+            ),
+            None
+        ) or next((p for p in candidates if p.get("category") == self.categories[i]), None)
+        if place is not None:
+            used.add(place.get("placeId"))
+        return place
+
+    # =======================================================================
+    # 결과 만들기
+    # =======================================================================
+    def _cafeteria_item(
+        self,
+        rec_type: str,
+        i: int,
+        anchor_name: Optional[str],
+        temp: float,
+        condition: str,
+        place: Optional[Dict]
+    ) -> Dict:
+        name = self.names[i]
+        category = self.categories[i]
+        label = DISH_CLASS_LABELS[self.dish_classes[i]]
+        if rec_type == "상위 호환 메뉴":
+            lead = (
+                f"구내식당 {anchor_name}처럼 {label} 메뉴지만 전문점의 더 좋은 재료와 깊은 맛으로 즐길 수 있습니다."
+                if anchor_name else
+                f"구내식당보다 정성스러운 {category} 한 끼로 재료와 맛이 한 단계 위입니다."
+            )
+        elif rec_type == "대체 메뉴":
+            lead = f"{anchor_name or '구내식당 메뉴'} 대신 비슷한 느낌의 {category} 메뉴로 색다른 맛을 즐길 수 있습니다."
+        else:
+            lead = f"구내식당과 전혀 다른 {category} {label} 메뉴로 기분 전환하기 좋습니다."
+
+        return {
+            "type": rec_type,
+            # 실제 주변 식당과 못 맞추면 식당/거리는 비움 (검색어로 찾도록)
+            "restaurant_name": place["name"] if place else "",
+            "place_id": place.get("placeId") if place else None,
+            "minutes_away": place.get("minutesAway") if place else None,
+            "menu_name": name,
+            "reason": f"{lead} {self._weather_reason(i, temp, condition)}",
+            "price_range": self._format_price(i),
+            "normalized_search_query": name,
+            "alt_queries": [category, f"{name} 맛집"],
+            "category_group_code": "FD6"
+        }
+
+    def _weather_reason(self, i: int, temp: float, condition: str) -> str:
+        """날씨 근거 한 문장"""
+        if ("비" in condition or "눈" in condition) and self._brothy[i]:
+            return f"{'비' if '비' in condition else '눈'} 오는 날 따뜻한 국물이 잘 어울립니다."
+        if temp >= 25 and self._temp_pref[i] >= 24:
+            return f"더운 날씨({temp:g}°C)에 시원하고 가볍게 먹기 좋습니다."
+        if temp <= 10 and self._temp_pref[i] <= 10:
+            return f"쌀쌀한 날씨({temp:g}°C)에 따뜻하게 몸을 녹이기 좋습니다."
+        return f"{temp:g}°C의 날씨에 부담 없이 든든하게 먹기 좋습니다."
+
+    def _format_price(self, i: int) -> str:
+        low, high = self.price_ranges[i]
+        return f"{low:,}-{high:,}원"
+
+    def _record(self, started: float):
+        self.calls += 1
+        self.total_us += (time.perf_counter() - started) * 1_000_000
+
+    def stats(self) -> Dict:
+        """로컬 엔진 통계"""
+        return {
+            "enabled": self.active,
+            "catalog_size": len(self.names),
+            "calls": self.calls,
+            "avg_us": round(self.total_us / self.calls, 1) if self.calls else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+local_recommender = LocalRecommender()
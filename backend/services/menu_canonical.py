@@ -0,0 +1,76 @@
+"""
+Menu Canonical
+구내식당 메뉴 문자열 정규화
+- "돈카츠, 김치 찌게" 와 "김치찌개,돈까스" 를 같은 메뉴로 취급하기 위한 표준형
+- 추천 캐시 키와 프롬프트의 menuToday에 공통으로 사용
+"""
+
+import re
+from typing import Iterable, List, Tuple, Union
+
+# 메뉴 구분자 (쉼표, 줄바꿈, 슬래시, 가운뎃점, 세로줄, 세미콜론)
+MENU_SEPARATORS = re.compile(r"[,\n/|·;]+")
+
+# 괄호 안 부가 정보: "(택1)", "[중식]", "<New>"
+BRACKETED = re.compile(r"\([^)]*\)|\[[^\]]*\]|<[^>]*>")
+
+# 한글 사이 공백 ("김치 찌개" → "김치찌개")
+HANGUL_GAP = re.compile(r"(?<=[가-힣])\s+(?=[가-힣])")
+
+# 표기 흔들림 → 표준 표기 (메뉴 이름 어디에 나와도 치환: "치즈돈카츠" → "치즈돈까스")
+SPELLING_VARIANTS = {
+    "돈카츠": "돈까스",
+    "돈가스": "돈까스",
+    "돈까츠": "돈까스",
+    "찌게": "찌개",
+    "자장면": "짜장면",
+    "오무라이스": "오므라이스",
+    "카레라이스": "카레",
+    "까르보나라": "카르보나라",
+    "쭈꾸미": "주꾸미",
+    "떡볶기": "떡볶이",
+}
+
+# 줄여 쓴 메뉴 → 대표 메뉴 (메뉴 전체가 정확히 일치할 때만)
+MENU_SYNONYMS = {
+    "순두부": "순두부찌개",
+    "제육": "제육볶음",
+    "오징어볶음밥": "오징어덮밥",
+    "뚝불": "뚝배기불고기",
+    "김찌": "김치찌개",
+    "된찌": "된장찌개",
+    "부찌": "부대찌개",
+}
+
+
+def canonicalize_menu_item(item: str) -> str:
+    """메뉴 하나를 표준형으로 (비어 있으면 빈 문자열)"""
+    item = BRACKETED.sub(" ", item)
+    item = re.sub(r"\s+", " ", item).strip()
+    item = HANGUL_GAP.sub("", item)
+    for variant, standard in SPELLING_VARIANTS.items():
+        item = item.replace(variant, standard)
+    return MENU_SYNONYMS.get(item, item)
+
+
+def canonicalize_menu(menu: Union[str, Iterable[str]]) -> List[str]:
+    """
+    구내식당 메뉴 표준형 목록
+
+    Args:
+        menu: "김치찌개, 돈카츠" 같은 문자열 또는 메뉴 목록
+
+    Returns:
+        list: 중복 제거 + 정렬된 메뉴 목록 (순서가 달라도 같은 결과)
+    """
+    items = MENU_SEPARATORS.split(menu) if isinstance(menu, str) else menu
+    return sorted({
+        canonical
+        for canonical in (canonicalize_menu_item(item or "") for item in items)
+        if canonical
+    })
+
+
+def canonical_menu_key(menu: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """캐시 키용 표준형 (튜플)"""
+    return tuple(canonicalize_menu(menu))
@@ -0,0 +1,89 @@
+"""
+Menu Catalog
+로컬 추천 엔진이 쓰는 점심 메뉴 카탈로그
+- 메뉴마다 음식 종류, 계열(국물/면/밥 ...), 맵기, 어울리는 기온, 가격대를 기록
+"""
+
+from typing import Dict
+
+# 계열 → 추천 사유에 쓰는 이름
+DISH_CLASS_LABELS: Dict[str, str] = {
+    "soup": "국물",
+    "noodle": "면",
+    "cold": "시원한",
+    "rice": "밥",
+    "grill": "볶음·구이",
+    "fried": "튀김",
+    "light": "가벼운",
+}
+
+# (메뉴, 음식 종류, 계열, 맵기 0-3, 가장 잘 어울리는 기온 °C, 최저가, 최고가)
+MENU_CATALOG = [
+    # 한식 국물
+    ("김치찌개", "한식", "soup", 2, 5, 8000, 10000),
+    ("된장찌개", "한식", "soup", 1, 6, 8000, 10000),
+    ("순두부찌개", "한식", "soup", 2, 4, 8000, 10000),
+    ("부대찌개", "한식", "soup", 2, 5, 9000, 12000),
+    ("설렁탕", "한식", "soup", 0, 3, 10000, 13000),
+    ("곰탕", "한식", "soup", 0, 3, 11000, 14000),
+    ("갈비탕", "한식", "soup", 0, 4, 13000, 17000),
+    ("감자탕", "한식", "soup", 2, 3, 10000, 13000),
+    ("육개장", "한식", "soup", 3, 4, 10000, 12000),
+    ("삼계탕", "한식", "soup", 0, 12, 15000, 18000),
+    ("순대국밥", "한식", "soup", 1, 4, 9000, 11000),
+    ("돼지국밥", "한식", "soup", 1, 5, 9000, 11000),
+    ("해물순두부", "한식", "soup", 2, 5, 10000, 12000),
+    # 한식 밥 / 볶음·구이
+    ("비빔밥", "한식", "rice", 1, 17, 9000, 11000),
+    ("돌솥비빔밥", "한식", "rice", 1, 10, 10000, 12000),
+    ("한정식", "한식", "rice", 0, 15, 15000, 20000),
+    ("불고기정식", "한식", "rice", 0, 14, 12000, 15000),
+    ("오징어덮밥", "한식", "rice", 3, 15, 9000, 11000),
+    ("제육볶음", "한식", "grill", 2, 14, 9000, 11000),
+    ("닭갈비", "한식", "grill", 2, 12, 11000, 14000),
+    ("갈비찜", "한식", "grill", 1, 10, 15000, 20000),
+    ("생선구이", "한식", "grill", 0, 16, 11000, 14000),
+    ("보쌈", "한식", "grill", 0, 15, 13000, 18000),
+    # 한식 면
+    ("칼국수", "한식", "noodle", 0, 7, 9000, 11000),
+    ("잔치국수", "한식", "noodle", 0, 12, 7000, 9000),
+    ("물냉면", "한식", "cold", 0, 29, 10000, 13000),
+    ("비빔냉면", "한식", "cold", 2, 28, 10000, 13000),
+    ("콩국수", "한식", "cold", 0, 30, 10000, 12000),
+    ("밀면", "한식", "cold", 1, 29, 9000, 11000),
+    # 분식
+    ("김밥", "분식", "light", 0, 18, 4000, 6000),
+    ("떡볶이", "분식", "light", 2, 14, 5000, 8000),
+    ("라면", "분식", "noodle", 2, 8, 5000, 7000),
+    ("쫄면", "분식", "cold", 2, 26, 7000, 9000),
+    # 일식
+    ("돈까스", "일식", "fried", 0, 16, 9000, 12000),
+    ("치즈돈까스", "일식", "fried", 0, 15, 10000, 13000),
+    ("텐동", "일식", "fried", 0, 14, 11000, 14000),
+    ("우동", "일식", "noodle", 0, 7, 8000, 10000),
+    ("라멘", "일식", "noodle", 1, 6, 10000, 13000),
+    ("규동", "일식", "rice", 0, 15, 9000, 11000),
+    ("초밥", "일식", "cold", 0, 24, 13000, 20000),
+    ("냉소바", "일식", "cold", 0, 28, 9000, 12000),
+    # 중식
+    ("짜장면", "중식", "noodle", 0, 16, 7000, 9000),
+    ("짬뽕", "중식", "soup", 3, 6, 8000, 10000),
+    ("볶음밥", "중식", "rice", 0, 17, 8000, 10000),
+    ("마파두부덮밥", "중식", "rice", 2, 14, 9000, 11000),
+    ("탕수육", "중식", "fried", 0, 16, 15000, 20000),
+    ("마라탕", "중식", "soup", 3, 8, 10000, 15000),
+    ("중국냉면", "중식", "cold", 1, 29, 10000, 12000),
+    # 양식
+    ("파스타", "양식", "noodle", 0, 17, 13000, 17000),
+    ("크림파스타", "양식", "noodle", 0, 14, 14000, 17000),
+    ("리조또", "양식", "rice", 0, 14, 14000, 17000),
+    ("스테이크", "양식", "grill", 0, 15, 20000, 30000),
+    ("햄버거", "양식", "light", 0, 18, 9000, 13000),
+    ("샐러드", "양식", "light", 0, 26, 10000, 13000),
+    ("샌드위치", "양식", "light", 0, 22, 8000, 11000),
+    # 아시안
+    ("쌀국수", "아시안", "soup", 1, 10, 10000, 13000),
+    ("팟타이", "아시안", "noodle", 1, 20, 11000, 14000),
+    ("카레", "아시안", "rice", 1, 14, 9000, 12000),
+    ("분짜", "아시안", "cold", 1, 26, 12000, 14000),
+]
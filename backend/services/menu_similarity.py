@@ -0,0 +1,117 @@
+"""
+Menu Similarity
+메뉴 이름 유사도 (avoidList 의미적 제외를 LLM 대신 후처리에서 결정적으로)
+- 메뉴 이름 → 글자 1-gram/2-gram + 끝 두 글자 + 음식 분류 특징을 해시해서 고정 길이 벡터
+- 후보 × avoidList 코사인 유사도를 행렬 곱 한 번으로 계산
+  (김치찌개 ↔ 된장찌개/순두부찌개, 돈까스 ↔ 치즈돈까스/생선까스, 파스타 ↔ 크림파스타)
+"""
+
+import os
+import zlib
+from functools import lru_cache
+from typing import Dict, List
+from dotenv import load_dotenv
+from services.dish_taxonomy import classify_dish
+from services.menu_canonical import canonicalize_menu_item
+
+load_dotenv()
+
+# NumPy가 없으면 유사도 제외를 끄고 (식당, 메뉴) 완전 일치만 제외
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+VECTOR_DIMS = 512
+
+# 특징별 가중치: 한국어 메뉴 이름은 끝말("찌개", "까스", "파스타")이 음식 종류를 정함
+UNIGRAM_WEIGHT = 0.5
+BIGRAM_WEIGHT = 1.0
+SUFFIX_WEIGHT = 2.0
+TAG_WEIGHT = 1.0
+
+
+def _features(name: str) -> Dict[str, float]:
+    text = canonicalize_menu_item(name).replace(" ", "")
+    features: Dict[str, float] = {}
+    for ch in text:
+        features["u:" + ch] = features.get("u:" + ch, 0.0) + UNIGRAM_WEIGHT
+    for i in range(len(text) - 1):
+        key = "b:" + text[i:i + 2]
+        features[key] = features.get(key, 0.0) + BIGRAM_WEIGHT
+    if text:
+        features["s:" + text[-2:]] = SUFFIX_WEIGHT
+    for tag in classify_dish(text).head:
+        features["t:" + tag] = TAG_WEIGHT
+    return features
+
+
+@lru_cache(maxsize=int(os.getenv("MENU_SIMILARITY_CACHE_SIZE", "8192")))
+def menu_vector(name: str) -> "np.ndarray":
+    """메뉴 이름 → 단위 벡터 (특징 해싱, 부호 비트로 충돌 상쇄, 같은 이름은 캐시)"""
+    vector = np.zeros(VECTOR_DIMS, dtype=np.float32)
+    for key, weight in _features(name).items():
+        h = zlib.crc32(key.encode("utf-8"))
+        vector[h % VECTOR_DIMS] += weight if h >> 31 else -weight
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+
+class MenuSimilarity:
+    """후보 메뉴와 avoidList 메뉴의 코사인 유사도 비교기"""
+
+    def __init__(self):
+        self.threshold = float(os.getenv("MENU_SIMILARITY_THRESHOLD", "0.5"))
+        self.checks = 0
+        self.filtered = 0
+
+    @property
+    def active(self) -> bool:
+        return NUMPY_AVAILABLE
+
+    def matrix(self, names: List[str]) -> "np.ndarray":
+        """메뉴 이름들 → (개수 × VECTOR_DIMS) 행렬"""
+        if not names:
+            return np.zeros((0, VECTOR_DIMS), dtype=np.float32)
+        return np.stack([menu_vector(name) for name in names])
+
+    def similar_mask(self, names: List[str], avoid_names: List[str]) -> List[bool]:
+        """
+        각 메뉴가 avoid_names 중 하나와 유사한지 (유사도 ≥ threshold)
+
+        Returns:
+            list: names와 같은 순서의 bool 목록 (비활성이면 전부 False)
+        """
+        names = [n or "" for n in names]
+        avoid_names = [n for n in avoid_names if n]
+        if not self.active or not names or not avoid_names:
+            return [False] * len(names)
+
+        scores = self.matrix(names) @ self.matrix(avoid_names).T
+        mask = (scores.max(axis=1) >= self.threshold).tolist()
+        self.checks += len(names)
+        self.filtered += sum(mask)
+        return mask
+
+    def is_similar(self, name: str, avoid_names: List[str]) -> bool:
+        """메뉴 하나가 avoid_names 중 하나와 유사한지"""
+        return self.similar_mask([name], avoid_names)[0]
+
+    def stats(self) -> Dict:
+        """유사도 비교 통계"""
+        info = menu_vector.cache_info()
+        return {
+            "enabled": self.active,
+            "threshold": self.threshold,
+            "checks": self.checks,
+            "filtered": self.filtered,
+            "vector_cache_size": info.currsize,
+        }
+
+
+# 싱글톤 인스턴스
+menu_similarity = MenuSimilarity()
@@ -0,0 +1,140 @@
+"""
+OCR Result Cache
+이미지 내용 해시 + 요일 기준으로 OCR 결과를 SQLite에 저장하는 캐시
+- 같은 식단표 사진을 다시 올리면 Gemini Vision 호출 없이 바로 반환
+- 서버를 재시작해도 유지되고, 전체 크기가 상한을 넘으면 오래 안 쓴 것부터 삭제
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "ocr_cache.sqlite3"
+)
+
+
+class OCRResultCache:
+    """SQLite 기반 OCR 결과 캐시 (크기 기준 LRU 제거)"""
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본값: OCR_CACHE_PATH 또는 backend/ocr_cache.sqlite3)
+            max_bytes: 저장된 결과의 총 크기 상한 (기본값: OCR_CACHE_MAX_BYTES 또는 20MB)
+        """
+        self.path = path or os.getenv("OCR_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes or int(os.getenv("OCR_CACHE_MAX_BYTES", str(20 * 1024 * 1024)))
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_results_last_used ON ocr_results (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(image_bytes: bytes, weekday: str) -> str:
+        """이미지 바이트 해시 + 요일 (프롬프트가 오늘 요일에 따라 달라지므로)"""
+        return f"{hashlib.sha256(image_bytes).hexdigest()}:{weekday}"
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """캐시된 OCR 결과 조회 (없으면 None)"""
+        result = await asyncio.to_thread(self._get_sync, key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    async def set(self, key: str, result: Dict):
+        """OCR 결과 저장 후 크기 상한 초과분 정리"""
+        await asyncio.to_thread(self._set_sync, key, result)
+
+    def _get_sync(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM ocr_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def _set_sync(self, key: str, result: Dict):
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ocr_results (key, result, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, payload, len(payload.encode("utf-8")), now, now)
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """총 크기가 상한 아래로 내려갈 때까지 가장 오래 안 쓴 항목 삭제"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM ocr_results ORDER BY last_used ASC"
+        ).fetchall()
+        evict = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM ocr_results WHERE key = ?", evict)
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_results"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        """SQLite 연결 종료"""
+        with self._lock:
+            self._conn.close()
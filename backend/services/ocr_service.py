@@ -3,40 +3,94 @@ OCR Service
 식단표 이미지에서 메뉴 텍스트를 추출하는 서비스
 """
 
-import google.generativeai as genai
+import asyncio
 import base64
+import json
 import re
-from typing import Optional
-import os
+from typing import Dict, List, Optional
+import time
 from dotenv import load_dotenv
+from services.llm_executor import llm_executor
+from services.ocr_cache import OCRResultCache
+from services.image_hash import NearDuplicateIndex, dhash
+from services.image_preprocess import ImagePreprocessor
+from services.week_menu_store import MEAL_SLOTS, WEEKDAYS_KR, WeekMenuStore
+from services.dish_taxonomy import is_side_dish
+from services.llm_provider import llm_provider
+from services.kst_clock import now_kst
 
 load_dotenv()
 
 
+def detect_image_type(header: bytes) -> Optional[str]:
+    """
+    파일 앞부분의 매직 넘버로 이미지 MIME 타입 판별
+
+    Args:
+        header: 파일 앞 12바이트 이상
+
+    Returns:
+        str: MIME 타입 (지원하지 않는 형식이면 None)
+    """
+    if header.startswith(b'\xFF\xD8\xFF'):
+        return "image/jpeg"
+    if header.startswith(b'\x89PNG'):
+        return "image/png"
+    if header.startswith(b'GIF8'):
+        return "image/gif"
+    if header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+        return "image/webp"
+    # 아이폰 기본 사진 형식 (ISO BMFF: 4바이트 크기 + "ftyp" + 브랜드)
+    if header[4:8] == b'ftyp' and header[8:12] in (b'heic', b'heix', b'heim', b'heis', b'mif1', b'msf1'):
+        return "image/heic"
+    return None
+
+
 class OCRService:
     """Gemini Vision API를 사용한 식단표 이미지 처리"""
     
     def __init__(self):
         """OCR 서비스 초기화"""
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            raise ValueError("❌ GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        # Vision 모델 설정 (LLM_PROVIDER=gemini|stub, 키가 없으면 OCR 요청만 실패하고 서버는 뜸)
+        vision_config = {
+            "temperature": 0.3,  # 낮은 temperature로 정확도 향상
+            "top_p": 0.8,
+            "top_k": 40,
+            "max_output_tokens": 1024,
+        }
+        if llm_provider.available:
+            self.model = llm_provider.model("vision", generation_config=vision_config)
+            # 주간 식단표는 JSON으로 받고 출력이 길어서 별도 모델
+            self.week_model = llm_provider.model("vision_week", generation_config={
+                **vision_config,
+                "response_mime_type": "application/json",
+                "max_output_tokens": 2048,
+            })
+        else:
+            self.model = None
+            self.week_model = None
+            print("⚠️  GEMINI_API_KEY가 설정되지 않았습니다. 식단표 인식을 사용할 수 없습니다.")
+
+        # 이미지 해시 + 요일 기준 OCR 결과 캐시 (SQLite, 재시작해도 유지)
+        self.cache = OCRResultCache()
+        # 구내식당별 오늘 추출한 주간 식단표 사진의 지각 해시 인덱스 (다른 각도로 찍은 같은 식단표 재사용)
+        self.near_duplicates = NearDuplicateIndex()
+        # 구내식당별 주간 식단표 (한 번 OCR 하면 나머지 요일은 업로드 없이 조회)
+        self.week_menus = WeekMenuStore()
+        # Vision 호출 전 축소/흑백/크롭 (프로세스 풀)
+        self.preprocessor = ImagePreprocessor()
+
+        # Vision 호출 지연/전송 크기 통계 (전처리 전후 비교용)
+        self.vision_calls = 0
+        self.vision_ms = 0.0
+        self.vision_bytes = 0
 
-        
-        genai.configure(api_key=api_key)
-        
-        # Vision 모델 설정
-        self.model = genai.GenerativeModel(
-            'gemini-2.0-flash',
-            generation_config={
-                "temperature": 0.3,  # 낮은 temperature로 정확도 향상
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 1024,
-            }
-        )
-        
         print("✅ OCR Service 초기화 완료 (Gemini Vision)")
+
+    @staticmethod
+    def _today_weekday() -> str:
+        """오늘 요일 (한국어)"""
+        return WEEKDAYS_KR[now_kst().weekday()]
     
     async def extract_menu_from_image(
         self, 
@@ -59,19 +113,45 @@ class OCRService:
                 "error": str (optional)
             }
         """
+        try:
+            image_bytes = self._decode_base64_image(base64_image)
+        except Exception as e:
+            return self._failure_result(e, fallback_text)
+
+        return await self.extract_menu_from_bytes(image_bytes, fallback_text)
+
+    async def extract_menu_from_bytes(
+        self,
+        image_bytes: bytes,
+        fallback_text: Optional[str] = None,
+        mime_type: Optional[str] = None
+    ) -> dict:
+        """
+        이미지 바이트에서 메뉴 텍스트 추출 (멀티파트 업로드는 Base64 변환 없이 바로 사용)
+
+        Args:
+            image_bytes: 이미지 원본 바이트
+            fallback_text: OCR 실패 시 사용할 대체 텍스트 (선택)
+            mime_type: 이미 판별한 MIME 타입 (없으면 매직 넘버로 감지)
+
+        Returns:
+            dict: extract_menu_from_image와 같은 형식
+        """
         try:
             print("🔍 이미지에서 메뉴 추출 시작...")
-            
-            # Base64 헤더 제거 (data:image/jpeg;base64, 부분)
-            if ',' in base64_image:
-                base64_image = base64_image.split(',')[1]
-            
-            # 이미지 타입 감지
-            image_bytes = base64.b64decode(base64_image)
-            mime_type = self._detect_mime_type(image_bytes)
-            
+
+            mime_type = mime_type or self._detect_mime_type(image_bytes)
+
+            # 같은 이미지 + 같은 요일이면 캐시된 결과 사용 (Vision 호출 생략)
+            cache_key = self.cache.make_key(image_bytes, self._today_weekday())
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print(f"💾 OCR 캐시 적중: {len(cached.get('menu_list', []))}개 메뉴")
+                return cached
+
             # Gemini Vision API 호출
-            menu_text = await self._call_gemini_vision(base64_image, mime_type)
+            vision_bytes, vision_mime = await self.preprocessor.process(image_bytes, mime_type)
+            menu_text = await self._call_gemini_vision(vision_bytes, vision_mime)
             
             # 메뉴 리스트 파싱
             menu_list = self._parse_menu_text(menu_text)
@@ -86,45 +166,232 @@ class OCRService:
                 "confidence": confidence
             }
             
+            # 쓸 만한 결과만 캐시 (신뢰도 낮은 결과는 다음 업로드 때 다시 시도)
+            if menu_list and confidence != "low":
+                await self.cache.set(cache_key, result)
+
             print(f"✅ 메뉴 추출 완료: {len(menu_list)}개 메뉴 발견")
             print(f"📋 추출된 메뉴: {', '.join(menu_list[:5])}{'...' if len(menu_list) > 5 else ''}")
             
             return result
             
         except Exception as e:
-            error_msg = f"이미지 처리 실패: {str(e)}"
-            print(f"❌ {error_msg}")
-            
-            # Fallback: 사용자가 입력한 텍스트 사용
-            if fallback_text and fallback_text.strip():
-                return {
-                    "success": True,
-                    "menu_text": fallback_text,
-                    "menu_list": self._parse_menu_text(fallback_text),
-                    "confidence": "fallback",
-                    "error": error_msg
-                }
-            
+            return self._failure_result(e, fallback_text)
+
+    def _failure_result(self, error: Exception, fallback_text: Optional[str]) -> dict:
+        """이미지 처리 실패 결과 (대체 텍스트가 있으면 그걸로)"""
+        error_msg = f"이미지 처리 실패: {str(error)}"
+        print(f"❌ {error_msg}")
+        
+        # Fallback: 사용자가 입력한 텍스트 사용
+        if fallback_text and fallback_text.strip():
             return {
-                "success": False,
-                "menu_text": "",
-                "menu_list": [],
-                "confidence": "none",
+                "success": True,
+                "menu_text": fallback_text,
+                "menu_list": self._parse_menu_text(fallback_text),
+                "confidence": "fallback",
                 "error": error_msg
             }
+        
+        return {
+            "success": False,
+            "menu_text": "",
+            "menu_list": [],
+            "confidence": "none",
+            "error": error_msg
+        }
+
+    # =======================================================================
+    # 주간 식단표 모드: 한 번의 Vision 호출로 모든 요일 × 끼니 추출
+    # =======================================================================
+    async def extract_week_menu_from_image(
+        self,
+        base64_image: str,
+        cafeteria_id: str,
+        fallback_text: Optional[str] = None
+    ) -> dict:
+        """
+        주간 식단표 이미지에서 모든 요일/끼니 메뉴를 추출해 구내식당별로 저장하고,
+        오늘 점심 메뉴를 extract_menu_from_image와 같은 형식으로 반환
+
+        Returns:
+            dict: extract_menu_from_image 결과 + "week_menu" (요일 → 끼니 → 메뉴 리스트)
+        """
+        try:
+            image_bytes = self._decode_base64_image(base64_image)
+        except Exception as e:
+            return self._failure_result(e, fallback_text)
+
+        return await self.extract_week_menu_from_bytes(image_bytes, cafeteria_id, fallback_text)
+
+    async def extract_week_menu_from_bytes(
+        self,
+        image_bytes: bytes,
+        cafeteria_id: str,
+        fallback_text: Optional[str] = None,
+        mime_type: Optional[str] = None
+    ) -> dict:
+        """이미지 바이트 버전의 extract_week_menu_from_image"""
+        try:
+            print(f"🔍 주간 식단표 추출 시작 (구내식당: {cafeteria_id})...")
+
+            mime_type = mime_type or self._detect_mime_type(image_bytes)
+
+            # 주간 추출 결과는 요일과 무관 → 이미지 해시만으로 캐시
+            cache_key = self.cache.make_key(image_bytes, "week")
+            cached = await self.cache.get(cache_key)
+            # 조금 다르게 찍은 같은 식단표면 이 구내식당에서 오늘 추출한 결과 재사용
+            # (정확 해시 캐시에는 넣지 않음: 지각 해시 일치는 같은 식단표라는 보장이 아님)
+            image_hash = None
+            similar = None
+            if cached is None and self.near_duplicates.enabled:
+                image_hash = await asyncio.to_thread(dhash, image_bytes)
+                if image_hash is not None:
+                    similar = self.near_duplicates.find(cafeteria_id, image_hash)
+
+            if cached is not None:
+                print("💾 주간 식단표 OCR 캐시 적중")
+                week_menu = cached["week_menu"]
+            elif similar is not None:
+                week_menu = similar
+            else:
+                vision_bytes, vision_mime = await self.preprocessor.process(image_bytes, mime_type)
+                week_menu = await self._call_gemini_vision_week(vision_bytes, vision_mime)
+                if any(week_menu.values()):
+                    await self.cache.set(cache_key, {"week_menu": week_menu})
+                    if image_hash is not None:
+                        self.near_duplicates.add(cafeteria_id, image_hash, week_menu)
+
+            if any(week_menu.values()):
+                await self.week_menus.set_week(cafeteria_id, week_menu)
+
+            result = self._result_for_day(week_menu, self._today_weekday())
+            result["week_menu"] = week_menu
+
+            print(f"✅ 주간 식단표 추출 완료: {sum(1 for d in week_menu.values() if d)}일치, 오늘 {len(result['menu_list'])}개 메뉴")
+            return result
+
+        except Exception as e:
+            return self._failure_result(e, fallback_text)
+
+    async def get_stored_menu(self, cafeteria_id: str, weekday: Optional[str] = None) -> Optional[dict]:
+        """
+        저장된 주간 식단표에서 오늘(또는 지정 요일) 점심 메뉴 조회 (이미지 업로드 없이)
+
+        Returns:
+            dict: extract_menu_from_image와 같은 형식 (저장된 게 없으면 None)
+        """
+        week_menu = await self.week_menus.get_week(cafeteria_id)
+        if not week_menu:
+            return None
+
+        result = self._result_for_day(week_menu, weekday or self._today_weekday())
+        if not result["menu_list"]:
+            return None
+
+        print(f"📅 저장된 주간 식단표 사용 (구내식당: {cafeteria_id})")
+        return result
+
+    def _result_for_day(self, week_menu: Dict, weekday: str) -> dict:
+        """주간 식단표에서 해당 요일 점심 메뉴를 OCR 결과 형식으로 변환"""
+        menus = (week_menu.get(weekday) or {}).get("중식", [])
+        menu_text = ", ".join(menus)
+        menu_list = self._parse_menu_text(menu_text)
+        return {
+            "success": True,
+            "menu_text": menu_text,
+            "menu_list": menu_list,
+            "confidence": self._evaluate_confidence(menu_text, menu_list)
+        }
+
+    async def _call_gemini_vision_week(self, image_bytes: bytes, mime_type: str) -> Dict:
+        """Gemini Vision API 호출 (주간 식단표 전체를 JSON으로)"""
+        image_part = {
+            "mime_type": mime_type,
+            "data": image_bytes
+        }
+
+        prompt = """
+이 이미지는 구내식당 또는 학교 급식 **주간** 식단표입니다.
+**모든 요일, 모든 끼니(조식/중식/석식)의 메인 메뉴**를 추출해주세요.
+
+**중요 지침:**
+1. 요일별로 구분하세요 (월요일 ~ 일요일, 식단표에 있는 요일만).
+2. 조식/중식/석식 구분이 있으면 그대로 나누고, 구분이 없으면 모두 "중식"에 넣으세요.
+3. 여러 코너/식당이 있다면 모든 코너의 메인 메뉴를 해당 끼니에 포함하세요.
+4. **메인 메뉴만 추출** (찌개, 구이, 볶음, 탕, 면, 덮밥, 전골, 카레, 파스타 등)
+5. 반찬(김치, 깍두기, 나물 등), 밥(잡곡밥, 흰밥), 부수 국(된장국, 미역국), 후식, 가격, 칼로리는 제외하세요.
+6. 메뉴명만 쓰고 중복은 제거하세요.
+
+**출력 형식 (JSON만, 코드블록 금지):**
+{
+  "days": {
+    "월요일": {"조식": ["토스트"], "중식": ["김치찌개", "제육볶음"], "석식": ["불고기"]},
+    "화요일": {"조식": [], "중식": ["돈까스"], "석식": []}
+  }
+}
+"""
+
+        response = await self._generate_vision([prompt, image_part], model=self.week_model)
+        response_text = response.text.strip()
+
+        if '```' in response_text:
+            response_text = response_text.split('```')[1].removeprefix('json').strip()
+
+        data = json.loads(response_text)
+        return self._normalize_week_menu(data.get("days", data))
+
+    def _normalize_week_menu(self, days: Dict) -> Dict:
+        """
+        모델 응답을 {요일: {끼니: [메뉴]}} 형식으로 정규화
+        ("월"/"Mon", "점심"/"lunch" 같은 변형 표기 허용)
+        """
+        day_aliases = {}
+        for i, name in enumerate(WEEKDAYS_KR):
+            day_aliases[name] = name
+            day_aliases[name[0]] = name
+            day_aliases[['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'][i]] = name
+        meal_aliases = {
+            '조식': '조식', '아침': '조식', 'breakfast': '조식',
+            '중식': '중식', '점심': '중식', 'lunch': '중식',
+            '석식': '석식', '저녁': '석식', 'dinner': '석식',
+        }
+
+        week_menu: Dict[str, Dict[str, List[str]]] = {}
+        for raw_day, meals in (days or {}).items():
+            day_key = str(raw_day).strip().lower()
+            day = day_aliases.get(day_key) or day_aliases.get(day_key[:3]) or day_aliases.get(day_key[:1])
+            if not day:
+                continue
+
+            # 끼니 구분 없이 리스트로 온 경우 → 중식
+            if isinstance(meals, list):
+                meals = {"중식": meals}
+
+            slots = week_menu.setdefault(day, {})
+            for raw_meal, menus in (meals or {}).items():
+                meal = meal_aliases.get(str(raw_meal).strip().lower(), "중식")
+                cleaned = [self._clean_extracted_text(str(m)) for m in (menus or [])]
+                existing = slots.setdefault(meal, [])
+                existing.extend(m for m in cleaned if m and m not in existing)
+
+        # 요일 순서대로, 비어 있는 끼니도 키는 유지
+        return {
+            day: {meal: week_menu[day].get(meal, []) for meal in MEAL_SLOTS}
+            for day in WEEKDAYS_KR
+            if day in week_menu
+        }
     
-    async def _call_gemini_vision(self, base64_image: str, mime_type: str) -> str:
+    async def _call_gemini_vision(self, image_bytes: bytes, mime_type: str) -> str:
         """Gemini Vision API 호출"""
         
         # 현재 요일 가져오기
-        from datetime import datetime
-        weekdays_kr = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
-        today_weekday = weekdays_kr[datetime.now().weekday()]
+        today_weekday = self._today_weekday()
         
-        # 이미지 파트 생성
+        # 이미지 파트 생성 (원본 바이트 그대로 전달)
         image_part = {
             "mime_type": mime_type,
-            "data": base64_image
+            "data": image_bytes
         }
         
         # 프롬프트 작성
@@ -186,8 +453,8 @@ class OCRService:
 오늘({today_weekday}) 점심(중식) 메인 메뉴만 추출해주세요:
 """
         
-        # Gemini 호출
-        response = self.model.generate_content([prompt, image_part])
+        # Gemini 호출 (전용 스레드 풀에서 실행 → 이벤트 루프 블로킹 방지)
+        response = await self._generate_vision([prompt, image_part])
         menu_text = response.text.strip()
         
         # 불필요한 텍스트 제거
@@ -195,19 +462,37 @@ class OCRService:
         
         return menu_text
     
+    async def _generate_vision(self, contents: list, model=None):
+        """Gemini Vision 호출 + 지연/전송 크기 기록 (전용 스레드 풀에서 실행)"""
+        model = model or self.model
+        if model is None:
+            raise RuntimeError("LLM 백엔드가 설정되지 않았습니다 (GEMINI_API_KEY 또는 LLM_PROVIDER=stub).")
+        started = time.perf_counter()
+        response = await llm_executor.run(model.generate_content, contents)
+        self.vision_calls += 1
+        self.vision_ms += (time.perf_counter() - started) * 1000
+        self.vision_bytes += sum(len(part["data"]) for part in contents if isinstance(part, dict))
+        return response
+
+    def get_vision_stats(self) -> Dict:
+        """Vision 호출 통계 + 전처리 통계"""
+        return {
+            "calls": self.vision_calls,
+            "avg_ms": round(self.vision_ms / self.vision_calls, 1) if self.vision_calls else 0.0,
+            "avg_payload_bytes": self.vision_bytes // self.vision_calls if self.vision_calls else 0,
+            "preprocess": self.preprocessor.stats(),
+        }
+
+    @staticmethod
+    def _decode_base64_image(base64_image: str) -> bytes:
+        """Base64 이미지 디코딩 (data:image/jpeg;base64, 헤더가 있으면 제거)"""
+        if ',' in base64_image:
+            base64_image = base64_image.split(',', 1)[1]
+        return base64.b64decode(base64_image)
+
     def _detect_mime_type(self, image_bytes: bytes) -> str:
-        """이미지 MIME 타입 감지"""
-        # 매직 넘버로 이미지 타입 판별
-        if image_bytes.startswith(b'\xFF\xD8\xFF'):
-            return "image/jpeg"
-        elif image_bytes.startswith(b'\x89PNG'):
-            return "image/png"
-        elif image_bytes.startswith(b'GIF'):
-            return "image/gif"
-        elif image_bytes.startswith(b'RIFF') and b'WEBP' in image_bytes[:12]:
-            return "image/webp"
-        else:
-            return "image/jpeg"  # 기본값
+        """이미지 MIME 타입 감지 (매직 넘버 기준, 판별 불가면 JPEG)"""
+        return detect_image_type(image_bytes[:12]) or "image/jpeg"
     
     def _clean_extracted_text(self, text: str) -> str:
         """추출된 텍스트 정리"""
@@ -243,15 +528,6 @@ class OCRService:
         if not text:
             return []
         
-        # 반찬/밥/부수품 키워드 (제외할 것)
-        side_dish_keywords = [
-            '김치', '깍두기', '단무지', '배추김치', '총각김치', '나물', '장아찌',
-            '밥', '잡곡밥', '흰밥', '현미밥', '쌀밥',
-            '된장국', '미역국', '콩나물국', '무국', '북어국',  # 메인이 아닌 국
-            '과일', '요구르트', '음료', '우유', '주스',
-            '샐러드', '샌드위치'  # 후식/간단 메뉴 (메인이 아닌 경우)
-        ]
-        
         # 여러 구분자로 분리
         menus = re.split(r'[,;\n|]', text)
         
@@ -271,11 +547,8 @@ class OCRService:
             # 괄호 안 영어명 정리
             menu = re.sub(r'\([^)]*\)', '', menu).strip()
             
-            # 반찬/밥/부수품 제외
-            is_side_dish = any(keyword in menu for keyword in side_dish_keywords)
-            
-            # 메인 메뉴만 추가
-            if menu and not is_side_dish:
+            # 반찬/밥/부수품 제외 (이름 끝 키워드 기준: "김치찌개"는 메인, "배추김치"는 반찬)
+            if menu and not is_side_dish(menu):
                 cleaned_menus.append(menu)
         
         # 중복 제거 및 순서 유지
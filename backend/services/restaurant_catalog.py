@@ -0,0 +1,238 @@
+"""
+Restaurant Catalog
+주변 식당 카탈로그 (시작할 때 파일에서 한 번 읽어 배열로 보관)
+- 위도/경도 격자 칸 순서로 정렬해 두고 반경 안의 칸만 잘라서 haversine 거리 계산
+- 걸어서 몇 분인지(minutesAway)는 거리 × 우회 계수 / 보행 속도로 계산
+
+파일 형식 (RESTAURANT_CATALOG_PATH, .csv 또는 .json):
+    place_id, name, category, latitude, longitude, menu
+    menu는 CSV면 "|"로 구분한 문자열, JSON이면 문자열 목록
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# NumPy가 없으면 카탈로그를 쓰지 않고 기존 가상 후보 사용
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = 111320.0
+# 직선거리 대비 실제 걷는 거리 (골목/횡단보도 우회)
+WALK_DETOUR_FACTOR = 1.3
+# 격자 칸 키 = (위도 칸 + 오프셋) × LNG_KEY_SPAN + (경도 칸 + 오프셋)
+LNG_KEY_SPAN = 10_000_000
+CELL_OFFSET = 5_000_000
+
+
+class RestaurantCatalog:
+    """격자 인덱스 기반 주변 식당 검색"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("RESTAURANT_CATALOG_PATH", "")
+        # 격자 칸 크기 (도 단위, 0.005° ≈ 550m)
+        self.cell_deg = float(os.getenv("RESTAURANT_GRID_DEG", "0.005"))
+        self.walk_speed_kmh = float(os.getenv("RESTAURANT_WALK_SPEED_KMH", "4.5"))
+        # 프롬프트에 넣을 후보 수 / 음식 종류별 최대 개수 (0이면 제한 없음)
+        self.candidate_limit = int(os.getenv("RESTAURANT_CANDIDATES", "12"))
+        self.per_category = int(os.getenv("RESTAURANT_PER_CATEGORY", "4"))
+
+        self.size = 0
+        self.queries = 0
+        self.total_us = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.size > 0
+
+    # =======================================================================
+    # 로드
+    # =======================================================================
+    def load(self) -> int:
+        """
+        카탈로그 파일을 읽어 격자 칸 순서로 정렬된 배열 생성 (lifespan에서 스레드로 호출)
+
+        Returns:
+            int: 읽은 식당 수 (파일이 없거나 NumPy가 없으면 0)
+        """
+        if not self.path or not NUMPY_AVAILABLE:
+            return 0
+        if not os.path.exists(self.path):
+            print(f"⚠️ 식당 카탈로그 파일이 없습니다: {self.path}")
+            return 0
+
+        started = time.perf_counter()
+        rows = self._read_rows(self.path)
+        rows = [r for r in rows if r["latitude"] is not None and r["longitude"] is not None]
+        if not rows:
+            return 0
+
+        lat = np.array([r["latitude"] for r in rows], dtype=np.float64)
+        lng = np.array([r["longitude"] for r in rows], dtype=np.float64)
+        keys = self._cell_keys(lat, lng)
+        order = np.argsort(keys, kind="stable")
+
+        self._keys = keys[order]
+        self._lat = np.radians(lat[order])
+        self._lng = np.radians(lng[order])
+        self._cos_lat = np.cos(self._lat)
+
+        categories = list(dict.fromkeys(r["category"] for r in rows))
+        category_ids = {c: i for i, c in enumerate(categories)}
+        self._categories = categories
+        self._category = np.array([category_ids[rows[i]["category"]] for i in order], dtype=np.int32)
+        self._place_ids = [rows[i]["place_id"] for i in order]
+        self._names = [rows[i]["name"] for i in order]
+        self._menus = [rows[i]["menu"] for i in order]
+        self.size = len(rows)
+
+        print(
+            f"✅ 식당 카탈로그 로드: {self.size}곳, 음식 종류 {len(categories)}개 "
+            f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+        )
+        return self.size
+
+    def _read_rows(self, path: str) -> List[Dict]:
+        if path.endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        else:
+            with open(path, encoding="utf-8", newline="") as f:
+                raw = list(csv.DictReader(f))
+
+        rows = []
+        for i, r in enumerate(raw):
+            menu = r.get("menu") or []
+            if isinstance(menu, str):
+                menu = [m.strip() for m in menu.split("|") if m.strip()]
+            try:
+                latitude, longitude = float(r["latitude"]), float(r["longitude"])
+            except (KeyError, TypeError, ValueError):
+                latitude = longitude = None
+            rows.append({
+                "place_id": str(r.get("place_id") or f"place_{i}"),
+                "name": r.get("name") or "",
+                "category": r.get("category") or "기타",
+                "latitude": latitude,
+                "longitude": longitude,
+                "menu": tuple(menu),
+            })
+        return rows
+
+    def _cell(self, degrees: float) -> int:
+        return math.floor(degrees / self.cell_deg) + CELL_OFFSET
+
+    def _cell_keys(self, lat, lng):
+        lat_cell = np.floor(lat / self.cell_deg).astype(np.int64) + CELL_OFFSET
+        lng_cell = np.floor(lng / self.cell_deg).astype(np.int64) + CELL_OFFSET
+        return lat_cell * LNG_KEY_SPAN + lng_cell
+
+    # =======================================================================
+    # 검색
+    # =======================================================================
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        max_minutes: float,
+        limit: Optional[int] = None,
+        per_category: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        걸어서 max_minutes 안에 있는 식당 (가까운 순)
+
+        Args:
+            limit: 최대 개수 (기본 RESTAURANT_CANDIDATES)
+            per_category: 음식 종류별 최대 개수 (기본 RESTAURANT_PER_CATEGORY, 한 종류로 후보가 채워지지 않게)
+
+        Returns:
+            list: [{"placeId", "name", "category", "minutesAway", "menuExamples"}, ...]
+        """
+        if not self.loaded:
+            return []
+        limit = limit or self.candidate_limit
+        per_category = per_category or self.per_category or None
+
+        started = time.perf_counter()
+        radius_m = max_minutes * self._walk_m_per_min() / WALK_DETOUR_FACTOR
+        positions = self._positions_in_box(latitude, longitude, radius_m)
+
+        results = []
+        if positions.size:
+            distances = self._haversine_m(latitude, longitude, positions)
+            inside = distances <= radius_m
+            positions, distances = positions[inside], distances[inside]
+            by_distance = np.argsort(distances, kind="stable")
+
+            per_category_count: Dict[int, int] = {}
+            for j in by_distance:
+                if len(results) >= limit:
+                    break
+                pos = positions[j]
+                category = int(self._category[pos])
+                if per_category is not None and per_category_count.get(category, 0) >= per_category:
+                    continue
+                per_category_count[category] = per_category_count.get(category, 0) + 1
+                results.append({
+                    "placeId": self._place_ids[pos],
+                    "name": self._names[pos],
+                    "category": self._categories[category],
+                    "minutesAway": self._walk_minutes(distances[j]),
+                    "menuExamples": list(self._menus[pos][:5]),
+                })
+
+        self.queries += 1
+        self.total_us += (time.perf_counter() - started) * 1_000_000
+        return results
+
+    def _positions_in_box(self, latitude: float, longitude: float, radius_m: float):
+        """반경을 덮는 격자 칸들의 배열 위치 (위도 칸 한 줄마다 경도 칸이 연속 구간)"""
+        dlat = radius_m / METERS_PER_DEGREE
+        dlng = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+        lat_lo, lat_hi = self._cell(latitude - dlat), self._cell(latitude + dlat)
+        lng_lo, lng_hi = self._cell(longitude - dlng), self._cell(longitude + dlng)
+
+        row_keys = np.arange(lat_lo, lat_hi + 1, dtype=np.int64) * LNG_KEY_SPAN
+        starts = np.searchsorted(self._keys, row_keys + lng_lo, side="left")
+        ends = np.searchsorted(self._keys, row_keys + lng_hi, side="right")
+        spans = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def _haversine_m(self, latitude: float, longitude: float, positions):
+        lat1, lng1 = math.radians(latitude), math.radians(longitude)
+        lat2 = self._lat[positions]
+        dlat = lat2 - lat1
+        dlng = self._lng[positions] - lng1
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * self._cos_lat[positions] * np.sin(dlng / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+    def _walk_m_per_min(self) -> float:
+        return self.walk_speed_kmh * 1000 / 60
+
+    def _walk_minutes(self, distance_m: float) -> int:
+        """직선거리 → 도보 시간 (분, 최소 1분)"""
+        return max(1, math.ceil(distance_m * WALK_DETOUR_FACTOR / self._walk_m_per_min()))
+
+    def stats(self) -> Dict:
+        """카탈로그 통계"""
+        return {
+            "loaded": self.loaded,
+            "restaurants": self.size,
+            "cell_deg": self.cell_deg,
+            "queries": self.queries,
+            "avg_us": round(self.total_us / self.queries, 1) if self.queries else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+restaurant_catalog = RestaurantCatalog()
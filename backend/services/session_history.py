@@ -0,0 +1,63 @@
+"""
+Session History Store
+세션(클라이언트)별 최근 추천 이력 저장소
+- 다른 사용자의 추천이 내 avoidList/중복 제거에 섞이지 않도록 세션 단위로 분리
+- TTL + LRU + 세션당 항목 수 제한으로 메모리 상한 보장
+"""
+
+import os
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from services.ttl_cache import TTLCache
+
+load_dotenv()
+
+
+class SessionHistoryStore:
+    """세션별 (식당, 메뉴) 추천 이력"""
+
+    def __init__(self):
+        # 세션당 최근 몇 개의 (식당, 메뉴)까지 기억할지 (기본: 최근 3번 호출 × 3개)
+        self.max_items = int(os.getenv("SESSION_HISTORY_MAX_ITEMS", "9"))
+        # 최대 세션 수 × 세션당 항목 수 = 메모리 상한
+        self._store = TTLCache(
+            ttl_seconds=float(os.getenv("SESSION_HISTORY_TTL", "7200")),
+            max_size=int(os.getenv("SESSION_HISTORY_MAX_SESSIONS", "10000")),
+        )
+
+    def get(self, session_id: Optional[str]) -> List[Dict]:
+        """
+        세션의 최근 추천 이력 조회 (O(1))
+
+        Returns:
+            list: [{"restaurant_name": str, "menu_name": str}, ...] (세션 ID가 없으면 빈 리스트)
+        """
+        if not session_id:
+            return []
+
+        pairs = self._store.get(session_id) or ()
+        return [
+            {"restaurant_name": restaurant_name, "menu_name": menu_name}
+            for restaurant_name, menu_name in pairs
+        ]
+
+    def record(self, session_id: Optional[str], recommendations: List[Dict]):
+        """이번 추천 결과를 세션 이력에 추가 (오래된 것부터 밀려남)"""
+        if not session_id or not recommendations:
+            return
+
+        new_pairs = tuple(
+            (r.get("restaurant_name") or "", r.get("menu_name") or "")
+            for r in recommendations
+            if r.get("restaurant_name") or r.get("menu_name")
+        )
+        previous = self._store.peek(session_id) or ()
+        # (식당, 메뉴) 문자열 튜플만 저장해서 세션당 메모리를 작게 유지
+        self._store.set(session_id, (previous + new_pairs)[-self.max_items:])
+
+    def stats(self) -> Dict:
+        """세션 이력 저장소 통계"""
+        return {
+            **self._store.stats(),
+            "max_items_per_session": self.max_items,
+        }
@@ -0,0 +1,16 @@
+"""
+SSE
+Server-Sent Events 메시지 형식 도우미 (작업 큐 상태 스트림, 추천 스트리밍 공통)
+"""
+
+import json
+from typing import Any
+
+
+def format_sse(event: str, data: Any) -> str:
+    """이벤트 이름 + JSON 데이터 한 건을 SSE 형식으로"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 주석 한 줄
+SSE_KEEPALIVE = ": keep-alive\n\n"
@@ -0,0 +1,109 @@
+"""
+TTL Cache
+만료 시간(TTL)과 최대 크기(LRU 제거)를 가진 인메모리 캐시
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """TTL + LRU 캐시 (적중/실패 카운터 포함)"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        """
+        Args:
+            ttl_seconds: 항목 유효 시간 (초)
+            max_size: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        # key -> (만료 시각, 값, 저장 시각)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """유효한 값 조회 (만료됐거나 없으면 default, 실패로 집계)"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """값 저장 (기존 값 덮어쓰기, 크기 초과 시 LRU 제거)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.monotonic()
+        self._data[key] = (now + ttl, value, now)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """유효한 값 조회 (카운터/LRU 순서 변경 없음)"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def get_stale(self, key: Hashable, max_age: Optional[float] = None) -> Optional[tuple]:
+        """
+        만료 여부와 상관없이 마지막 저장 값 조회 (stale-while-revalidate용, 카운터 변경 없음)
+
+        Args:
+            max_age: 저장 후 이 시간(초)이 지난 값은 무시 (None이면 제한 없음)
+
+        Returns:
+            tuple: (값, 만료 여부) 또는 None
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        if max_age is not None and now - entry[2] > max_age:
+            return None
+        return entry[1], entry[0] <= now
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거 후 값 반환"""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def items(self) -> List[tuple]:
+        """만료되지 않은 (key, value) 목록 (카운터/순서 변경 없음)"""
+        now = time.monotonic()
+        return [
+            (key, entry[1])
+            for key, entry in self._data.items()
+            if entry[0] > now
+        ]
+
+    def clear(self):
+        """전체 비우기 (카운터는 유지)"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """캐시 통계 (크기, 적중/실패, 적중률)"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
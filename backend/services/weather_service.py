@@ -1,88 +1,484 @@
+import asyncio
 import httpx
-from typing import Dict, Optional
+import os
+import random
+import time
+from array import array
+from typing import Dict, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
+from services.ttl_cache import TTLCache
+from services.kst_clock import now_kst
 
 load_dotenv()
 
+# HTTP/2는 h2 패키지가 있을 때만 사용 (없으면 HTTP/1.1 keep-alive)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HourlyForecast:
+    """
+    한 위치의 시간별 예보 (1시간 간격 배열로 압축 저장)
+
+    - 기온/습도: 두 시간 사이를 선형 보간
+    - 날씨 코드/강수량: 가장 가까운 시간 값 사용
+    """
+
+    __slots__ = ("start", "step", "temperature", "humidity", "weather_code", "precipitation")
+
+    def __init__(self, start: int, step: int, temperature, humidity, weather_code, precipitation):
+        self.start = start  # 첫 시간의 unix time
+        self.step = step  # 배열 간격 (초)
+        self.temperature = array("f", temperature)
+        self.humidity = array("f", humidity)
+        self.weather_code = array("H", weather_code)
+        self.precipitation = array("f", precipitation)
+
+    @classmethod
+    def from_response(cls, hourly: Dict) -> Optional["HourlyForecast"]:
+        """Open-Meteo hourly 응답(timeformat=unixtime)으로 생성 (비어 있으면 None)"""
+        times = hourly.get("time") or []
+        if len(times) < 2:
+            return None
+
+        def _fill(values, default):
+            # 중간에 빠진 값(null)은 직전 값으로 채움
+            out, last = [], default
+            for v in values or []:
+                last = last if v is None else v
+                out.append(last)
+            return (out + [last] * len(times))[:len(times)]
+
+        return cls(
+            start=int(times[0]),
+            step=int(times[1]) - int(times[0]),
+            temperature=_fill(hourly.get("temperature_2m"), 20.0),
+            humidity=_fill(hourly.get("relative_humidity_2m"), 50.0),
+            weather_code=[int(v) for v in _fill(hourly.get("weather_code"), 0)],
+            precipitation=_fill(hourly.get("precipitation"), 0.0),
+        )
+
+    def __len__(self) -> int:
+        return len(self.temperature)
+
+    def covers(self, ts: float) -> bool:
+        """ts(unix time)가 예보 범위 안에 있는지"""
+        return self.start <= ts <= self.start + (len(self) - 1) * self.step
+
+    def at(self, ts: float) -> Dict:
+        """ts 시각의 값 (Open-Meteo 변수명으로 반환)"""
+        pos = (ts - self.start) / self.step
+        i = max(0, min(int(pos), len(self) - 2))
+        frac = min(max(pos - i, 0.0), 1.0)
+        nearest = i + 1 if frac >= 0.5 else i
+
+        return {
+            "temperature_2m": self.temperature[i] + (self.temperature[i + 1] - self.temperature[i]) * frac,
+            "relative_humidity_2m": self.humidity[i] + (self.humidity[i + 1] - self.humidity[i]) * frac,
+            "weather_code": self.weather_code[nearest],
+            "precipitation": self.precipitation[nearest],
+        }
+
+
 class WeatherService:
     def __init__(self):
         # Open-Meteo는 API 키가 필요 없습니다!
         self.base_url = "https://api.open-meteo.com/v1/forecast"
+
+        # 커넥션 풀 설정 (환경변수로 조정 가능)
+        self.max_connections = int(os.getenv("WEATHER_MAX_CONNECTIONS", "20"))
+        self.max_keepalive_connections = int(os.getenv("WEATHER_MAX_KEEPALIVE", "10"))
+        self.keepalive_expiry = float(os.getenv("WEATHER_KEEPALIVE_EXPIRY", "60"))
+
+        # 서비스가 소유하는 장수명 클라이언트 (lifespan에서 start/close)
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # 업스트림 타임아웃/재시도 (멈춘 업스트림이 요청 경로에 10초씩 더하지 않도록 짧게)
+        self.timeout = float(os.getenv("WEATHER_TIMEOUT", "1.5"))
+        self.max_retries = int(os.getenv("WEATHER_MAX_RETRIES", "2"))
+        self.retry_backoff = float(os.getenv("WEATHER_RETRY_BACKOFF", "0.2"))
+        # 캐시 미스 시 요청이 업스트림을 기다리는 최대 시간 (초과 시 조회는 백그라운드로 계속)
+        self.request_deadline = float(os.getenv("WEATHER_REQUEST_DEADLINE", "3.0"))
+        # 마지막 성공값(last-known-good)을 대신 내보낼 수 있는 최대 나이
+        self.stale_max_age = float(os.getenv("WEATHER_STALE_MAX_AGE", "21600"))
+
+        # 날씨 캐시: 격자 셀/도시 단위 시간별 예보, TTL + LRU
+        #   WEATHER_GRID_DEG 0.05도 ≈ 약 5km 격자
+        #   예보는 3시간마다 새로 받고, 조회 시각으로 보간해서 응답
+        self.grid_step = float(os.getenv("WEATHER_GRID_DEG", "0.05"))
+        self.forecast_days = int(os.getenv("WEATHER_FORECAST_DAYS", "2"))
+        self._cache = TTLCache(
+            ttl_seconds=float(os.getenv("WEATHER_CACHE_TTL", "10800")),
+            max_size=int(os.getenv("WEATHER_CACHE_SIZE", "1024")),
+        )
+        # 진행 중인 업스트림 요청 (cache_key -> Task)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced_requests = 0
+        self.upstream_requests = 0
+        self.stale_served = 0
+        self.upstream_failures = 0
+
+        # 배치 프리페치 설정 (간격은 캐시 TTL보다 짧아야 도시 조회가 항상 적중)
+        self.prefetch_enabled = os.getenv("WEATHER_PREFETCH_ENABLED", "true").lower() == "true"
+        self.prefetch_interval = float(os.getenv("WEATHER_PREFETCH_INTERVAL", "3600"))
+        self.prefetch_batch_size = int(os.getenv("WEATHER_PREFETCH_BATCH_SIZE", "100"))
+        # 최근 조회된 격자 셀 (cache_key -> 좌표), 1시간 안 쓰이면 프리페치 대상에서 제외
+        self._recent_cells = TTLCache(
+            ttl_seconds=float(os.getenv("WEATHER_RECENT_CELL_TTL", "3600")),
+            max_size=int(os.getenv("WEATHER_RECENT_CELL_SIZE", "256")),
+        )
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self.prefetch_runs = 0
+        self.prefetch_errors = 0
+        self.last_prefetch_at: Optional[str] = None
         print("✅ Open-Meteo 날씨 서비스 초기화 (무료, 빠른 응답)")
+
+    async def start(self):
+        """공유 HTTP 클라이언트 생성 (DNS/TCP/TLS 연결 재사용)"""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        print(f"✅ 날씨 HTTP 클라이언트 시작 (HTTP/2: {HTTP2_AVAILABLE}, 최대 연결: {self.max_connections})")
+
+    async def close(self):
+        """공유 HTTP 클라이언트 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            print("🛑 날씨 HTTP 클라이언트 종료")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+        if self._client is None:
+            await self.start()
+        return self._client
     
+    # 한국 주요 도시 좌표 (위도, 경도)
+    LOCATION_COORDS = {
+        "서울": (37.5665, 126.9780),
+        "강남": (37.4979, 127.0276),
+        "여의도": (37.5219, 126.9245),
+        "판교": (37.3944, 127.1109),
+        "부산": (35.1796, 129.0756),
+        "대구": (35.8714, 128.6014),
+        "인천": (37.4563, 126.7052),
+        "광주": (35.1595, 126.8526),
+        "대전": (36.3504, 127.3845),
+        "울산": (35.5384, 129.3114),
+        "세종": (36.4800, 127.2890),
+        "수원": (37.2636, 127.0286),
+        "창원": (35.2272, 128.6811),
+        "고양": (37.6584, 126.8320),
+        "용인": (37.2411, 127.1776),
+    }
+    DEFAULT_LOCATION = "서울"
+
     def get_location_coords(self, location: str) -> tuple:
         """한국 주요 도시 좌표 (위도, 경도)"""
-        location_coords = {
-            "서울": (37.5665, 126.9780),
-            "강남": (37.4979, 127.0276),
-            "여의도": (37.5219, 126.9245),
-            "판교": (37.3944, 127.1109),
-            "부산": (35.1796, 129.0756),
-            "대구": (35.8714, 128.6014),
-            "인천": (37.4563, 126.7052),
-            "광주": (35.1595, 126.8526),
-            "대전": (36.3504, 127.3845),
-            "울산": (35.5384, 129.3114),
-            "세종": (36.4800, 127.2890),
-            "수원": (37.2636, 127.0286),
-            "창원": (35.2272, 128.6811),
-            "고양": (37.6584, 126.8320),
-            "용인": (37.2411, 127.1776),
-        }
-        return location_coords.get(location, (37.5665, 126.9780))  # 기본값: 서울
-    
+        return self.LOCATION_COORDS.get(location, self.LOCATION_COORDS[self.DEFAULT_LOCATION])  # 기본값: 서울
+
+    def _resolve_cache_key(self, location: str, lat: float = None, lng: float = None) -> tuple:
+        """
+        캐시 키와 조회 좌표 결정
+
+        - 좌표가 있으면 격자(grid) 셀로 반올림 → 근처 사용자끼리 같은 키 공유
+        - 없으면 도시 이름 (표에 없는 이름은 기본 도시)
+
+        Returns:
+            tuple: (cache_key, latitude, longitude)
+        """
+        if lat is not None and lng is not None:
+            step = self.grid_step
+            cell_lat = round(round(lat / step) * step, 4)
+            cell_lng = round(round(lng / step) * step, 4)
+            return f"grid:{cell_lat},{cell_lng}", cell_lat, cell_lng
+
+        city = location if location in self.LOCATION_COORDS else self.DEFAULT_LOCATION
+        latitude, longitude = self.LOCATION_COORDS[city]
+        return f"city:{city}", latitude, longitude
+
     async def get_weather(self, location: str = "서울", lat: float = None, lng: float = None) -> Dict:
-        """Open-Meteo API로 날씨 정보 조회 (무료, 빠름)"""
+        """Open-Meteo API로 날씨 정보 조회 (격자/도시 단위 예보 캐시에서 현재 시각으로 보간)"""
+        return await self.get_weather_at(location, lat=lat, lng=lng)
+
+    async def get_weather_at(
+        self,
+        location: str = "서울",
+        when: Optional[datetime] = None,
+        lat: float = None,
+        lng: float = None
+    ) -> Dict:
+        """
+        특정 시각의 날씨 조회 (예: 오늘 정오)
+
+        Args:
+            when: 조회할 시각 (None이면 현재, naive datetime은 서버 로컬 시간으로 해석)
+        """
+        if lat is not None and lng is not None:
+            print(f"📍 사용자 제공 좌표 사용: {lat}, {lng} ({location})")
+        else:
+            print(f"📍 location 기반 좌표 사용: {location}")
+
+        ts = time.time() if when is None else when.timestamp()
+        cache_key, latitude, longitude = self._resolve_cache_key(location, lat, lng)
+        if cache_key.startswith("grid:"):
+            self._recent_cells.set(cache_key, (latitude, longitude))
+
+        forecast = self._cache.get(cache_key)
+        if forecast is not None and forecast.covers(ts):
+            print(f"💾 날씨 캐시 적중: {cache_key}")
+            return {"location": location, **self._to_weather_fields(forecast.at(ts))}
+
+        # stale-while-revalidate: 만료된 마지막 성공 예보가 있으면 바로 보간해서 내보내고 백그라운드에서 갱신
+        stale = self._cache.get_stale(cache_key, max_age=self.stale_max_age)
+        if stale is not None and stale[0].covers(ts):
+            self.stale_served += 1
+            self._refresh_in_background(cache_key, latitude, longitude)
+            print(f"♻️ 만료된 날씨 캐시 사용 + 백그라운드 갱신: {cache_key}")
+            return {"location": location, **self._to_weather_fields(stale[0].at(ts))}
+
+        try:
+            forecast = await asyncio.wait_for(
+                self._fetch_coalesced(cache_key, latitude, longitude),
+                timeout=self.request_deadline
+            )
+        except asyncio.TimeoutError:
+            # 조회 작업은 shield 되어 있어 계속 진행되고, 끝나면 캐시에 채워짐
+            print(f"⏱️ 날씨 조회 {self.request_deadline}초 초과: {cache_key}")
+            forecast = None
+
+        if forecast is None or not forecast.covers(ts):
+            return self._get_dummy_weather(location)
+
+        return {"location": location, **self._to_weather_fields(forecast.at(ts))}
+
+    def _refresh_in_background(self, cache_key: str, latitude: float, longitude: float):
+        """만료된 항목을 백그라운드에서 다시 조회 (같은 키 중복 조회는 single-flight로 병합)"""
+        if cache_key in self._inflight:
+            return
+        task = asyncio.ensure_future(self._fetch_and_store(cache_key, latitude, longitude))
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+    async def _fetch_coalesced(self, cache_key: str, latitude: float, longitude: float) -> Optional["HourlyForecast"]:
+        """
+        같은 키에 대한 동시 캐시 미스를 하나의 업스트림 요청으로 병합 (single-flight)
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(cache_key, latitude, longitude))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            self.coalesced_requests += 1
+
+        # 한 요청이 취소돼도 같은 작업을 기다리는 다른 요청은 영향받지 않도록 shield
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, cache_key: str, latitude: float, longitude: float) -> Optional["HourlyForecast"]:
+        """업스트림 조회 후 성공하면 캐시에 저장 (실패는 캐시하지 않음)"""
+        forecast = await self._fetch_forecast(latitude, longitude)
+        if forecast is not None:
+            self._cache.set(cache_key, forecast)
+        return forecast
+
+    def _forecast_params(self, latitude, longitude) -> Dict:
+        """시간별 예보 요청 파라미터 (시각은 unix time으로 받아 파싱 비용 절약)"""
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": "temperature_2m,relative_humidity_2m,weather_code,precipitation",
+            "forecast_days": self.forecast_days,
+            "timeformat": "unixtime",
+            "timezone": "Asia/Seoul"
+        }
+
+    async def _fetch_forecast(self, latitude: float, longitude: float) -> Optional["HourlyForecast"]:
+        """
+        Open-Meteo 시간별 예보 조회
+
+        Returns:
+            HourlyForecast: 실패 시 None
+        """
         try:
-            # 좌표가 제공되면 우선 사용, 없으면 location으로 좌표 찾기
-            if lat is not None and lng is not None:
-                print(f"📍 사용자 제공 좌표 사용: {lat}, {lng} ({location})")
-                latitude, longitude = lat, lng
+            response = await self._get_with_retry(self._forecast_params(latitude, longitude))
+
+            if response.status_code == 200:
+                forecast = HourlyForecast.from_response(response.json().get("hourly", {}))
+                if forecast is None:
+                    print("⚠️ Open-Meteo 예보 응답이 비어 있음")
+                    self.upstream_failures += 1
+                    return None
+                print(f"✅ Open-Meteo 시간별 예보 조회 성공: {len(forecast)}시간")
+                return forecast
             else:
-                print(f"📍 location 기반 좌표 사용: {location}")
-                latitude, longitude = self.get_location_coords(location)
-            
-            params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "current": "temperature_2m,relative_humidity_2m,weather_code,precipitation,cloud_cover",
-                "timezone": "Asia/Seoul"
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    current = data.get("current", {})
-                    
-                    # 날씨 코드를 한국어로 변환
-                    weather_code = current.get("weather_code", 0)
-                    sky_condition = self._weather_code_to_condition(weather_code)
-                    
-                    # 강수 여부 확인
-                    precipitation = current.get("precipitation", 0)
-                    precipitation_str = "비" if precipitation > 0 else "없음"
-                    
-                    weather_data = {
-                        "location": location,
-                        "temperature": round(current.get("temperature_2m", 20), 1),
-                        "sky_condition": sky_condition,
-                        "precipitation": precipitation_str,
-                        "humidity": int(current.get("relative_humidity_2m", 50)),
-                    }
-                    
-                    print(f"✅ Open-Meteo 날씨 조회 성공: {weather_data}")
-                    return weather_data
-                else:
-                    print(f"⚠️ Open-Meteo API 오류: {response.status_code}")
-                    return self._get_dummy_weather(location)
-                    
+                print(f"⚠️ Open-Meteo API 오류: {response.status_code}")
+                self.upstream_failures += 1
+                return None
+
         except Exception as e:
             print(f"⚠️ 날씨 API 오류: {e}")
-            return self._get_dummy_weather(location)
-    
+            self.upstream_failures += 1
+            return None
+
+    async def _get_with_retry(self, params: Dict) -> httpx.Response:
+        """
+        짧은 타임아웃 + 지터(jitter)를 준 지수 백오프 재시도로 Open-Meteo 호출
+        (네트워크 오류/타임아웃, 429, 5xx만 재시도)
+        """
+        client = await self._get_client()
+        for attempt in range(self.max_retries + 1):
+            self.upstream_requests += 1
+            try:
+                response = await client.get(self.base_url, params=params)
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if attempt == self.max_retries:
+                    return response
+                print(f"⚠️ Open-Meteo 응답 {response.status_code}, 재시도 {attempt + 1}/{self.max_retries}")
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"⚠️ Open-Meteo 연결 오류 ({type(e).__name__}), 재시도 {attempt + 1}/{self.max_retries}")
+
+            # full jitter: 0 ~ backoff * 2^attempt
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * (2 ** attempt)))
+
+    async def _fetch_forecast_batch(self, coords: List[tuple]) -> List[Optional["HourlyForecast"]]:
+        """
+        여러 좌표의 시간별 예보를 한 번의 요청으로 조회
+        (Open-Meteo는 쉼표로 구분한 위도/경도 목록을 받음)
+
+        Returns:
+            list: coords와 같은 순서의 예보 (응답에 없는 위치는 None)
+
+        Raises:
+            httpx.HTTPError: 요청 자체가 실패한 경우 (재시도 후에도 4xx/5xx, 연결 오류)
+        """
+        params = self._forecast_params(
+            ",".join(str(c[0]) for c in coords),
+            ",".join(str(c[1]) for c in coords),
+        )
+
+        response = await self._get_with_retry(params)
+        response.raise_for_status()
+
+        data = response.json()
+        # 위치가 1개면 객체, 여러 개면 리스트로 응답
+        items = data if isinstance(data, list) else [data]
+        results: List[Optional[HourlyForecast]] = [None] * len(coords)
+        for i, item in enumerate(items[:len(coords)]):
+            results[i] = HourlyForecast.from_response(item.get("hourly", {}))
+        return results
+
+    def _to_weather_fields(self, values: Dict) -> Dict:
+        """Open-Meteo 변수 값을 서비스 날씨 필드로 변환 (location 제외)"""
+        # 날씨 코드를 한국어로 변환
+        weather_code = values.get("weather_code", 0)
+        sky_condition = self._weather_code_to_condition(weather_code)
+
+        # 강수 여부 확인
+        precipitation = values.get("precipitation", 0)
+        precipitation_str = "비" if precipitation > 0 else "없음"
+
+        return {
+            "temperature": round(values.get("temperature_2m", 20), 1),
+            "sky_condition": sky_condition,
+            "precipitation": precipitation_str,
+            "humidity": int(round(values.get("relative_humidity_2m", 50))),
+        }
+
+    # =======================================================================
+    # 배치 프리페치: 주요 도시 + 최근 조회된 격자 셀을 주기적으로 한 번에 갱신
+    # =======================================================================
+    def start_prefetcher(self):
+        """백그라운드 프리페치 루프 시작 (lifespan에서 호출)"""
+        if not self.prefetch_enabled or self._prefetch_task is not None:
+            return
+        self._prefetch_task = asyncio.create_task(self._prefetch_loop())
+        print(f"✅ 날씨 프리페치 시작 ({self.prefetch_interval:.0f}초 간격)")
+
+    async def stop_prefetcher(self):
+        """백그라운드 프리페치 루프 종료"""
+        if self._prefetch_task is None:
+            return
+        self._prefetch_task.cancel()
+        try:
+            await self._prefetch_task
+        except asyncio.CancelledError:
+            pass
+        self._prefetch_task = None
+
+    async def _prefetch_loop(self):
+        while True:
+            try:
+                await self.prefetch_all()
+            except Exception as e:
+                print(f"⚠️ 날씨 프리페치 오류: {e}")
+            await asyncio.sleep(self.prefetch_interval)
+
+    async def prefetch_all(self) -> int:
+        """
+        모든 주요 도시와 최근 조회된 격자 셀을 배치 요청으로 갱신
+
+        Returns:
+            int: 갱신된 위치 수
+        """
+        targets = [
+            (f"city:{name}", coords)
+            for name, coords in self.LOCATION_COORDS.items()
+        ]
+        targets.extend(self._recent_cells.items())
+
+        refreshed = 0
+        batch_size = self.prefetch_batch_size
+        for i in range(0, len(targets), batch_size):
+            chunk = targets[i:i + batch_size]
+            try:
+                results = await self._fetch_forecast_batch([coords for _, coords in chunk])
+            except Exception as e:
+                # 한 배치가 실패해도 나머지 배치는 계속 갱신
+                self.prefetch_errors += 1
+                print(f"⚠️ 날씨 프리페치 배치 실패 ({len(chunk)}곳): {e}")
+                continue
+            for (cache_key, _), forecast in zip(chunk, results):
+                if forecast is not None:
+                    self._cache.set(cache_key, forecast)
+                    refreshed += 1
+
+        self.prefetch_runs += 1
+        self.last_prefetch_at = datetime.now().isoformat(timespec="seconds")
+        print(f"🔄 날씨 프리페치 완료: {refreshed}/{len(targets)}곳")
+        return refreshed
+
+    def get_cache_stats(self) -> Dict:
+        """날씨 캐시 통계 (적중률 확인용)"""
+        return {
+            **self._cache.stats(),
+            "grid_step": self.grid_step,
+            "coalesced_requests": self.coalesced_requests,
+            "upstream_requests": self.upstream_requests,
+            "inflight": len(self._inflight),
+            "stale_served": self.stale_served,
+            "upstream_failures": self.upstream_failures,
+            "prefetch_runs": self.prefetch_runs,
+            "prefetch_errors": self.prefetch_errors,
+            "last_prefetch_at": self.last_prefetch_at,
+            "recent_cells": len(self._recent_cells),
+        }
+
     def _weather_code_to_condition(self, code: int) -> str:
         """WMO Weather Code를 한국어 날씨 상태로 변환"""
         # WMO Weather interpretation codes
@@ -110,33 +506,35 @@ class WeatherService:
             return "맑음"
     
     def _get_dummy_weather(self, location: str) -> Dict:
-        """테스트용 더미 날씨 데이터"""
+        """테스트용 더미 날씨 데이터 (캐시된 값이 전혀 없을 때만 사용)"""
         print(f"🌤️ 더미 날씨 데이터 사용 ({location})")
         
-        import random
-        
-        now = datetime.now()
+        now = now_kst()
         hour = now.hour
+
+        # 같은 위치/시간대에는 같은 값이 나오도록 고정 시드 사용
+        rng = random.Random(f"{location}:{now:%Y-%m-%d}:{hour}")
         
         # 시간대별 현실적인 날씨
         if 6 <= hour < 12:  # 아침
-            temp = random.uniform(15, 25)
-            sky = random.choice(["맑음", "구름많음"])
+            temp = rng.uniform(15, 25)
+            sky = rng.choice(["맑음", "구름많음"])
         elif 12 <= hour < 18:  # 오후
-            temp = random.uniform(20, 30)
-            sky = random.choice(["맑음", "구름많음", "흐림"])
+            temp = rng.uniform(20, 30)
+            sky = rng.choice(["맑음", "구름많음", "흐림"])
         elif 18 <= hour < 22:  # 저녁
-            temp = random.uniform(18, 28)
-            sky = random.choice(["맑음", "구름많음"])
+            temp = rng.uniform(18, 28)
+            sky = rng.choice(["맑음", "구름많음"])
         else:  # 밤
-            temp = random.uniform(12, 22)
-            sky = random.choice(["맑음", "구름많음", "흐림"])
+            temp = rng.uniform(12, 22)
+            sky = rng.choice(["맑음", "구름많음", "흐림"])
         
         return {
             "location": location,
             "temperature": round(temp, 1),
             "sky_condition": sky,
             "precipitation": "없음",
-            "humidity": random.randint(40, 80),
+            "humidity": rng.randint(40, 80),
             "note": "Open-Meteo API 응답 없음 - 더미 데이터"
         }
+
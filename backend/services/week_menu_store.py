@@ -0,0 +1,96 @@
+"""
+Week Menu Store
+구내식당별 주간 식단표(요일 × 끼니) 저장소
+- 월요일에 한 번 주간 식단표를 OCR 하면 화~금은 이미지 업로드 없이 오늘 메뉴를 조회
+- OCR 캐시와 같은 SQLite 파일에 저장해 재시작해도 유지
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from services.ocr_cache import DEFAULT_CACHE_PATH
+from services.kst_clock import now_kst
+
+load_dotenv()
+
+WEEKDAYS_KR = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+MEAL_SLOTS = ['조식', '중식', '석식']
+
+
+def current_week_key(now: Optional[datetime] = None) -> str:
+    """ISO 주차 키 (예: 2024-W03)"""
+    year, week, _ = (now or now_kst()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class WeekMenuStore:
+    """구내식당 ID × 주차별 주간 식단표"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("OCR_CACHE_PATH", DEFAULT_CACHE_PATH)
+        # 이 기간보다 오래된 주간 식단표는 저장 시 정리
+        self.retention_seconds = float(os.getenv("WEEK_MENU_RETENTION", str(14 * 24 * 3600)))
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS week_menus (
+                cafeteria_id TEXT NOT NULL,
+                week TEXT NOT NULL,
+                menus TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (cafeteria_id, week)
+            )
+            """
+        )
+        self._conn.commit()
+
+    async def get_week(self, cafeteria_id: str, week: str = None) -> Optional[Dict]:
+        """
+        주간 식단표 조회
+
+        Returns:
+            dict: {"월요일": {"중식": [...], ...}, ...} 또는 None
+        """
+        return await asyncio.to_thread(self._get_sync, cafeteria_id, week or current_week_key())
+
+    async def set_week(self, cafeteria_id: str, days: Dict, week: str = None):
+        """주간 식단표 저장 (같은 주차는 덮어쓰기)"""
+        await asyncio.to_thread(self._set_sync, cafeteria_id, days, week or current_week_key())
+
+    def _get_sync(self, cafeteria_id: str, week: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT menus FROM week_menus WHERE cafeteria_id = ? AND week = ?",
+                (cafeteria_id, week)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_sync(self, cafeteria_id: str, days: Dict, week: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO week_menus (cafeteria_id, week, menus, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (cafeteria_id, week, json.dumps(days, ensure_ascii=False), now)
+            )
+            self._conn.execute(
+                "DELETE FROM week_menus WHERE updated_at < ?",
+                (now - self.retention_seconds,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """SQLite 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -6,7 +6,7 @@ import RouletteGame from './components/RouletteGame';
 import RestaurantPage from './components/RestaurantPage';
 import DailyRecommendations from './components/DailyRecommendations';
 import AlertBanner from './components/AlertBanner';
-import { weatherAPI, cafeteriaAPI, dailyRecommendationsAPI } from './services/api';
+import { weatherAPI, cafeteriaAPI, dailyRecommendationsAPI, lunchBundleAPI } from './services/api';
 
 function App() {
   const [currentPage, setCurrentPage] = useState('landing'); // landing, location, input, result, roulette, restaurant
@@ -24,6 +24,7 @@ function App() {
   const [alertTitle, setAlertTitle] = useState('');
   const [alertDesc, setAlertDesc] = useState('');
   const [dailyRecommendations, setDailyRecommendations] = useState(null);
+  const [dailyPreloading, setDailyPreloading] = useState(false); // 묶음 조회로 오늘의 추천 받아오는 중
   const [includeDaily, setIncludeDaily] = useState(false);
   const [previousPage, setPreviousPage] = useState('landing'); // 이전 페이지 추적
 
@@ -225,22 +226,41 @@ function App() {
   };
 
   const fetchWeather = async (loc, coords = null) => {
+    // 오늘의 추천(캐시 미스면 LLM 대기)은 기다리지 않고 따로 받아옴 → 날씨/테마/페이지 전환이 LLM에 묶이지 않게
+    preloadDailyRecommendations(loc, coords);
+
     try {
       const response = await weatherAPI.getWeather(loc, coords);
-      console.log('날씨 API 응답:', response.data);
-      setWeather(response.data);
+      const weatherData = response.data;
+      console.log('날씨 API 응답:', weatherData);
+      setWeather(weatherData);
       
-      if (response.data) {
-        const theme = chooseThemeFromWeather(response.data.sky_condition, response.data.temperature);
-        console.log('테마 즉시 적용:', theme, response.data);
+      if (weatherData) {
+        const theme = chooseThemeFromWeather(weatherData.sky_condition, weatherData.temperature);
+        console.log('테마 즉시 적용:', theme, weatherData);
         setTheme(theme);
-        await fetchBackgroundPhoto(response.data.sky_condition, response.data.temperature);
+        await fetchBackgroundPhoto(weatherData.sky_condition, weatherData.temperature);
       }
     } catch (err) {
       console.error('날씨 정보 가져오기 실패:', err);
     }
   };
 
+  const preloadDailyRecommendations = (loc, coords = null) => {
+    setDailyPreloading(true);
+    lunchBundleAPI.getBundle(loc, coords)
+      .then((response) => {
+        setDailyRecommendations(response.data.daily_recommendations);
+        // 날씨 단독 조회가 실패했으면 묶음 응답의 날씨라도 사용
+        setWeather((prev) => prev || response.data.weather);
+      })
+      .catch((err) => {
+        // 실패하면 DailyRecommendations가 직접 다시 요청
+        console.error('오늘의 추천 묶음 조회 실패:', err);
+      })
+      .finally(() => setDailyPreloading(false));
+  };
+
   const handleMenuInput = async (input) => {
     setLoading(true);
     setError(null);
@@ -255,7 +275,7 @@ function App() {
         userCoords,
         true,  // preferExternal
         dailyMenusForCheck,  // 오늘의 메뉴 전달
-        input.method === 'image' ? input.imageData : null  // 이미지 데이터
+        input.method === 'image' ? input.imageFile : null  // 이미지 파일
       );
       
       // 검증 실패 응답 처리
@@ -587,6 +607,8 @@ function App() {
                 location={location} 
                 userCoords={userCoords}
                 weather={weather}
+                initialRecommendations={dailyRecommendations}
+                preloading={dailyPreloading}
                 onRecommendationsUpdate={setDailyRecommendations}
                 onMenuClick={handleDailyMenuClick}
                 onRouletteClick={handleDailyMenuRoulette}
@@ -82,16 +82,12 @@ const CafeteriaInput = ({ onSubmit, onValidationError, onBack, weather, location
     
     // 이미지가 있으면 이미지 우선, 없으면 텍스트
     if (imageFile) {
-      // 이미지를 Base64로 인코딩
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        onSubmit({ 
-          method: 'image', 
-          imageData: reader.result,
-          textFallback: menuText  // OCR 실패 시 대체 텍스트
-        });
-      };
-      reader.readAsDataURL(imageFile);
+      // 파일 그대로 전달 (멀티파트 업로드, Base64 변환 없음)
+      onSubmit({ 
+        method: 'image', 
+        imageFile,
+        textFallback: menuText  // OCR 실패 시 대체 텍스트
+      });
     } else if (menuText.trim()) {
       // 텍스트만 제출
       onSubmit({ method: 'text', content: menuText });
@@ -1,18 +1,24 @@
 import React, { useState, useEffect } from 'react';
 import { dailyRecommendationsAPI } from '../services/api';
 
-const DailyRecommendations = ({ location, userCoords, weather, onRecommendationsUpdate, onMenuClick, onRouletteClick }) => {
-  const [recommendations, setRecommendations] = useState(null);
-  const [loading, setLoading] = useState(true);
+const DailyRecommendations = ({ location, userCoords, weather, initialRecommendations = null, preloading = false, onRecommendationsUpdate, onMenuClick, onRouletteClick }) => {
+  // 묶음 조회(lunch-bundle)로 받아온(또는 받아오는 중인) 추천이 있으면 다시 요청하지 않음
+  const [recommendations, setRecommendations] = useState(initialRecommendations);
+  const [loading, setLoading] = useState(!initialRecommendations);
   const [error, setError] = useState(null);
   const [selectedMenu, setSelectedMenu] = useState(null);
 
   useEffect(() => {
-    // 한 번만 로드 (location, userCoords 의존성 제거)
-    if (!recommendations) {
+    if (initialRecommendations) {
+      setRecommendations(initialRecommendations);
+      setLoading(false);
+      return;
+    }
+    // 묶음 조회가 끝났는데 추천이 없으면(실패) 직접 한 번 로드 (location, userCoords 의존성 제거)
+    if (!preloading && !recommendations) {
       fetchDailyRecommendations();
     }
-  }, []); // eslint-disable-line react-hooks/exhaustive-deps
+  }, [initialRecommendations, preloading]); // eslint-disable-line react-hooks/exhaustive-deps
 
   const fetchDailyRecommendations = async () => {
     try {
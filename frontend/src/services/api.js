@@ -2,6 +2,20 @@ import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:8000';
 
+// 세션 ID (브라우저별로 한 번 생성해서 유지) → 서버가 세션별 추천 이력으로 중복 제거
+const SESSION_ID_KEY = 'lunch_session_id';
+
+const getSessionId = () => {
+  let sessionId = localStorage.getItem(SESSION_ID_KEY);
+  if (!sessionId) {
+    sessionId = crypto.randomUUID
+      ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem(SESSION_ID_KEY, sessionId);
+  }
+  return sessionId;
+};
+
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -22,11 +36,33 @@ export const weatherAPI = {
 
 export const cafeteriaAPI = {
   getRecommendation: async (location, cafeteriaMenu, userLocation = null, preferExternal = true, dailyMenus = null, imageData = null) => {
+    // 이미지 파일은 멀티파트로 업로드 (Base64 JSON보다 33% 작고 서버에서 디코딩 불필요)
+    if (imageData instanceof Blob) {
+      const form = new FormData();
+      form.append('image', imageData);
+      form.append('location', location);
+      form.append('prefer_external', preferExternal);
+      form.append('session_id', getSessionId());
+      if (cafeteriaMenu) form.append('cafeteria_menu', cafeteriaMenu);  // fallback 텍스트
+      if (userLocation && userLocation.latitude && userLocation.longitude) {
+        form.append('latitude', userLocation.latitude);
+        form.append('longitude', userLocation.longitude);
+      }
+      if (dailyMenus) form.append('daily_menus', JSON.stringify(dailyMenus));
+
+      // Content-Type은 브라우저가 boundary와 함께 설정
+      const response = await api.post('/api/recommend-from-cafeteria/upload', form, {
+        headers: { 'Content-Type': undefined },
+      });
+      return response.data;
+    }
+
     const payload = {
       location,
       user_location: userLocation,
       prefer_external: preferExternal,  // CAM 모드 활성화
-      daily_menus: dailyMenus  // 오늘의 메뉴 전달
+      daily_menus: dailyMenus,  // 오늘의 메뉴 전달
+      session_id: getSessionId()  // 세션별 추천 이력
     };
     
     // 이미지 또는 텍스트
@@ -61,5 +97,22 @@ export const dailyRecommendationsAPI = {
   },
 };
 
+// 페이지 로드용 묶음 조회: 날씨 + 오늘의 추천 (+ 구내식당 메뉴가 있으면 구내식당 기반 추천)
+// 서버가 날씨를 한 번만 조회해서 공유 → 왕복 1회
+export const lunchBundleAPI = {
+  getBundle: async (location, userLocation = null, cafeteriaMenu = null, cafeteriaId = null) => {
+    const payload = {
+      location,
+      user_location: userLocation && userLocation.latitude && userLocation.longitude ? userLocation : null,
+      session_id: getSessionId(),
+    };
+    if (cafeteriaMenu) payload.cafeteria_menu = cafeteriaMenu;
+    if (cafeteriaId) payload.cafeteria_id = cafeteriaId;
+
+    const response = await api.post('/api/lunch-bundle', payload);
+    return response.data;
+  },
+};
+
 export default api;
 